@@ -0,0 +1 @@
+"""HTTP load test harness; see `benchmarks.loadtest.__main__` for usage."""
@@ -0,0 +1,191 @@
+"""
+Load test the API against seeded data, with offline authentication.
+
+Seeds Postgres with a deterministic population of users, trips, participants
+and itinerary items, serves the app with uvicorn trusting a local stand-in
+token issuer, drives a weighted mix of requests at a fixed concurrency and
+writes a JSON report of throughput and p50/p95/p99 latency per route.
+Reports from two commits can be compared with `benchmarks.loadtest.compare`.
+
+Usage (from backend/, against a migrated database):
+
+    DATABASE_URL=postgresql://... python -m benchmarks.loadtest --mix mixed --output base.json
+    python -m benchmarks.loadtest --skip-seed --output head.json
+    python -m benchmarks.loadtest.compare base.json head.json
+
+Seeding replaces earlier load test data (users matching
+`loadtest-%@example.com` and everything they own) and leaves other rows
+alone. Write mixes add rows, so reseed before runs that should compare.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import requests
+
+from benchmarks.loadtest.issuer import LocalIssuer
+from benchmarks.loadtest.runner import run
+from benchmarks.loadtest.scenarios import MIXES
+from benchmarks.loadtest.seed import load_population, seed
+
+
+def _log(message: str) -> None:
+    print(message, file=sys.stderr, flush=True)
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def _start_server(port: int, workers: int, env: dict[str, str]) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "src.server:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        env={**os.environ, **env},
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"API server exited with status {server.returncode}")
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/metrics", timeout=1).ok:
+                return server
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("API server did not start within 60 seconds")
+
+
+def _stop_server(server: subprocess.Popen) -> None:
+    server.terminate()
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--trips-per-user", type=int, default=3)
+    parser.add_argument("--participants-per-trip", type=int, default=5)
+    parser.add_argument("--items-per-trip", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1, help="seed for data and request choices")
+    parser.add_argument("--skip-seed", action="store_true", help="reuse the seeded data")
+    parser.add_argument("--mix", choices=sorted(MIXES), default="mixed")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="unmeasured seconds first")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8770)
+    parser.add_argument("--output", help="report path; stdout by default")
+    args = parser.parse_args()
+
+    database_url = os.environ["DATABASE_URL"]
+    if not args.skip_seed:
+        counts = seed(
+            database_url,
+            users_count=args.users,
+            trips_per_user=args.trips_per_user,
+            participants_per_trip=args.participants_per_trip,
+            items_per_trip=args.items_per_trip,
+            random_seed=args.seed,
+        )
+        _log(f"Seeded {json.dumps(counts)}")
+    population = load_population(database_url)
+    if not population:
+        sys.exit("No load test users found; run without --skip-seed")
+
+    issuer = LocalIssuer()
+    issuer.start()
+    lifetime = int(args.warmup + args.duration) + 3600
+    tokens = {
+        user.email: issuer.mint(
+            user.uid, user.email, user.given_name, user.family_name, lifetime
+        )
+        for user in population
+    }
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    config = {
+        "git_commit": _git_commit(),
+        "mix": args.mix,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "warmup_s": args.warmup,
+        "workers": args.workers,
+        "seed": args.seed,
+        "population": {
+            "users": len(population),
+            "trips": sum(len(user.own_trips) for user in population),
+            "itinerary_items": sum(len(user.item_ids) for user in population),
+        },
+    }
+    server = _start_server(args.port, args.workers, issuer.server_env())
+    try:
+        _log(
+            f"Running {args.mix} mix at concurrency {args.concurrency} "
+            f"for {args.warmup:g}s warmup + {args.duration:g}s"
+        )
+        report = run(
+            base_url,
+            population,
+            tokens,
+            mix=args.mix,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            warmup=args.warmup,
+            random_seed=args.seed,
+        )
+        try:
+            # Pool and cache counters of whichever worker answers.
+            report["server_metrics"] = requests.get(f"{base_url}/metrics", timeout=10).json()
+        except (requests.RequestException, ValueError):
+            pass
+    finally:
+        _stop_server(server)
+        issuer.stop()
+
+    report["config"] = config
+    output = json.dumps(report, indent=2, sort_keys=True, default=str)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+        overall = report["overall"]
+        _log(
+            f"{overall['requests']} requests, {overall['throughput_rps']} req/s, "
+            f"{overall['errors']} errors; report written to {args.output}"
+        )
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
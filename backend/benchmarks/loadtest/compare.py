@@ -0,0 +1,75 @@
+"""
+Compare two load test reports route by route.
+
+    python -m benchmarks.loadtest.compare base.json head.json
+
+Prints throughput and latency percentiles of every route in either report,
+base and head side by side with the relative change.
+"""
+
+import argparse
+import json
+
+METRICS = [
+    ("req/s", lambda summary: summary["throughput_rps"]),
+    ("p50 ms", lambda summary: summary.get("latency_ms", {}).get("p50")),
+    ("p95 ms", lambda summary: summary.get("latency_ms", {}).get("p95")),
+    ("p99 ms", lambda summary: summary.get("latency_ms", {}).get("p99")),
+    ("errors", lambda summary: summary["errors"]),
+]
+
+
+def _change(base: float | None, head: float | None) -> str:
+    if base is None or head is None:
+        return "n/a"
+    if base == 0:
+        return "=" if head == 0 else "new"
+    return f"{(head - base) / base:+.1%}"
+
+
+def compare(base: dict, head: dict) -> list[list[str]]:
+    rows = [["route", "metric", "base", "head", "change"]]
+    summaries = [("overall", base["overall"], head["overall"])] + [
+        (route, base["routes"].get(route), head["routes"].get(route))
+        for route in sorted(set(base["routes"]) | set(head["routes"]))
+    ]
+    for route, base_summary, head_summary in summaries:
+        for name, metric in METRICS:
+            base_value = metric(base_summary) if base_summary else None
+            head_value = metric(head_summary) if head_summary else None
+            rows.append(
+                [
+                    route,
+                    name,
+                    "-" if base_value is None else str(base_value),
+                    "-" if head_value is None else str(head_value),
+                    _change(base_value, head_value),
+                ]
+            )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("base")
+    parser.add_argument("head")
+    args = parser.parse_args()
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.head) as f:
+        head = json.load(f)
+    for label, report in (("base", base), ("head", head)):
+        config = report.get("config", {})
+        print(
+            f"{label}: {config.get('git_commit')} {config.get('mix')} mix, "
+            f"concurrency {config.get('concurrency')}"
+        )
+    rows = compare(base, head)
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    for row in rows:
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Stand-in for Firebase's token issuer, so the API can be load tested offline.
+
+`LocalIssuer` signs ID tokens with a throwaway RSA key and serves the
+matching JWKS over HTTP. A server started with `server_env()` verifies them
+through `src.firebase_keys.KEY_RING` exactly as it verifies Google's tokens,
+so `get_current_user` and `/signin` run unmodified.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from uuid import uuid4
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+PROJECT_ID = "trips-loadtest"
+
+
+class LocalIssuer:
+    def __init__(self, project_id: str = PROJECT_ID, max_age_seconds: int = 3600):
+        self.project_id = project_id
+        self.max_age_seconds = max_age_seconds
+        # Number of JWKS requests served.
+        self.fetches = 0
+        self._keys: list[tuple[str, rsa.RSAPrivateKey]] = []
+        self._server: ThreadingHTTPServer | None = None
+        self.rotate()
+
+    @property
+    def kid(self) -> str:
+        return self._keys[-1][0]
+
+    @property
+    def jwks(self) -> dict:
+        keys = []
+        for kid, key in self._keys:
+            jwk = jwt.algorithms.RSAAlgorithm.to_jwk(key.public_key(), as_dict=True)
+            keys.append({**jwk, "kid": kid, "alg": "RS256", "use": "sig"})
+        return {"keys": keys}
+
+    def rotate(self, keep_previous: bool = True) -> None:
+        """Sign with a new key from now on, still publishing the last one if `keep_previous`."""
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self._keys = (self._keys[-1:] if keep_previous else []) + [(uuid4().hex, key)]
+
+    def mint(
+        self,
+        uid: str,
+        email: str,
+        given_name: str = "",
+        family_name: str = "",
+        lifetime_seconds: int = 3600,
+    ) -> str:
+        """Sign an ID token carrying the claims Firebase would put in it."""
+        now = int(time.time())
+        claims = {
+            "iss": f"https://securetoken.google.com/{self.project_id}",
+            "aud": self.project_id,
+            "sub": uid,
+            "iat": now,
+            "auth_time": now,
+            "exp": now + lifetime_seconds,
+            "email": email,
+            "email_verified": True,
+            "given_name": given_name,
+            "family_name": family_name,
+        }
+        kid, key = self._keys[-1]
+        return jwt.encode(claims, key, algorithm="RS256", headers={"kid": kid})
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Serve the JWKS on a background thread; port 0 picks a free one."""
+        issuer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                issuer.fetches += 1
+                body = json.dumps(issuer.jwks).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header(
+                    "Cache-Control", f"public, max-age={issuer.max_age_seconds}"
+                )
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    @property
+    def jwks_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/jwks"
+
+    def server_env(self) -> dict[str, str]:
+        """Environment that makes a server trust this issuer's tokens."""
+        return {"FIREBASE_PROJECT_ID": self.project_id, "FIREBASE_JWKS_URL": self.jwks_url}
@@ -0,0 +1,106 @@
+"""
+Closed-loop load generation and the report it produces.
+
+`concurrency` clients each send one request at a time, back to back, for
+the warmup and then the measured duration; only requests started after the
+warmup are reported.
+"""
+
+import math
+import random
+import threading
+import time
+from collections import defaultdict
+
+from benchmarks.loadtest.scenarios import MIXES, Client, Sample
+from benchmarks.loadtest.seed import SeededUser
+
+PERCENTILES = (50, 95, 99)
+
+
+def _percentile(sorted_values: list[float], percentile: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    rank = max(math.ceil(percentile / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize(samples: list[Sample], duration: float) -> dict:
+    """Request count, errors, throughput, latency percentiles and statuses of `samples`."""
+    latencies = sorted(sample.seconds * 1000 for sample in samples)
+    statuses = defaultdict(int)
+    for sample in samples:
+        statuses[str(sample.status)] += 1
+    summary = {
+        "requests": len(samples),
+        "errors": sum(1 for sample in samples if not 200 <= sample.status < 400),
+        "throughput_rps": round(len(samples) / duration, 2),
+        "status": dict(sorted(statuses.items())),
+    }
+    if latencies:
+        summary["latency_ms"] = {
+            **{f"p{p}": round(_percentile(latencies, p), 2) for p in PERCENTILES},
+            "mean": round(sum(latencies) / len(latencies), 2),
+            "max": round(latencies[-1], 2),
+        }
+    return summary
+
+
+def run(
+    base_url: str,
+    population: list[SeededUser],
+    tokens: dict[str, str],
+    mix: str,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    random_seed: int,
+) -> dict:
+    """Drive `mix` against `base_url` and return per-route and overall summaries."""
+    actions, weights = zip(*MIXES[mix].items())
+    sync_cursors: dict[str, str] = {}
+    clients = [
+        Client(
+            base_url=base_url,
+            tokens=tokens,
+            sync_cursors=sync_cursors,
+            rng=random.Random(f"{random_seed}-{i}"),
+        )
+        for i in range(concurrency)
+    ]
+
+    start = time.perf_counter()
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+
+    def drive(client: Client) -> None:
+        while time.perf_counter() < stop_at:
+            user = client.rng.choice(population)
+            action = client.rng.choices(actions, weights)[0]
+            action(client, user)
+        client.session.close()
+
+    threads = [threading.Thread(target=drive, args=(client,)) for client in clients]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # The last requests finish after `stop_at`; count the time they took.
+    elapsed = max(time.perf_counter(), stop_at) - measure_from
+
+    samples = [
+        sample
+        for client in clients
+        for sample in client.samples
+        if sample.started_at >= measure_from
+    ]
+    by_route = defaultdict(list)
+    for sample in samples:
+        by_route[sample.route].append(sample)
+    return {
+        "duration_s": round(elapsed, 2),
+        "overall": summarize(samples, elapsed),
+        "routes": {
+            route: summarize(route_samples, elapsed)
+            for route, route_samples in sorted(by_route.items())
+        },
+    }
@@ -0,0 +1,223 @@
+"""
+What a simulated client does: one request per action, picked by weight.
+
+Every request is recorded under its route template (e.g.
+`GET /api/v1/trips/{trip_id}`) so reports group requests by endpoint rather
+than by URL. Actions that need a trip the user cannot provide fall back to
+listing the user's trips.
+"""
+
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Callable
+
+import requests
+
+from benchmarks.loadtest.seed import SeededUser
+
+
+@dataclass
+class Sample:
+    route: str
+    status: int  # 0 when no response arrived
+    seconds: float
+    started_at: float
+
+
+@dataclass
+class Client:
+    """One simulated client: a connection-reusing session and its samples."""
+
+    base_url: str
+    tokens: dict[str, str]
+    sync_cursors: dict[str, str]
+    rng: random.Random
+    session: requests.Session = field(default_factory=requests.Session)
+    samples: list[Sample] = field(default_factory=list)
+
+    def call(
+        self, user: SeededUser, method: str, route: str, path: str, **kwargs
+    ) -> requests.Response | None:
+        headers = {"Authorization": f"Bearer {self.tokens[user.email]}"}
+        started_at = time.perf_counter()
+        try:
+            response = self.session.request(
+                method, self.base_url + path, headers=headers, timeout=60, **kwargs
+            )
+        except requests.RequestException:
+            response = None
+        self.samples.append(
+            Sample(
+                route=f"{method} {route}",
+                status=response.status_code if response is not None else 0,
+                seconds=time.perf_counter() - started_at,
+                started_at=started_at,
+            )
+        )
+        return response
+
+
+def list_trips(client: Client, user: SeededUser) -> None:
+    client.call(user, "GET", "/api/v1/trips", "/api/v1/trips")
+
+
+def trip_details(client: Client, user: SeededUser) -> None:
+    if not user.trip_ids:
+        return list_trips(client, user)
+    trip_id = client.rng.choice(user.trip_ids)
+    client.call(user, "GET", "/api/v1/trips/{trip_id}", f"/api/v1/trips/{trip_id}")
+
+
+def trip_items(client: Client, user: SeededUser) -> None:
+    if not user.trip_ids:
+        return list_trips(client, user)
+    trip_id = client.rng.choice(user.trip_ids)
+    client.call(
+        user,
+        "GET",
+        "/api/v1/itinerary-items?trip_id={trip_id}",
+        "/api/v1/itinerary-items",
+        params={"trip_id": str(trip_id)},
+    )
+
+
+def participants(client: Client, user: SeededUser) -> None:
+    if not user.trip_ids:
+        return list_trips(client, user)
+    trip_id = client.rng.choice(user.trip_ids)
+    client.call(
+        user,
+        "GET",
+        "/api/v1/trips/{trip_id}/participants",
+        f"/api/v1/trips/{trip_id}/participants",
+    )
+
+
+def participant_counts(client: Client, user: SeededUser) -> None:
+    if not user.trip_ids:
+        return list_trips(client, user)
+    trip_id = client.rng.choice(user.trip_ids)
+    client.call(
+        user,
+        "GET",
+        "/api/v1/trips/{trip_id}/participants/counts",
+        f"/api/v1/trips/{trip_id}/participants/counts",
+    )
+
+
+def invitations(client: Client, user: SeededUser) -> None:
+    client.call(user, "GET", "/api/v1/invitations", "/api/v1/invitations")
+
+
+def sync(client: Client, user: SeededUser) -> None:
+    """Delta sync from where this user last left off; the first one is a full sync."""
+    cursor = client.sync_cursors.get(user.email)
+    response = client.call(
+        user,
+        "GET",
+        "/api/v1/sync",
+        "/api/v1/sync",
+        params={"since": cursor} if cursor else {},
+    )
+    if response is not None and response.status_code == 200:
+        client.sync_cursors[user.email] = response.json()["cursor"]
+
+
+def create_item(client: Client, user: SeededUser) -> None:
+    if not user.own_trips:
+        return list_trips(client, user)
+    trip = client.rng.choice(user.own_trips)
+    itinerary_datetime = trip["start_date"] + timedelta(
+        hours=client.rng.randrange(7 * 24)
+    )
+    response = client.call(
+        user,
+        "POST",
+        "/api/v1/itinerary-items",
+        "/api/v1/itinerary-items",
+        json={
+            "trip_id": str(trip["trip_id"]),
+            "type": "activity",
+            "itinerary_datetime": itinerary_datetime.isoformat(),
+            "notes": "Created by benchmarks.loadtest",
+            "details": {"description": "Load test activity"},
+        },
+    )
+    if response is not None and response.status_code == 200:
+        user.item_ids.append(response.json()["itinerary_item_id"])
+
+
+def update_item(client: Client, user: SeededUser) -> None:
+    if not user.item_ids:
+        return create_item(client, user)
+    item_id = client.rng.choice(user.item_ids)
+    client.call(
+        user,
+        "PUT",
+        "/api/v1/itinerary-items/{item_id}",
+        f"/api/v1/itinerary-items/{item_id}",
+        json={"notes": f"Updated by benchmarks.loadtest {client.rng.random():.6f}"},
+    )
+
+
+def update_trip(client: Client, user: SeededUser) -> None:
+    if not user.own_trips:
+        return list_trips(client, user)
+    trip = client.rng.choice(user.own_trips)
+    client.call(
+        user,
+        "PUT",
+        "/api/v1/trips/{trip_id}",
+        f"/api/v1/trips/{trip['trip_id']}",
+        json={
+            "name": trip["name"],
+            "description": f"Updated by benchmarks.loadtest {client.rng.random():.6f}",
+            "start_date": trip["start_date"].isoformat(),
+            "end_date": trip["end_date"].isoformat(),
+        },
+    )
+
+
+def signin(client: Client, user: SeededUser) -> None:
+    client.call(user, "POST", "/signin", "/signin")
+
+
+Action = Callable[[Client, SeededUser], None]
+
+# Relative weights of the actions in each mix.
+MIXES: dict[str, dict[Action, int]] = {
+    # Opening the app and browsing trips.
+    "browse": {
+        list_trips: 25,
+        trip_details: 25,
+        trip_items: 20,
+        participants: 8,
+        participant_counts: 4,
+        invitations: 8,
+        sync: 10,
+    },
+    # Browsing with occasional edits, as a typical day looks.
+    "mixed": {
+        list_trips: 20,
+        trip_details: 22,
+        trip_items: 16,
+        participants: 6,
+        participant_counts: 3,
+        invitations: 6,
+        sync: 12,
+        create_item: 6,
+        update_item: 6,
+        update_trip: 2,
+        signin: 1,
+    },
+    # Planning sessions: mostly edits, with clients syncing them.
+    "write": {
+        trip_details: 15,
+        sync: 15,
+        create_item: 30,
+        update_item: 30,
+        update_trip: 10,
+    },
+}
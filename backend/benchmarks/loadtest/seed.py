@@ -0,0 +1,255 @@
+"""
+Deterministic test population for the load test.
+
+`seed` replaces any previous load test data with users, trips, participants
+and itinerary items drawn from a seeded RNG, so the same arguments produce
+the same rows, IDs included, on every run and every commit. `load_population`
+reads back what each user can see for the scenarios to pick from.
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy import create_engine, delete, insert, or_, select
+
+from src.database.models import (
+    ItineraryItemType,
+    ParticipantStatus,
+    itinerary_items,
+    tombstones,
+    trip_access,
+    trip_participants,
+    trips,
+    users,
+)
+
+EMAIL_PATTERN = "loadtest-%@example.com"
+INSERT_BATCH_SIZE = 5000
+
+_FIRST_TRIP_START = datetime(2030, 1, 1, tzinfo=timezone.utc)
+_PARTICIPANT_STATUSES = [
+    ParticipantStatus.JOINED,
+    ParticipantStatus.INVITED,
+    ParticipantStatus.DECLINED,
+]
+_PARTICIPANT_STATUS_WEIGHTS = [70, 20, 10]
+
+
+@dataclass
+class SeededUser:
+    user_id: UUID
+    email: str
+    uid: str
+    given_name: str
+    family_name: str
+    # Every trip the user can see, and the ones they own.
+    trip_ids: list[UUID] = field(default_factory=list)
+    own_trips: list[dict] = field(default_factory=list)
+    # Itinerary items the user created.
+    item_ids: list[UUID] = field(default_factory=list)
+
+
+def _uuid(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def _item_details(type: ItineraryItemType, n: int) -> dict:
+    if type == ItineraryItemType.FLIGHT:
+        return {
+            "flight_number": f"LT{n % 9000}",
+            "origin_airport_code": "SFO",
+            "destination_airport_code": "JFK",
+            "airline_name": "Load Test Air",
+        }
+    if type == ItineraryItemType.TRAIN:
+        return {
+            "train_number": f"LT{n % 900}",
+            "origin_station": "Paris Gare de Lyon",
+            "destination_station": "Lyon Part-Dieu",
+        }
+    if type == ItineraryItemType.ACCOMMODATION:
+        return {"address": f"{n} Load Test Street"}
+    return {"description": f"Activity {n}", "location_name": "Load Test Park"}
+
+
+_ITEM_TYPES = [
+    ItineraryItemType.FLIGHT,
+    ItineraryItemType.TRAIN,
+    ItineraryItemType.ACCOMMODATION,
+    ItineraryItemType.ACTIVITY,
+]
+
+
+def _clear(conn) -> None:
+    seeded_users = select(users.c.user_id).where(users.c.email.like(EMAIL_PATTERN))
+    seeded_trips = select(trips.c.trip_id).where(
+        trips.c.created_by_user_id.in_(seeded_users)
+    )
+    conn.execute(
+        delete(itinerary_items).where(
+            or_(
+                itinerary_items.c.trip_id.in_(seeded_trips),
+                itinerary_items.c.created_by_user_id.in_(seeded_users),
+            )
+        )
+    )
+    conn.execute(
+        delete(trip_participants).where(
+            or_(
+                trip_participants.c.trip_id.in_(seeded_trips),
+                trip_participants.c.user_id.in_(seeded_users),
+            )
+        )
+    )
+    conn.execute(delete(trips).where(trips.c.trip_id.in_(seeded_trips)))
+    # Left behind by the deletes above.
+    conn.execute(delete(tombstones).where(tombstones.c.user_id.in_(seeded_users)))
+    conn.execute(delete(users).where(users.c.user_id.in_(seeded_users)))
+
+
+def _insert(conn, table, rows: list[dict]) -> None:
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        conn.execute(insert(table), rows[start : start + INSERT_BATCH_SIZE])
+
+
+def seed(
+    database_url: str,
+    users_count: int,
+    trips_per_user: int,
+    participants_per_trip: int,
+    items_per_trip: int,
+    random_seed: int,
+) -> dict:
+    """Replace the load test data and return how many rows of each kind were written."""
+    rng = random.Random(random_seed)
+    user_rows = [
+        {
+            "user_id": _uuid(rng),
+            "email": f"loadtest-{i:06d}@example.com",
+            "password_hash": "",
+            "given_name": "Load",
+            "family_name": f"Tester {i}",
+            "oauth_provider": "google",
+            "oauth_provider_user_id": f"loadtest-{i:06d}",
+        }
+        for i in range(users_count)
+    ]
+    user_ids = [row["user_id"] for row in user_rows]
+
+    trip_rows, participant_rows, item_rows = [], [], []
+    for owner_index, owner_id in enumerate(user_ids):
+        for j in range(trips_per_user):
+            trip_id = _uuid(rng)
+            start_date = _FIRST_TRIP_START + timedelta(days=rng.randrange(365))
+            trip_rows.append(
+                {
+                    "trip_id": trip_id,
+                    "name": f"Load test trip {owner_index}-{j}",
+                    "description": "Seeded by benchmarks.loadtest",
+                    "created_by_user_id": owner_id,
+                    "start_date": start_date,
+                    "end_date": start_date + timedelta(days=7),
+                }
+            )
+            count = min(participants_per_trip, len(user_ids) - 1)
+            picked = rng.sample(range(len(user_ids)), count + 1)
+            others = [i for i in picked if i != owner_index][:count]
+            for i in others:
+                participant_rows.append(
+                    {
+                        "trip_id": trip_id,
+                        "user_id": user_ids[i],
+                        "status": rng.choices(
+                            _PARTICIPANT_STATUSES, _PARTICIPANT_STATUS_WEIGHTS
+                        )[0],
+                    }
+                )
+            for k in range(items_per_trip):
+                type = _ITEM_TYPES[k % len(_ITEM_TYPES)]
+                item_rows.append(
+                    {
+                        "itinerary_item_id": _uuid(rng),
+                        "trip_id": trip_id,
+                        "created_by_user_id": owner_id,
+                        "type": type,
+                        "itinerary_datetime": start_date
+                        + timedelta(hours=rng.randrange(7 * 24)),
+                        "booking_reference": f"LT{len(item_rows):08d}",
+                        "notes": f"Seeded item {k}",
+                        "details": _item_details(type, len(item_rows)),
+                    }
+                )
+
+    engine = create_engine(database_url)
+    with engine.begin() as conn:
+        _clear(conn)
+        _insert(conn, users, user_rows)
+        _insert(conn, trips, trip_rows)
+        _insert(conn, trip_participants, participant_rows)
+        _insert(conn, itinerary_items, item_rows)
+    engine.dispose()
+    return {
+        "users": len(user_rows),
+        "trips": len(trip_rows),
+        "participants": len(participant_rows),
+        "itinerary_items": len(item_rows),
+    }
+
+
+def load_population(database_url: str) -> list[SeededUser]:
+    """Read the seeded users, ordered by email, with what each of them can see."""
+    engine = create_engine(database_url)
+    with engine.connect() as conn:
+        seeded_users = (
+            select(users.c.user_id).where(users.c.email.like(EMAIL_PATTERN)).subquery()
+        )
+        population = {
+            row.user_id: SeededUser(
+                user_id=row.user_id,
+                email=row.email,
+                uid=row.oauth_provider_user_id,
+                given_name=row.given_name,
+                family_name=row.family_name,
+            )
+            for row in conn.execute(
+                select(
+                    users.c.user_id,
+                    users.c.email,
+                    users.c.oauth_provider_user_id,
+                    users.c.given_name,
+                    users.c.family_name,
+                )
+                .where(users.c.email.like(EMAIL_PATTERN))
+                .order_by(users.c.email)
+            )
+        }
+        for row in conn.execute(
+            select(trip_access.c.user_id, trip_access.c.trip_id)
+            .where(trip_access.c.user_id.in_(select(seeded_users)))
+            .order_by(trip_access.c.user_id, trip_access.c.trip_id)
+        ):
+            population[row.user_id].trip_ids.append(row.trip_id)
+        for row in conn.execute(
+            select(
+                trips.c.trip_id,
+                trips.c.created_by_user_id,
+                trips.c.name,
+                trips.c.description,
+                trips.c.start_date,
+                trips.c.end_date,
+            )
+            .where(trips.c.created_by_user_id.in_(select(seeded_users)))
+            .order_by(trips.c.trip_id)
+        ):
+            trip = dict(row._mapping)
+            population[trip.pop("created_by_user_id")].own_trips.append(trip)
+        for row in conn.execute(
+            select(itinerary_items.c.itinerary_item_id, itinerary_items.c.created_by_user_id)
+            .where(itinerary_items.c.created_by_user_id.in_(select(seeded_users)))
+            .order_by(itinerary_items.c.itinerary_item_id)
+        ):
+            population[row.created_by_user_id].item_ids.append(row.itinerary_item_id)
+    engine.dispose()
+    return list(population.values())
@@ -0,0 +1,78 @@
+"""
+Measure booking-confirmation parsing throughput on the `.eml` corpus.
+
+Replicates the messages in `benchmarks/eml/` to the requested count, parses
+them once in-process and once on a process pool like the parser worker, and
+reports messages per second and per second per core. No database is needed.
+
+Usage (from backend/):
+
+    python -m benchmarks.parsing --messages 20000 --processes 4
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from src.parsing.registry import extract_itinerary_items
+
+CORPUS_DIR = Path(__file__).parent / "eml"
+
+
+def load_corpus(count: int) -> list[bytes]:
+    corpus = [path.read_bytes() for path in sorted(CORPUS_DIR.glob("*.eml"))]
+    return [corpus[i % len(corpus)] for i in range(count)]
+
+
+def _report(mode: str, processes: int, messages: list[bytes], elapsed: float, items: int) -> dict:
+    rate = len(messages) / elapsed
+    return {
+        "mode": mode,
+        "processes": processes,
+        "messages": len(messages),
+        "items": items,
+        "seconds": round(elapsed, 3),
+        "msgs_per_sec": round(rate, 1),
+        "msgs_per_sec_per_core": round(rate / processes, 1),
+    }
+
+
+def run_serial(messages: list[bytes]) -> dict:
+    extract_itinerary_items(messages[0])  # import extractors before timing
+    start = time.perf_counter()
+    items = sum(len(extract_itinerary_items(raw)) for raw in messages)
+    return _report("serial", 1, messages, time.perf_counter() - start, items)
+
+
+def run_pool(messages: list[bytes], processes: int) -> dict:
+    with ProcessPoolExecutor(processes) as pool:
+        # Warm every worker so process start-up is not timed.
+        list(pool.map(extract_itinerary_items, messages[: processes * 4]))
+        start = time.perf_counter()
+        chunksize = max(1, len(messages) // (processes * 16))
+        items = sum(
+            len(result)
+            for result in pool.map(
+                extract_itinerary_items, messages, chunksize=chunksize
+            )
+        )
+        elapsed = time.perf_counter() - start
+    return _report("pool", processes, messages, elapsed, items)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    messages = load_corpus(args.messages)
+    print(json.dumps(run_serial(messages)))
+    print(json.dumps(run_pool(messages, args.processes)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Compare response serialization cost of the model path and the row fast path.
+
+The model path is what endpoints did before `src.serialization`: validate
+each row into its response model, then let FastAPI re-validate against
+`response_model`, encode and render a `JSONResponse`. The fast path encodes
+the rows directly with a precompiled `TypeAdapter`. Rows are synthetic, so no
+database is needed; both paths are checked to produce the same JSON.
+
+Usage (from backend/):
+
+    python -m benchmarks.serialization --items 1000 --repeat 50
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.database.models import ItineraryItemType, ParticipantStatus
+from src.schemas.itinerary_item import ItineraryItem
+from src.schemas.trip import Trip
+from src.schemas.trip_participant import TripParticipantWithUser
+from src.serialization import rows_adapter
+
+
+def _trip_rows(count: int) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "trip_id": uuid.uuid4(),
+            "name": f"Trip {i}",
+            "description": "Benchmark trip",
+            "created_by_user_id": uuid.uuid4(),
+            "start_date": now + timedelta(days=i),
+            "end_date": now + timedelta(days=i + 3),
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+
+
+def _itinerary_item_rows(count: int) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "itinerary_item_id": uuid.uuid4(),
+            "trip_id": uuid.uuid4(),
+            "created_by_user_id": uuid.uuid4(),
+            "type": ItineraryItemType.FLIGHT,
+            "itinerary_datetime": now + timedelta(hours=i),
+            "booking_reference": "K7XQ2P",
+            "booking_url": None,
+            "notes": f"Leg {i}",
+            "details": {
+                "flight_number": f"UA{i % 9000}",
+                "origin_airport_code": "SFO",
+                "destination_airport_code": "EWR",
+                "departure_datetime": (now + timedelta(hours=i)).isoformat(),
+                "airline_name": "United Airlines",
+                "seat": "23A",
+            },
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+
+
+def _participant_rows(count: int) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    trip_id = uuid.uuid4()
+    return [
+        {
+            "trip_id": trip_id,
+            "user_id": uuid.uuid4(),
+            "status": ParticipantStatus.JOINED,
+            "created_at": now,
+            "updated_at": now,
+            "email": f"traveller{i}@example.com",
+            "given_name": "Benchmark",
+            "family_name": f"Traveller {i}",
+        }
+        for i in range(count)
+    ]
+
+
+CASES = {
+    "trips": (Trip, _trip_rows),
+    "itinerary_items": (ItineraryItem, _itinerary_item_rows),
+    "participants": (TripParticipantWithUser, _participant_rows),
+}
+
+
+async def _model_path(model, field, rows: list[dict]) -> bytes:
+    content = await serialize_response(
+        field=field,
+        response_content=[model.model_validate(row) for row in rows],
+    )
+    return JSONResponse(content).body
+
+
+def _fast_path(adapter, rows: list[dict]) -> bytes:
+    return adapter.dump_json(rows)
+
+
+def _time(fn, repeat: int) -> float:
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    for name, (model, make_rows) in CASES.items():
+        rows = make_rows(args.items)
+        field = create_model_field(
+            name="Response", type_=list[model], mode="serialization"
+        )
+        adapter = rows_adapter(model)
+
+        def model_path():
+            return loop.run_until_complete(_model_path(model, field, rows))
+
+        def fast_path():
+            return _fast_path(adapter, rows)
+
+        if json.loads(model_path()) != json.loads(fast_path()):
+            raise AssertionError(f"{name}: fast path output differs")
+
+        per_1k = 1000 / args.items
+        model_ms = _time(model_path, args.repeat) * 1000 * per_1k
+        fast_ms = _time(fast_path, args.repeat) * 1000 * per_1k
+        print(
+            json.dumps(
+                {
+                    "case": name,
+                    "model_path_ms_per_1k": round(model_ms, 3),
+                    "fast_path_ms_per_1k": round(fast_ms, 3),
+                    "speedup": round(model_ms / fast_ms, 1),
+                }
+            )
+        )
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
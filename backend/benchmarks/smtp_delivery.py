@@ -0,0 +1,169 @@
+"""
+Deliver mail to a local SMTP ingestion server and check what it stores.
+
+Starts `python -m src.smtp_server` on a free local port, creates two
+throwaway users and their forwarding addresses, and sends messages with
+`smtplib` as a forwarding mail server would. It checks that:
+
+- concurrent first requests give a user exactly one address;
+- a message lands in its recipient's inbox once, even when the envelope
+  names the same inbox several times;
+- unknown recipients and other domains are refused during the envelope.
+
+Prints one line per check and exits non-zero if any fails; the users and
+their mail are deleted afterwards.
+
+Usage (from backend/, against a migrated database):
+
+    DATABASE_URL=postgresql://... python -m benchmarks.smtp_delivery
+"""
+
+import argparse
+import asyncio
+import os
+import smtplib
+import socket
+import subprocess
+import sys
+import time
+from email.message import EmailMessage
+from uuid import uuid4
+
+from sqlalchemy import delete, func, select
+
+from src.database.config import AsyncSessionLocal, async_engine
+from src.database.crud.inbound_email import (
+    INBOUND_EMAIL_DOMAIN,
+    get_or_create_inbound_email_address,
+)
+from src.database.crud.user import create_user
+from src.database.models import inbound_email_addresses, inbound_emails, users
+
+PROFILE = {"password_hash": "", "given_name": "Smtp", "family_name": "Delivery"}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def _send(port: int, recipients: list[str], subject: str) -> None:
+    message = EmailMessage()
+    message["From"] = "bookings@example.com"
+    message["To"] = ", ".join(recipients)
+    message["Subject"] = subject
+    message.set_content("Your booking is confirmed.")
+    with smtplib.SMTP("127.0.0.1", port) as client:
+        client.send_message(message, to_addrs=recipients)
+
+
+def _refused(port: int, recipient: str) -> bool:
+    try:
+        _send(port, [recipient], "Refused")
+    except smtplib.SMTPRecipientsRefused:
+        return True
+    return False
+
+
+async def _address(user_id) -> dict:
+    async with AsyncSessionLocal() as db:
+        return await get_or_create_inbound_email_address(db, user_id)
+
+
+async def _inbox_counts(user_ids: list) -> dict:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(inbound_emails.c.user_id, func.count())
+            .where(inbound_emails.c.user_id.in_(user_ids))
+            .group_by(inbound_emails.c.user_id)
+        )
+        return dict(result.all())
+
+
+async def _checks(port: int, first: dict, second: dict):
+    addresses = await asyncio.gather(*(_address(first["user_id"]) for _ in range(20)))
+    async with AsyncSessionLocal() as db:
+        stored = await db.scalar(
+            select(func.count()).where(
+                inbound_email_addresses.c.user_id == first["user_id"]
+            )
+        )
+    yield "concurrent first requests create one address", (
+        stored == 1 and len({a["address"] for a in addresses}) == 1
+    )
+    first_address = addresses[0]["address"]
+    second_address = (await _address(second["user_id"]))["address"]
+
+    await asyncio.to_thread(_send, port, [first_address], "Single")
+    counts = await _inbox_counts([first["user_id"], second["user_id"]])
+    yield "delivers to the recipient's inbox", counts == {first["user_id"]: 1}
+
+    local_part, _, domain = first_address.partition("@")
+    await asyncio.to_thread(
+        _send,
+        port,
+        [first_address, f"{local_part.upper()}@{domain}", second_address, first_address],
+        "Repeated",
+    )
+    counts = await _inbox_counts([first["user_id"], second["user_id"]])
+    yield "stores one copy per inbox however often it is addressed", counts == {
+        first["user_id"]: 2,
+        second["user_id"]: 1,
+    }
+
+    yield "refuses unknown recipients", await asyncio.to_thread(
+        _refused, port, f"u-{uuid4().hex[:16]}@{INBOUND_EMAIL_DOMAIN}"
+    )
+    yield "refuses other domains", await asyncio.to_thread(
+        _refused, port, f"{local_part}@elsewhere.example.com"
+    )
+
+
+async def _main(port: int) -> int:
+    emails = [f"smtp-delivery-{uuid4().hex}@example.com" for _ in range(2)]
+    server = subprocess.Popen(
+        [sys.executable, "-m", "src.smtp_server"],
+        env={**os.environ, "SMTP_HOST": "127.0.0.1", "SMTP_PORT": str(port)},
+    )
+    failed = False
+    try:
+        async with AsyncSessionLocal() as db:
+            first = await create_user(db, email=emails[0], **PROFILE)
+            second = await create_user(db, email=emails[1], **PROFILE)
+        await asyncio.to_thread(_wait_for_port, port)
+        async for name, passed in _checks(port, first, second):
+            print(f"{'ok' if passed else 'FAIL'}  {name}")
+            failed = failed or not passed
+    finally:
+        server.terminate()
+        server.wait()
+        # Addresses and inbox rows go with the users.
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(users).where(users.c.email.in_(emails)))
+            await db.commit()
+        await async_engine.dispose()
+    return 1 if failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=0, help="SMTP port; 0 picks a free one")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(_main(args.port or _free_port())))
+
+
+if __name__ == "__main__":
+    main()
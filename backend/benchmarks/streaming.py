@@ -0,0 +1,188 @@
+"""
+Compare paged and streamed `GET /api/v1/itinerary-items` responses.
+
+Seeds one user with many itinerary items, then serves the app in a fresh
+process per mode and reports time to first byte, total time and the server
+process's peak RSS while fetching every item.
+
+Usage (from backend/, against a migrated database):
+
+    DATABASE_URL=postgresql://... python -m benchmarks.streaming --rows 50000
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import threading
+import time
+
+import requests
+import uvicorn
+from sqlalchemy import create_engine, delete, insert, select
+
+from src.database.pagination import MAX_PAGE_SIZE
+
+BENCHMARK_EMAIL = "streaming-benchmark@example.com"
+
+# Query parameters and headers for each mode; "paged" walks the buffered
+# listing at its largest page size.
+MODES = {
+    "paged": ({"limit": MAX_PAGE_SIZE}, {}),
+    "json-stream": ({"stream": "true"}, {}),
+    "ndjson-stream": ({}, {"Accept": "application/x-ndjson"}),
+}
+
+
+def _rss_kib(field: str) -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def seed(database_url: str, rows: int) -> None:
+    from src.database.models import ItineraryItemType, itinerary_items, trips, users
+
+    engine = create_engine(database_url)
+    with engine.begin() as conn:
+        user_id = conn.execute(
+            select(users.c.user_id).where(users.c.email == BENCHMARK_EMAIL)
+        ).scalar()
+        if user_id is None:
+            user_id = conn.execute(
+                insert(users)
+                .values(
+                    email=BENCHMARK_EMAIL,
+                    password_hash="",
+                    given_name="Streaming",
+                    family_name="Benchmark",
+                )
+                .returning(users.c.user_id)
+            ).scalar_one()
+        conn.execute(
+            delete(itinerary_items).where(
+                itinerary_items.c.created_by_user_id == user_id
+            )
+        )
+        conn.execute(delete(trips).where(trips.c.created_by_user_id == user_id))
+        trip_id = conn.execute(
+            insert(trips)
+            .values(name="Streaming benchmark", created_by_user_id=user_id)
+            .returning(trips.c.trip_id)
+        ).scalar_one()
+        batch = [
+            {
+                "created_by_user_id": user_id,
+                "trip_id": trip_id,
+                "type": ItineraryItemType.FLIGHT,
+                "notes": f"Benchmark leg {i}",
+                "details": {
+                    "flight_number": f"BM{i % 9000}",
+                    "origin_airport_code": "SFO",
+                    "destination_airport_code": "JFK",
+                    "airline_name": "Benchmark Air",
+                },
+            }
+            for i in range(rows)
+        ]
+        for start in range(0, rows, 5000):
+            conn.execute(insert(itinerary_items), batch[start : start + 5000])
+    engine.dispose()
+
+
+def _fetch_all(base_url: str, mode: str) -> tuple[float, float, int]:
+    params, headers = MODES[mode]
+    params = dict(params)
+    start = time.perf_counter()
+    first_byte = None
+    total_bytes = 0
+    cursor = None
+    while True:
+        if cursor:
+            params["cursor"] = cursor
+        with requests.get(
+            f"{base_url}/api/v1/itinerary-items",
+            params=params,
+            headers=headers,
+            stream=True,
+        ) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(64 * 1024):
+                if first_byte is None:
+                    first_byte = time.perf_counter() - start
+                total_bytes += len(chunk)
+            cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    return first_byte or 0.0, time.perf_counter() - start, total_bytes
+
+
+def _measure(mode: str, port: int, results) -> None:
+    """Runs in a fresh process so peak RSS reflects this mode alone."""
+    from src.database.config import engine
+    from src.database.models import users
+    from src.schemas.user import User
+    from src.auth import get_current_user
+    from src.server import app
+
+    with engine.connect() as conn:
+        row = conn.execute(
+            select(users).where(users.c.email == BENCHMARK_EMAIL)
+        ).first()
+    user = User.model_validate(dict(row._mapping))
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        _fetch_all(base_url, mode)  # warm up connections and caches
+        baseline = _rss_kib("VmRSS")
+        ttfb, total, size = _fetch_all(base_url, mode)
+        results.put(
+            {
+                "mode": mode,
+                "ttfb_ms": round(ttfb * 1000, 1),
+                "total_ms": round(total * 1000, 1),
+                "bytes": size,
+                "baseline_rss_mib": round(baseline / 1024, 1),
+                "peak_rss_mib": round(_rss_kib("VmHWM") / 1024, 1),
+            }
+        )
+    except Exception as e:
+        results.put({"mode": mode, "error": str(e)})
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+
+    if not args.skip_seed:
+        seed(os.environ["DATABASE_URL"], args.rows)
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    for mode in MODES:
+        process = context.Process(target=_measure, args=(mode, args.port, results))
+        process.start()
+        print(json.dumps(results.get()))
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
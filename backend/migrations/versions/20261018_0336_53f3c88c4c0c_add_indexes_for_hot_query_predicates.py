@@ -0,0 +1,90 @@
+"""Add indexes for hot query predicates
+
+Revision ID: 53f3c88c4c0c
+Revises: e30033d6f5aa
+Create Date: 2026-10-18 03:36:01.949010+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '53f3c88c4c0c'
+down_revision = 'e30033d6f5aa'
+branch_labels = None
+depends_on = None
+
+
+# Each index is (name, table, columns, extra create_index arguments), tuned to
+# the statements in src/database/crud.
+INDEXES = [
+    # Items on the user's trips: the trip_id branch of the UNION ALL in
+    # _itinerary_items_for_user_stmt, whose trips come from trip_access as in
+    # trip_access_clause and itinerary_item_access_clause. Filters on trip_id,
+    # ordered by (itinerary_datetime NULLS LAST, created_at).
+    (
+        "ix_itinerary_items_trip_id_itinerary_datetime",
+        "itinerary_items",
+        ["trip_id", "itinerary_datetime", "created_at"],
+        {},
+    ),
+    # get_itinerary_items_for_user: items the user created, same ordering.
+    (
+        "ix_itinerary_items_created_by_user_id_itinerary_datetime",
+        "itinerary_items",
+        ["created_by_user_id", "itinerary_datetime", "created_at"],
+        {},
+    ),
+    # Trips a user participates in. The primary key leads with trip_id, so it
+    # cannot serve user_id lookups; trip_id is included for index-only scans.
+    (
+        "ix_trip_participants_user_id_status",
+        "trip_participants",
+        ["user_id", "status"],
+        {"postgresql_include": ["trip_id"]},
+    ),
+    # get_user_invitations: pending invitations, newest first.
+    (
+        "ix_trip_participants_user_id_created_at_invited",
+        "trip_participants",
+        ["user_id", "created_at"],
+        {"postgresql_where": sa.text("status = 'INVITED'")},
+    ),
+    # get_trip_participants: ordered by created_at within a trip.
+    (
+        "ix_trip_participants_trip_id_created_at",
+        "trip_participants",
+        ["trip_id", "created_at"],
+        {},
+    ),
+    # get_trips_for_user: trips the user owns, ordered by start_date.
+    (
+        "ix_trips_created_by_user_id_start_date",
+        "trips",
+        ["created_by_user_id", "start_date"],
+        {},
+    ),
+]
+
+
+def upgrade() -> None:
+    # Build concurrently so existing tables stay writable during the migration.
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table, postgresql_concurrently=True, if_exists=True
+            )
@@ -0,0 +1,134 @@
+"""Add trip_access table maintained by triggers
+
+Revision ID: 013d1c945c95
+Revises: 53f3c88c4c0c
+Create Date: 2026-10-18 03:37:40.436538+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '013d1c945c95'
+down_revision = '53f3c88c4c0c'
+branch_labels = None
+depends_on = None
+
+
+# Recomputes the single trip_access row for (trip, user) from trips and
+# trip_participants. Owners win over participant roles.
+REFRESH_FUNCTION = """
+CREATE OR REPLACE FUNCTION refresh_trip_access(p_trip_id uuid, p_user_id uuid)
+RETURNS void AS $$
+DECLARE
+    v_role text;
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM trips
+        WHERE trip_id = p_trip_id AND created_by_user_id = p_user_id
+    ) THEN
+        v_role := 'owner';
+    ELSE
+        SELECT lower(status::text) INTO v_role
+        FROM trip_participants
+        WHERE trip_id = p_trip_id
+            AND user_id = p_user_id
+            AND status IN ('INVITED', 'JOINED');
+    END IF;
+
+    IF v_role IS NULL THEN
+        DELETE FROM trip_access
+        WHERE trip_id = p_trip_id AND user_id = p_user_id;
+    ELSE
+        INSERT INTO trip_access (user_id, trip_id, role)
+        VALUES (p_user_id, p_trip_id, v_role)
+        ON CONFLICT (user_id, trip_id) DO UPDATE SET role = EXCLUDED.role;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIPS_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION trips_sync_trip_access() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM refresh_trip_access(OLD.trip_id, OLD.created_by_user_id);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM refresh_trip_access(NEW.trip_id, NEW.created_by_user_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIP_PARTICIPANTS_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION trip_participants_sync_trip_access() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM refresh_trip_access(OLD.trip_id, OLD.user_id);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM refresh_trip_access(NEW.trip_id, NEW.user_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+BACKFILL = """
+INSERT INTO trip_access (user_id, trip_id, role)
+SELECT DISTINCT ON (user_id, trip_id) user_id, trip_id, role
+FROM (
+    SELECT created_by_user_id AS user_id, trip_id, 'owner' AS role, 0 AS rank
+    FROM trips
+    UNION ALL
+    SELECT user_id, trip_id, lower(status::text), 1
+    FROM trip_participants
+    WHERE status IN ('INVITED', 'JOINED')
+) AS grants
+ORDER BY user_id, trip_id, rank
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "trip_access",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("trip_id", sa.UUID(), nullable=False),
+        sa.Column("role", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.user_id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["trip_id"], ["trips.trip_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "trip_id"),
+    )
+    op.create_index("ix_trip_access_trip_id", "trip_access", ["trip_id"])
+
+    op.execute(REFRESH_FUNCTION)
+    op.execute(TRIPS_TRIGGER_FUNCTION)
+    op.execute(TRIP_PARTICIPANTS_TRIGGER_FUNCTION)
+    op.execute(
+        """
+        CREATE TRIGGER trips_sync_trip_access
+        AFTER INSERT OR DELETE OR UPDATE OF created_by_user_id ON trips
+        FOR EACH ROW EXECUTE FUNCTION trips_sync_trip_access()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trip_participants_sync_trip_access
+        AFTER INSERT OR DELETE OR UPDATE OF trip_id, user_id, status ON trip_participants
+        FOR EACH ROW EXECUTE FUNCTION trip_participants_sync_trip_access()
+        """
+    )
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trip_participants_sync_trip_access ON trip_participants")
+    op.execute("DROP TRIGGER IF EXISTS trips_sync_trip_access ON trips")
+    op.execute("DROP FUNCTION IF EXISTS trip_participants_sync_trip_access()")
+    op.execute("DROP FUNCTION IF EXISTS trips_sync_trip_access()")
+    op.execute("DROP FUNCTION IF EXISTS refresh_trip_access(uuid, uuid)")
+    op.drop_index("ix_trip_access_trip_id", table_name="trip_access")
+    op.drop_table("trip_access")
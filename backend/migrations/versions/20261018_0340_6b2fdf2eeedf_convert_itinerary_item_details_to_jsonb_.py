@@ -0,0 +1,83 @@
+"""Convert itinerary item details to jsonb with indexes
+
+Revision ID: 6b2fdf2eeedf
+Revises: 013d1c945c95
+Create Date: 2026-10-18 03:40:24.105649+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '6b2fdf2eeedf'
+down_revision = '013d1c945c95'
+branch_labels = None
+depends_on = None
+
+
+DETAIL_FILTER_KEYS = [
+    "flight_number",
+    "origin_airport_code",
+    "destination_airport_code",
+    "train_number",
+    "bus_number",
+    "origin_station",
+    "destination_station",
+]
+
+
+def upgrade() -> None:
+    # Rewrites the table under an exclusive lock; json text is valid jsonb.
+    op.alter_column(
+        "itinerary_items",
+        "details",
+        type_=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using="details::jsonb",
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_itinerary_items_details",
+            "itinerary_items",
+            ["details"],
+            postgresql_using="gin",
+            postgresql_ops={"details": "jsonb_path_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for key in DETAIL_FILTER_KEYS:
+            op.create_index(
+                f"ix_itinerary_items_details_{key}",
+                "itinerary_items",
+                [sa.text(f"(details ->> '{key}')")],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for key in reversed(DETAIL_FILTER_KEYS):
+            op.drop_index(
+                f"ix_itinerary_items_details_{key}",
+                table_name="itinerary_items",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+        op.drop_index(
+            "ix_itinerary_items_details",
+            table_name="itinerary_items",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+    op.alter_column(
+        "itinerary_items",
+        "details",
+        type_=sa.JSON(),
+        existing_nullable=True,
+        postgresql_using="details::json",
+    )
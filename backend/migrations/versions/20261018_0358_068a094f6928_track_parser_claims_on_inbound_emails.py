@@ -0,0 +1,62 @@
+"""Track parser claims on inbound emails
+
+Revision ID: 068a094f6928
+Revises: a8f9dd9ec5d3
+Create Date: 2026-10-18 03:58:46.546600+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '068a094f6928'
+down_revision = 'a8f9dd9ec5d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A new enum value cannot be used in the transaction that adds it.
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE inboundemailstatus ADD VALUE IF NOT EXISTS 'PROCESSING'")
+
+    op.add_column(
+        "inbound_emails",
+        sa.Column("claimed_at", postgresql.TIMESTAMP(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_inbound_emails_claimed_at_processing",
+        "inbound_emails",
+        ["claimed_at"],
+        postgresql_where=sa.text("status = 'PROCESSING'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_inbound_emails_claimed_at_processing",
+        table_name="inbound_emails",
+        postgresql_where=sa.text("status = 'PROCESSING'"),
+    )
+    op.drop_column("inbound_emails", "claimed_at")
+
+    # Postgres cannot drop an enum value, so rebuild the type without it.
+    op.execute("UPDATE inbound_emails SET status = 'PENDING' WHERE status = 'PROCESSING'")
+    op.execute("DROP INDEX IF EXISTS ix_inbound_emails_received_at_pending")
+    op.execute("ALTER TABLE inbound_emails ALTER COLUMN status DROP DEFAULT")
+    op.execute("ALTER TYPE inboundemailstatus RENAME TO inboundemailstatus_old")
+    op.execute("CREATE TYPE inboundemailstatus AS ENUM ('PENDING', 'PARSED', 'FAILED')")
+    op.execute(
+        "ALTER TABLE inbound_emails ALTER COLUMN status TYPE inboundemailstatus "
+        "USING status::text::inboundemailstatus"
+    )
+    op.execute("ALTER TABLE inbound_emails ALTER COLUMN status SET DEFAULT 'PENDING'")
+    op.execute("DROP TYPE inboundemailstatus_old")
+    op.create_index(
+        "ix_inbound_emails_received_at_pending",
+        "inbound_emails",
+        ["received_at"],
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
@@ -0,0 +1,29 @@
+"""Add bus and train itinerary item types
+
+Revision ID: 4592aafed685
+Revises: 068a094f6928
+Create Date: 2026-10-18 04:01:48.501505+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4592aafed685'
+down_revision = '068a094f6928'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The model gained BUS and TRAIN without a migration, so inserting either
+    # type failed on the database enum.
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE itineraryitemtype ADD VALUE IF NOT EXISTS 'BUS'")
+        op.execute("ALTER TYPE itineraryitemtype ADD VALUE IF NOT EXISTS 'TRAIN'")
+
+
+def downgrade() -> None:
+    # Postgres cannot drop enum values; unused labels are harmless.
+    pass
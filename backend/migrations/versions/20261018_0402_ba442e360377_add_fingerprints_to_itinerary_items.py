@@ -0,0 +1,43 @@
+"""Add fingerprints to itinerary items
+
+Revision ID: ba442e360377
+Revises: 4592aafed685
+Create Date: 2026-10-18 04:02:39.266678+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ba442e360377'
+down_revision = '4592aafed685'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "itinerary_items", sa.Column("fingerprint", sa.String(), nullable=True)
+    )
+    # Existing items keep a NULL fingerprint, which never conflicts.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_itinerary_items_created_by_user_id_fingerprint",
+            "itinerary_items",
+            ["created_by_user_id", "fingerprint"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_itinerary_items_created_by_user_id_fingerprint",
+            table_name="itinerary_items",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("itinerary_items", "fingerprint")
@@ -0,0 +1,48 @@
+"""Add indexes for response version tags
+
+Revision ID: 52b7118be05d
+Revises: ba442e360377
+Create Date: 2026-10-18 04:08:07.475804+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '52b7118be05d'
+down_revision = 'ba442e360377'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("ix_itinerary_items_trip_id_updated_at", "itinerary_items", ["trip_id", "updated_at"], {}),
+    ("ix_trip_access_user_id_role", "trip_access", ["user_id", "role"], {"postgresql_include": ["trip_id"]}),
+    ("ix_trip_participants_trip_id_updated_at", "trip_participants", ["trip_id", "updated_at"], {}),
+    ("ix_trips_trip_id_start_date_updated_at", "trips", ["trip_id"], {"postgresql_include": ["start_date", "updated_at"]}),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **options,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
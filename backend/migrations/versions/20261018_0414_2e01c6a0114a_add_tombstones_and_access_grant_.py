@@ -0,0 +1,196 @@
+"""Add tombstones and access grant timestamps for delta sync
+
+Revision ID: 2e01c6a0114a
+Revises: 52b7118be05d
+Create Date: 2026-10-18 04:14:21.118903+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2e01c6a0114a'
+down_revision = '52b7118be05d'
+branch_labels = None
+depends_on = None
+
+
+# As in 013d1c945c95, but stamps `updated_at` when a grant appears or its role
+# changes, so sync can tell which trips a user newly gained.
+REFRESH_FUNCTION = """
+CREATE OR REPLACE FUNCTION refresh_trip_access(p_trip_id uuid, p_user_id uuid)
+RETURNS void AS $$
+DECLARE
+    v_role text;
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM trips
+        WHERE trip_id = p_trip_id AND created_by_user_id = p_user_id
+    ) THEN
+        v_role := 'owner';
+    ELSE
+        SELECT lower(status::text) INTO v_role
+        FROM trip_participants
+        WHERE trip_id = p_trip_id
+            AND user_id = p_user_id
+            AND status IN ('INVITED', 'JOINED');
+    END IF;
+
+    IF v_role IS NULL THEN
+        DELETE FROM trip_access
+        WHERE trip_id = p_trip_id AND user_id = p_user_id;
+    ELSE
+        INSERT INTO trip_access (user_id, trip_id, role)
+        VALUES (p_user_id, p_trip_id, v_role)
+        ON CONFLICT (user_id, trip_id) DO UPDATE
+            SET role = EXCLUDED.role, updated_at = now()
+            WHERE trip_access.role IS DISTINCT FROM EXCLUDED.role;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+PREVIOUS_REFRESH_FUNCTION = """
+CREATE OR REPLACE FUNCTION refresh_trip_access(p_trip_id uuid, p_user_id uuid)
+RETURNS void AS $$
+DECLARE
+    v_role text;
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM trips
+        WHERE trip_id = p_trip_id AND created_by_user_id = p_user_id
+    ) THEN
+        v_role := 'owner';
+    ELSE
+        SELECT lower(status::text) INTO v_role
+        FROM trip_participants
+        WHERE trip_id = p_trip_id
+            AND user_id = p_user_id
+            AND status IN ('INVITED', 'JOINED');
+    END IF;
+
+    IF v_role IS NULL THEN
+        DELETE FROM trip_access
+        WHERE trip_id = p_trip_id AND user_id = p_user_id;
+    ELSE
+        INSERT INTO trip_access (user_id, trip_id, role)
+        VALUES (p_user_id, p_trip_id, v_role)
+        ON CONFLICT (user_id, trip_id) DO UPDATE SET role = EXCLUDED.role;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# An item leaves the view of its trip's members when it is deleted or moved to
+# another trip.
+ITINERARY_ITEMS_TOMBSTONE_FUNCTION = """
+CREATE OR REPLACE FUNCTION itinerary_items_record_tombstone() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND (
+        OLD.trip_id IS NULL OR OLD.trip_id IS NOT DISTINCT FROM NEW.trip_id
+    ) THEN
+        RETURN NULL;
+    END IF;
+    INSERT INTO tombstones (entity_type, entity_id, trip_id, user_id)
+    VALUES ('itinerary_item', OLD.itinerary_item_id, OLD.trip_id, OLD.created_by_user_id);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIP_ACCESS_TOMBSTONE_FUNCTION = """
+CREATE OR REPLACE FUNCTION trip_access_record_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO tombstones (entity_type, entity_id, trip_id, user_id)
+    VALUES ('trip', OLD.trip_id, OLD.trip_id, OLD.user_id);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tombstones",
+        sa.Column(
+            "tombstone_id",
+            sa.UUID(),
+            server_default=sa.text("gen_random_uuid()"),
+            nullable=False,
+        ),
+        sa.Column("entity_type", sa.String(), nullable=False),
+        sa.Column("entity_id", sa.UUID(), nullable=False),
+        sa.Column("trip_id", sa.UUID(), nullable=True),
+        sa.Column("user_id", sa.UUID(), nullable=True),
+        sa.Column(
+            "deleted_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("tombstone_id"),
+    )
+    op.create_index("ix_tombstones_trip_id_deleted_at", "tombstones", ["trip_id", "deleted_at"])
+    op.create_index("ix_tombstones_user_id_deleted_at", "tombstones", ["user_id", "deleted_at"])
+    op.create_index("ix_tombstones_deleted_at", "tombstones", ["deleted_at"])
+
+    op.add_column(
+        "trip_access",
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.execute(REFRESH_FUNCTION)
+
+    op.execute(ITINERARY_ITEMS_TOMBSTONE_FUNCTION)
+    op.execute(TRIP_ACCESS_TOMBSTONE_FUNCTION)
+    op.execute(
+        """
+        CREATE TRIGGER itinerary_items_record_tombstone
+        AFTER DELETE OR UPDATE OF trip_id ON itinerary_items
+        FOR EACH ROW EXECUTE FUNCTION itinerary_items_record_tombstone()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trip_access_record_tombstone
+        AFTER DELETE ON trip_access
+        FOR EACH ROW EXECUTE FUNCTION trip_access_record_tombstone()
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_itinerary_items_created_by_user_id_updated_at",
+            "itinerary_items",
+            ["created_by_user_id", "updated_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_itinerary_items_created_by_user_id_updated_at",
+            table_name="itinerary_items",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+    op.execute("DROP TRIGGER IF EXISTS trip_access_record_tombstone ON trip_access")
+    op.execute("DROP TRIGGER IF EXISTS itinerary_items_record_tombstone ON itinerary_items")
+    op.execute("DROP FUNCTION IF EXISTS trip_access_record_tombstone()")
+    op.execute("DROP FUNCTION IF EXISTS itinerary_items_record_tombstone()")
+
+    op.execute(PREVIOUS_REFRESH_FUNCTION)
+    op.drop_column("trip_access", "updated_at")
+
+    op.drop_index("ix_tombstones_deleted_at", table_name="tombstones")
+    op.drop_index("ix_tombstones_user_id_deleted_at", table_name="tombstones")
+    op.drop_index("ix_tombstones_trip_id_deleted_at", table_name="tombstones")
+    op.drop_table("tombstones")
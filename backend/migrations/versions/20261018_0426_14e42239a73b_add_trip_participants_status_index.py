@@ -0,0 +1,37 @@
+"""Add trip participants status index
+
+Revision ID: 14e42239a73b
+Revises: 2e01c6a0114a
+Create Date: 2026-10-18 04:26:50.873172+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '14e42239a73b'
+down_revision = '2e01c6a0114a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_trip_participants_trip_id_status_created_at",
+            "trip_participants",
+            ["trip_id", "status", "created_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_trip_participants_trip_id_status_created_at",
+            table_name="trip_participants",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,49 @@
+"""Make inbound email addresses unique per user
+
+Revision ID: 7089242ad8e8
+Revises: 14e42239a73b
+Create Date: 2026-10-18 04:47:10.590350+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7089242ad8e8'
+down_revision = '14e42239a73b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Racing first requests could give a user several addresses. Keep the
+    # oldest, the only one the API ever returned after the race.
+    op.execute(
+        "DELETE FROM inbound_email_addresses AS a "
+        "USING inbound_email_addresses AS b "
+        "WHERE a.user_id = b.user_id "
+        "AND (a.created_at, a.local_part) > (b.created_at, b.local_part)"
+    )
+    # Built in the same transaction as the cleanup, so no duplicate can slip
+    # in between; the table holds one small row per user.
+    op.drop_index(
+        "ix_inbound_email_addresses_user_id", table_name="inbound_email_addresses"
+    )
+    op.create_index(
+        "ix_inbound_email_addresses_user_id",
+        "inbound_email_addresses",
+        ["user_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_inbound_email_addresses_user_id", table_name="inbound_email_addresses"
+    )
+    op.create_index(
+        "ix_inbound_email_addresses_user_id",
+        "inbound_email_addresses",
+        ["user_id"],
+    )
\ No newline at end of file
@@ -0,0 +1,72 @@
+import asyncio
+import json
+import os
+from typing import AsyncIterator
+from uuid import UUID
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+import logging
+
+from src.auth import get_current_user
+from src.schemas.user import User
+from src.database.config import AsyncSessionLocal
+from src.database.crud.trip import get_all_accessible_trip_ids
+from src.events import EVENT_HUB
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Seconds between keep-alive comments on an idle stream, so proxies do not
+# time it out and disconnected clients are noticed.
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", 15))
+# Milliseconds a client waits before reconnecting a dropped stream.
+EVENTS_RETRY_MILLISECONDS = int(os.getenv("EVENTS_RETRY_MILLISECONDS", 3000))
+
+
+async def _event_stream(request: Request, user_id: UUID) -> AsyncIterator[bytes]:
+    # The request's own session is closed before a streaming body is sent,
+    # so the stream reads the user's trips on its own, and it subscribes
+    # only once the body runs so the finally below always releases it.
+    try:
+        async with AsyncSessionLocal() as db:
+            subscription = await EVENT_HUB.subscribe(
+                user_id, get_all_accessible_trip_ids(db, user_id)
+            )
+    except Exception:
+        # Headers are already sent, so the only signal left is a closed stream.
+        logger.exception("Error opening event stream")
+        return
+    try:
+        yield f"retry: {EVENTS_RETRY_MILLISECONDS}\n\n".encode()
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), timeout=EVENTS_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield b": keep-alive\n\n"
+                continue
+            data = json.dumps(event, separators=(",", ":"))
+            yield f"event: {event['kind']}\ndata: {data}\n\n".encode()
+    finally:
+        EVENT_HUB.unsubscribe(subscription)
+
+
+@router.get("/events")
+async def stream_events(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Server-sent events announcing changes to the user's trips and invitations.
+
+    Each event names what changed (`kind`, `op`, `trip_id` and the `id` of
+    the row when a single row changed); fetch the changes with `GET /sync`.
+    A `resync` event means events were missed and the client should sync.
+    """
+    return StreamingResponse(
+        _event_stream(request, current_user.user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
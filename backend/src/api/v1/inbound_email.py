@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+from src.auth import get_current_user
+from src.schemas.user import User
+from src.database.config import get_async_db
+from src.database.crud.inbound_email import (
+    get_inbound_email_address,
+    get_or_create_inbound_email_address,
+)
+from src.schemas.inbound_email import InboundEmailAddress
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.get("/inbound-email-address", response_model=InboundEmailAddress)
+async def get_inbound_email_address_endpoint(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+) -> InboundEmailAddress:
+    """Get the current user's forwarding address; 404 until one is created."""
+    try:
+        address = await get_inbound_email_address(
+            db=db,
+            user_id=current_user.user_id,
+        )
+    except Exception as e:
+        logger.error(f"Error fetching inbound email address: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred: {str(e)}",
+        )
+
+    if address is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No forwarding address yet; create one with POST",
+        )
+    return InboundEmailAddress.model_validate(address)
+
+
+@router.post("/inbound-email-address", response_model=InboundEmailAddress)
+async def create_inbound_email_address_endpoint(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+) -> InboundEmailAddress:
+    """Create the current user's forwarding address, or return the existing one."""
+    try:
+        address = await get_or_create_inbound_email_address(
+            db=db,
+            user_id=current_user.user_id,
+        )
+
+        return InboundEmailAddress.model_validate(address)
+
+    except Exception as e:
+        logger.error(f"Error creating inbound email address: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred: {str(e)}",
+        )
@@ -1,30 +1,48 @@
 import traceback
 import uuid
+from datetime import datetime
 from typing import Any, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
 from src.auth import get_current_user
 from src.schemas.user import User
-from src.database.config import get_db
+from src.database.config import get_async_db
 from src.database.crud.itinerary_item import (
     create_itinerary_item as create_itinerary_item_crud,
+    create_itinerary_items as create_itinerary_items_crud,
+    upsert_itinerary_items,
     get_itinerary_items_for_user,
+    stream_itinerary_items_for_user,
     get_itinerary_item_by_id,
     update_itinerary_item,
     delete_itinerary_item,
 )
+from src.database.crud.trip import get_accessible_trip_ids, get_trip_access_role
+from src.database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError
+from src.response_cache import RESPONSE_CACHE, CachedResponse
+from src.serialization import json_response, row_adapter, rows_adapter
+from src.streaming import rows_from_new_session, streaming_response, wants_ndjson
 from src.schemas.itinerary_item import (
     ItineraryItem,
     CreateItineraryItemRequest,
     ItineraryItemUpdate,
     ItineraryItemType,
+    BulkCreateItineraryItemsRequest,
+    BulkCreateItineraryItemsResponse,
+    BulkItineraryItemResult,
+    IngestItineraryItemResult,
+    IngestItineraryItemsResponse,
 )
 
 router = APIRouter()
 logger = logging.Logger(__name__)
 
+_ITINERARY_ITEM_ROW = row_adapter(ItineraryItem)
+_ITINERARY_ITEM_ROWS = rows_adapter(ItineraryItem)
+
 
 def _validate_itinerary_item(item_data: Any) -> ItineraryItem:
     """Validate and convert database item to the appropriate itinerary item type."""
@@ -32,9 +50,9 @@ def _validate_itinerary_item(item_data: Any) -> ItineraryItem:
 
 
 @router.post("/itinerary-items", response_model=ItineraryItem)
-def create_itinerary_item(
+async def create_itinerary_item(
     item: CreateItineraryItemRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ) -> ItineraryItem:
     """Create a new itinerary item."""
@@ -50,7 +68,7 @@ def create_itinerary_item(
                     detail="Invalid trip ID format",
                 )
 
-        item_response = create_itinerary_item_crud(
+        item_response = await create_itinerary_item_crud(
             db=db,
             created_by_user_id=current_user.user_id,
             type=item.type,
@@ -78,13 +96,174 @@ def create_itinerary_item(
         )
 
 
+async def _validate_bulk_items(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    raw_items: list[dict[str, Any]],
+    results: list[BulkItineraryItemResult],
+) -> list[tuple[int, dict[str, Any]]]:
+    """Validate raw bulk items, recording errors in `results`.
+
+    Returns `(index, values)` for each item that can be created, with values
+    ready for the create CRUD functions.
+    """
+    # Validate each item on its own so one bad item doesn't sink the batch
+    valid_items: list[tuple[int, dict[str, Any]]] = []
+    for index, raw_item in enumerate(raw_items):
+        try:
+            item = CreateItineraryItemRequest.model_validate(raw_item)
+        except ValidationError as e:
+            results[index].error = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                for error in e.errors()
+            )
+            continue
+        try:
+            trip_uuid = uuid.UUID(item.trip_id) if item.trip_id else None
+        except ValueError:
+            results[index].error = "Invalid trip ID format"
+            continue
+        valid_items.append(
+            (index, {**item.model_dump(exclude={"trip_id"}), "trip_id": trip_uuid})
+        )
+
+    # Check access once per distinct trip
+    accessible_trips = await get_accessible_trip_ids(
+        db=db,
+        user_id=user_id,
+        trip_ids={
+            values["trip_id"]
+            for _, values in valid_items
+            if values["trip_id"] is not None
+        },
+    )
+    items_to_create = []
+    for index, values in valid_items:
+        if values["trip_id"] is not None and values["trip_id"] not in accessible_trips:
+            results[index].error = "Trip not found or you don't have access to it"
+        else:
+            items_to_create.append((index, values))
+    return items_to_create
+
+
+@router.post(
+    "/itinerary-items/bulk", response_model=BulkCreateItineraryItemsResponse
+)
+async def create_itinerary_items_bulk(
+    bulk_request: BulkCreateItineraryItemsRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+) -> BulkCreateItineraryItemsResponse:
+    """Create several itinerary items in one transaction, reporting failures per item."""
+    try:
+        results = [
+            BulkItineraryItemResult(index=index)
+            for index in range(len(bulk_request.items))
+        ]
+        items_to_create = await _validate_bulk_items(
+            db, current_user.user_id, bulk_request.items, results
+        )
+
+        created_items = await create_itinerary_items_crud(
+            db=db,
+            created_by_user_id=current_user.user_id,
+            items=[values for _, values in items_to_create],
+        )
+        for (index, _), created_item in zip(items_to_create, created_items):
+            results[index].item = _validate_itinerary_item(created_item)
+
+        return BulkCreateItineraryItemsResponse(results=results)
+
+    except Exception as e:
+        logger.error(f"Error creating itinerary items: {traceback.format_exc()}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred: {str(e)}",
+        )
+
+
+@router.post(
+    "/itinerary-items/ingest", response_model=IngestItineraryItemsResponse
+)
+async def ingest_itinerary_items(
+    ingest_request: BulkCreateItineraryItemsRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+) -> IngestItineraryItemsResponse:
+    """Create itinerary items captured from a booking page, skipping repeats.
+
+    Meant for clients such as the browser extension that resend the same
+    booking whenever its page is revisited. Items matching a booking the user
+    already has (same type, booking reference, time and key details) are not
+    written again; their result carries the existing item with `created`
+    false.
+    """
+    try:
+        results = [
+            IngestItineraryItemResult(index=index)
+            for index in range(len(ingest_request.items))
+        ]
+        items_to_create = await _validate_bulk_items(
+            db, current_user.user_id, ingest_request.items, results
+        )
+
+        upserted_items = await upsert_itinerary_items(
+            db=db,
+            created_by_user_id=current_user.user_id,
+            items=[values for _, values in items_to_create],
+        )
+        for (index, _), (item, created) in zip(items_to_create, upserted_items):
+            results[index].item = _validate_itinerary_item(item)
+            results[index].created = created
+
+        return IngestItineraryItemsResponse(results=results)
+
+    except Exception as e:
+        logger.error(f"Error ingesting itinerary items: {traceback.format_exc()}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred: {str(e)}",
+        )
+
+
 @router.get("/itinerary-items", response_model=list[ItineraryItem])
-def get_itinerary_items(
+async def get_itinerary_items(
+    request: Request,
     trip_id: Optional[str] = Query(None, description="Filter by trip ID"),
-    db: Session = Depends(get_db),
+    type: Optional[ItineraryItemType] = Query(None, description="Filter by type"),
+    datetime_from: Optional[datetime] = Query(
+        None, description="Only items at or after this time"
+    ),
+    datetime_to: Optional[datetime] = Query(
+        None, description="Only items before this time"
+    ),
+    flight_number: Optional[str] = Query(None, description="Filter by flight number"),
+    origin_airport_code: Optional[str] = Query(
+        None, description="Filter by origin airport code"
+    ),
+    destination_airport_code: Optional[str] = Query(
+        None, description="Filter by destination airport code"
+    ),
+    train_number: Optional[str] = Query(None, description="Filter by train number"),
+    bus_number: Optional[str] = Query(None, description="Filter by bus number"),
+    origin_station: Optional[str] = Query(
+        None, description="Filter by origin station"
+    ),
+    destination_station: Optional[str] = Query(
+        None, description="Filter by destination station"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor or X-Prev-Cursor header"
+    ),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    stream: bool = Query(
+        False,
+        description="Stream every matching item instead of one page; implied by Accept: application/x-ndjson",
+    ),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ) -> list[ItineraryItem]:
-    """Get itinerary items for the current user, optionally filtered by trip."""
+    """Get a page of itinerary items for the current user, optionally filtered by trip, type, time and details."""
     try:
         # Convert trip_id to UUID if provided
         trip_uuid = None
@@ -97,14 +276,77 @@ def get_itinerary_items(
                     detail="Invalid trip ID format",
                 )
 
-        items_data = get_itinerary_items_for_user(
+        detail_filters = {
+            key: value
+            for key, value in {
+                "flight_number": flight_number,
+                "origin_airport_code": origin_airport_code,
+                "destination_airport_code": destination_airport_code,
+                "train_number": train_number,
+                "bus_number": bus_number,
+                "origin_station": origin_station,
+                "destination_station": destination_station,
+            }.items()
+            if value is not None
+        }
+
+        if stream or wants_ndjson(request):
+            rows = rows_from_new_session(
+                stream_itinerary_items_for_user,
+                user_id=current_user.user_id,
+                trip_id=trip_uuid,
+                type=type,
+                datetime_from=datetime_from,
+                datetime_to=datetime_to,
+                detail_filters=detail_filters,
+            )
+            return streaming_response(request, rows, ItineraryItem)
+
+        # A trip's listing is the same for everyone with access to the trip, so
+        # it is cached per trip and role; other listings depend on the user.
+        cache_key, fill_token = None, 0
+        if trip_uuid is not None:
+            role = await get_trip_access_role(db, trip_uuid, current_user.user_id)
+            if role is not None:
+                cache_key = (trip_uuid, role, ("items", request.url.query))
+                cached = RESPONSE_CACHE.get(cache_key)
+                if cached is not None:
+                    return Response(
+                        content=cached.body,
+                        media_type="application/json",
+                        headers=cached.headers,
+                    )
+                fill_token = RESPONSE_CACHE.begin_fill(trip_uuid)
+
+        page = await get_itinerary_items_for_user(
             db=db,
             user_id=current_user.user_id,
             trip_id=trip_uuid,
+            type=type,
+            datetime_from=datetime_from,
+            datetime_to=datetime_to,
+            detail_filters=detail_filters,
+            cursor=cursor,
+            limit=limit,
         )
 
-        return [_validate_itinerary_item(item) for item in items_data]
+        headers = {}
+        if page.next_cursor:
+            headers["X-Next-Cursor"] = page.next_cursor
+        if page.prev_cursor:
+            headers["X-Prev-Cursor"] = page.prev_cursor
+        response = json_response(_ITINERARY_ITEM_ROWS, page.items, headers=headers)
+        if cache_key is not None:
+            RESPONSE_CACHE.fill(
+                cache_key, CachedResponse(body=response.body, headers=headers), fill_token
+            )
+        return response
 
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     except Exception as e:
         logger.error(f"Error fetching itinerary items: {e}")
         raise HTTPException(
@@ -114,9 +356,9 @@ def get_itinerary_items(
 
 
 @router.get("/itinerary-items/{item_id}", response_model=ItineraryItem)
-def get_itinerary_item(
+async def get_itinerary_item(
     item_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ) -> ItineraryItem:
     """Get a specific itinerary item by ID."""
@@ -125,7 +367,7 @@ def get_itinerary_item(
         item_uuid = uuid.UUID(item_id)
 
         # Get item details
-        item_data = get_itinerary_item_by_id(
+        item_data = await get_itinerary_item_by_id(
             db=db,
             itinerary_item_id=item_uuid,
             user_id=current_user.user_id,
@@ -137,7 +379,7 @@ def get_itinerary_item(
                 detail="Itinerary item not found or you don't have access to it",
             )
 
-        return _validate_itinerary_item(item_data)
+        return json_response(_ITINERARY_ITEM_ROW, item_data)
 
     except ValueError:
         raise HTTPException(
@@ -153,10 +395,10 @@ def get_itinerary_item(
 
 
 @router.put("/itinerary-items/{item_id}", response_model=ItineraryItem)
-def update_itinerary_item_endpoint(
+async def update_itinerary_item_endpoint(
     item_id: str,
     item_update: ItineraryItemUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ) -> ItineraryItem:
     """Update an itinerary item."""
@@ -176,7 +418,7 @@ def update_itinerary_item_endpoint(
                 )
 
         # Update item
-        updated_item = update_itinerary_item(
+        updated_item = await update_itinerary_item(
             db=db,
             itinerary_item_id=item_uuid,
             user_id=current_user.user_id,
@@ -211,9 +453,9 @@ def update_itinerary_item_endpoint(
 
 
 @router.delete("/itinerary-items/{item_id}")
-def delete_itinerary_item_endpoint(
+async def delete_itinerary_item_endpoint(
     item_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Delete an itinerary item."""
@@ -222,7 +464,7 @@ def delete_itinerary_item_endpoint(
         item_uuid = uuid.UUID(item_id)
 
         # Delete item
-        deleted = delete_itinerary_item(
+        deleted = await delete_itinerary_item(
             db=db,
             itinerary_item_id=item_uuid,
             user_id=current_user.user_id,
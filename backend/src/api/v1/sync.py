@@ -0,0 +1,76 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+from src.auth import get_current_user
+from src.schemas.user import User
+from src.database.config import get_async_db
+from src.database.crud.sync import SyncCursorExpiredError, get_changes_since
+from src.database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError
+from src.schemas.itinerary_item import ItineraryItem
+from src.schemas.sync import SyncChanges, Tombstone
+from src.schemas.trip import Trip
+from src.schemas.trip_participant import TripParticipantWithUser
+from src.serialization import json_response, row_adapter, row_type
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+_SYNC_CHANGES = row_adapter(
+    SyncChanges,
+    trips=list[row_type(Trip)],
+    itinerary_items=list[row_type(ItineraryItem)],
+    participants=list[row_type(TripParticipantWithUser)],
+    # Stored as plain strings, like trip access roles
+    deleted=list[row_type(Tombstone, entity_type=str)],
+)
+
+
+@router.get("/sync", response_model=SyncChanges)
+async def sync(
+    since: Optional[str] = Query(
+        None, description="Cursor from the previous sync; omit for a full sync"
+    ),
+    limit: int = Query(
+        DEFAULT_PAGE_SIZE,
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description="Rows per page",
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    """Trips, itinerary items, participants and deletions changed since `since`.
+
+    Apply rows as upserts by ID and drop everything in `deleted`, then pass
+    the returned `cursor` as `since` next time. Changes come in pages: keep
+    passing `cursor` while `has_more` is set. After a full sync, replace
+    local state with the rows of all its pages. 410 means the cursor is too
+    old: sync again without it.
+    """
+    try:
+        changes = await get_changes_since(
+            db=db,
+            user_id=current_user.user_id,
+            cursor=since,
+            limit=limit,
+        )
+        return json_response(_SYNC_CHANGES, changes)
+
+    except SyncCursorExpiredError as e:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail=str(e),
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except Exception as e:
+        logger.error(f"Error syncing changes: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred: {str(e)}",
+        )
@@ -1,46 +1,67 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
 from src.auth import get_current_user
 from src.schemas.user import User
-from src.database.config import get_db
+from src.database.config import get_async_db
 from src.database.crud.trip import (
     create_trip as create_trip_crud,
     get_trips_for_user,
-    get_trip_by_id,
+    get_trips_version,
+    get_trip_details_version,
+    stream_trips_for_user,
+    get_trip_details_json,
     update_trip,
 )
-from src.database.crud.itinerary_item import get_itinerary_items_for_trip
+from src.database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError
 from src.database.crud.trip_participant import (
     invite_user_to_trip,
+    invite_users_to_trip,
     get_user_invitations,
     respond_to_invitation,
     get_trip_participants,
+    get_trip_participant_counts,
+    get_trip_participants_version,
 )
+from src.conditional import etag_matches, make_etag, not_modified
+from src.response_cache import RESPONSE_CACHE, CachedResponse
+from src.serialization import json_response, rows_adapter
+from src.streaming import rows_from_new_session, streaming_response, wants_ndjson
 from src.schemas.trip import Trip, CreateTripRequest, TripDetails
 from src.schemas.itinerary_item import ItineraryItem
 from src.schemas.trip_participant import (
     TripInvitation,
     InviteUserRequest,
+    BatchInviteUsersRequest,
+    BatchInviteUsersResponse,
+    BatchInvitationResult,
+    InvitationOutcome,
     RespondToInvitationRequest,
     TripParticipantWithUser,
+    TripParticipantCounts,
     ParticipantStatus,
 )
 
 router = APIRouter()
 logger = logging.Logger(__name__)
 
+_TRIP_ROWS = rows_adapter(Trip)
+_TRIP_INVITATION_ROWS = rows_adapter(TripInvitation)
+_TRIP_PARTICIPANT_ROWS = rows_adapter(TripParticipantWithUser)
+
 
 @router.post("/trips", response_model=Trip)
-def create_trip(
+async def create_trip(
     trip: CreateTripRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ) -> Trip:
     try:
-        trip_response = create_trip_crud(
+        trip_response = await create_trip_crud(
             db=db,
             name=trip.name,
             created_by_user_id=current_user.user_id,
@@ -69,19 +90,70 @@ def create_trip(
 
 
 @router.get("/trips", response_model=list[Trip])
-def get_trips(
-    db: Session = Depends(get_db),
+async def get_trips(
+    request: Request,
+    start_from: Optional[datetime] = Query(
+        None, description="Only trips starting at or after this time (default: now)"
+    ),
+    start_to: Optional[datetime] = Query(
+        None, description="Only trips starting before this time"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor or X-Prev-Cursor header"
+    ),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    stream: bool = Query(
+        False,
+        description="Stream every matching trip instead of one page; implied by Accept: application/x-ndjson",
+    ),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ) -> list[Trip]:
+    """Get a page of the current user's trips, ordered by start date."""
     try:
-        trips_data = get_trips_for_user(
+        if stream or wants_ndjson(request):
+            rows = rows_from_new_session(
+                stream_trips_for_user,
+                user_id=current_user.user_id,
+                future_only=start_from is None,
+                start_from=start_from,
+                start_to=start_to,
+            )
+            return streaming_response(request, rows, Trip)
+
+        version = await get_trips_version(
             db=db,
             user_id=current_user.user_id,
-            future_only=True,
+            future_only=start_from is None,
+            start_from=start_from,
+            start_to=start_to,
         )
+        etag = make_etag(current_user.user_id, request.url.query, *version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
 
-        return [Trip.model_validate(trip) for trip in trips_data]
+        page = await get_trips_for_user(
+            db=db,
+            user_id=current_user.user_id,
+            future_only=start_from is None,
+            start_from=start_from,
+            start_to=start_to,
+            cursor=cursor,
+            limit=limit,
+        )
 
+        headers = {"ETag": etag}
+        if page.next_cursor:
+            headers["X-Next-Cursor"] = page.next_cursor
+        if page.prev_cursor:
+            headers["X-Prev-Cursor"] = page.prev_cursor
+        return json_response(_TRIP_ROWS, page.items, headers=headers)
+
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     except Exception as e:
         logger.error(f"Error fetching trips: {e}")
         raise HTTPException(
@@ -91,39 +163,57 @@ def get_trips(
 
 
 @router.get("/trips/{trip_id}", response_model=TripDetails)
-def get_trip_details(
+async def get_trip_details(
+    request: Request,
     trip_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ) -> TripDetails:
     try:
         # Convert string trip_id to UUID
         trip_uuid = uuid.UUID(trip_id)
 
-        # Get trip details
-        trip_data = get_trip_by_id(
+        # Answer a matching If-None-Match before building the document
+        version = await get_trip_details_version(
             db=db,
             trip_id=trip_uuid,
             user_id=current_user.user_id,
         )
-
-        if not trip_data:
+        if version is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Trip not found or you don't have access to it",
             )
+        etag = make_etag(current_user.user_id, trip_uuid, *version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        role = version[0]
+        cache_key = (trip_uuid, role, "details")
+        cached = RESPONSE_CACHE.get(cache_key)
+        if cached is None:
+            fill_token = RESPONSE_CACHE.begin_fill(trip_uuid)
+            # Postgres assembles the whole document, items included, in one query
+            trip_json = await get_trip_details_json(
+                db=db,
+                trip_id=trip_uuid,
+                user_id=current_user.user_id,
+            )
 
-        # Get itinerary items for this trip
-        itinerary_items = get_itinerary_items_for_trip(
-            db=db,
-            trip_id=trip_uuid,
+            if trip_json is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Trip not found or you don't have access to it",
+                )
+            cached = CachedResponse(body=trip_json.encode())
+            RESPONSE_CACHE.fill(cache_key, cached, fill_token)
+
+        return Response(
+            content=cached.body,
+            media_type="application/json",
+            headers={**cached.headers, "ETag": etag},
         )
 
-        # Add itinerary items to trip data
-        trip_data["itinerary_items"] = itinerary_items
-
-        return TripDetails.model_validate(trip_data)
-
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -138,10 +228,10 @@ def get_trip_details(
 
 
 @router.put("/trips/{trip_id}", response_model=Trip)
-def update_trip_details(
+async def update_trip_details(
     trip_id: str,
     trip: CreateTripRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ) -> Trip:
     try:
@@ -149,7 +239,7 @@ def update_trip_details(
         trip_uuid = uuid.UUID(trip_id)
 
         # Update trip
-        updated_trip = update_trip(
+        updated_trip = await update_trip(
             db=db,
             trip_id=trip_uuid,
             user_id=current_user.user_id,
@@ -181,10 +271,10 @@ def update_trip_details(
 
 
 @router.post("/trips/{trip_id}/invite")
-def invite_user_to_trip_endpoint(
+async def invite_user_to_trip_endpoint(
     trip_id: str,
     invite_request: InviteUserRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Invite a user to a trip by email."""
@@ -194,13 +284,13 @@ def invite_user_to_trip_endpoint(
         # Check if current user has access to this trip
         from src.database.crud.trip import user_has_trip_access
 
-        if not user_has_trip_access(db, trip_uuid, current_user.user_id):
+        if not await user_has_trip_access(db, trip_uuid, current_user.user_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Trip not found or you don't have permission to invite users",
             )
 
-        invitation = invite_user_to_trip(
+        invitation = await invite_user_to_trip(
             db=db,
             trip_id=trip_uuid,
             user_email=invite_request.email,
@@ -228,21 +318,70 @@ def invite_user_to_trip_endpoint(
         )
 
 
+@router.post("/trips/{trip_id}/invite/batch", response_model=BatchInviteUsersResponse)
+async def batch_invite_users_to_trip_endpoint(
+    trip_id: str,
+    invite_request: BatchInviteUsersRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+) -> BatchInviteUsersResponse:
+    """Invite several users to a trip by email, reporting the outcome for each email."""
+    try:
+        trip_uuid = uuid.UUID(trip_id)
+
+        # Check if current user has access to this trip
+        from src.database.crud.trip import user_has_trip_access
+
+        if not await user_has_trip_access(db, trip_uuid, current_user.user_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Trip not found or you don't have permission to invite users",
+            )
+
+        invitations = await invite_users_to_trip(
+            db=db,
+            trip_id=trip_uuid,
+            user_emails=invite_request.emails,
+            inviter_user_id=current_user.user_id,
+        )
+
+        results = []
+        for email in dict.fromkeys(invite_request.emails):
+            if email not in invitations:
+                outcome = InvitationOutcome.USER_NOT_FOUND
+            elif invitations[email] is None:
+                outcome = InvitationOutcome.ALREADY_PARTICIPANT
+            else:
+                outcome = InvitationOutcome.INVITED
+            results.append(BatchInvitationResult(email=email, outcome=outcome))
+        return BatchInviteUsersResponse(results=results)
+
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid trip ID format",
+        )
+    except Exception as e:
+        logger.error(f"Error inviting users to trip: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred: {str(e)}",
+        )
+
+
 @router.get("/invitations", response_model=list[TripInvitation])
-def get_my_invitations(
-    db: Session = Depends(get_db),
+async def get_my_invitations(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ) -> list[TripInvitation]:
     """Get all pending invitations for the current user."""
     try:
-        invitations_data = get_user_invitations(
+        invitations_data = await get_user_invitations(
             db=db,
             user_id=current_user.user_id,
         )
 
-        return [
-            TripInvitation.model_validate(invitation) for invitation in invitations_data
-        ]
+        return json_response(_TRIP_INVITATION_ROWS, invitations_data)
 
     except Exception as e:
         logger.error(f"Error fetching user invitations: {e}")
@@ -253,10 +392,10 @@ def get_my_invitations(
 
 
 @router.post("/trips/{trip_id}/respond")
-def respond_to_trip_invitation(
+async def respond_to_trip_invitation(
     trip_id: str,
     response_request: RespondToInvitationRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Respond to a trip invitation (accept or decline)."""
@@ -272,7 +411,7 @@ def respond_to_trip_invitation(
                 detail="Response must be either 'JOINED' or 'DECLINED'",
             )
 
-        response_result = respond_to_invitation(
+        response_result = await respond_to_invitation(
             db=db,
             trip_id=trip_uuid,
             user_id=current_user.user_id,
@@ -308,34 +447,58 @@ def respond_to_trip_invitation(
 @router.get(
     "/trips/{trip_id}/participants", response_model=list[TripParticipantWithUser]
 )
-def get_trip_participants_endpoint(
+async def get_trip_participants_endpoint(
+    request: Request,
     trip_id: str,
-    db: Session = Depends(get_db),
+    participant_status: Optional[ParticipantStatus] = Query(
+        None, alias="status", description="Filter by participant status"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor or X-Prev-Cursor header"
+    ),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ) -> list[TripParticipantWithUser]:
-    """Get all participants for a trip."""
+    """Get a page of participants for a trip, optionally filtered by status."""
     try:
         trip_uuid = uuid.UUID(trip_id)
 
-        # Check if current user has access to this trip
-        from src.database.crud.trip import user_has_trip_access
-
-        if not user_has_trip_access(db, trip_uuid, current_user.user_id):
+        version = await get_trip_participants_version(
+            db=db,
+            trip_id=trip_uuid,
+            user_id=current_user.user_id,
+        )
+        if version is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Trip not found or you don't have permission to view participants",
             )
+        etag = make_etag(current_user.user_id, trip_uuid, request.url.query, *version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
 
-        participants_data = get_trip_participants(
+        page = await get_trip_participants(
             db=db,
             trip_id=trip_uuid,
+            user_id=current_user.user_id,
+            status=participant_status,
+            cursor=cursor,
+            limit=limit,
         )
 
-        return [
-            TripParticipantWithUser.model_validate(participant)
-            for participant in participants_data
-        ]
+        headers = {"ETag": etag}
+        if page.next_cursor:
+            headers["X-Next-Cursor"] = page.next_cursor
+        if page.prev_cursor:
+            headers["X-Prev-Cursor"] = page.prev_cursor
+        return json_response(_TRIP_PARTICIPANT_ROWS, page.items, headers=headers)
 
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -347,3 +510,41 @@ def get_trip_participants_endpoint(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred: {str(e)}",
         )
+
+
+@router.get(
+    "/trips/{trip_id}/participants/counts", response_model=TripParticipantCounts
+)
+async def get_trip_participant_counts_endpoint(
+    trip_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+) -> TripParticipantCounts:
+    """Get the number of participants of a trip in each status."""
+    try:
+        trip_uuid = uuid.UUID(trip_id)
+
+        counts = await get_trip_participant_counts(
+            db=db,
+            trip_id=trip_uuid,
+            user_id=current_user.user_id,
+        )
+        if counts is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Trip not found or you don't have permission to view participants",
+            )
+
+        return TripParticipantCounts(counts=counts, total=sum(counts.values()))
+
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid trip ID format",
+        )
+    except Exception as e:
+        logger.error(f"Error fetching trip participant counts: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred: {str(e)}",
+        )
@@ -1,22 +1,58 @@
+import hashlib
+import os
+import time
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from firebase_admin import auth
 import logging
 
-from src.schemas.user import User
+from src.cache import TTLCache
+from src.schemas.user import User, UserStatus
 from src.firebase import get_firebase_app
-from src.database.config import get_db
-from src.database.crud.user import get_user_by_email
+from src.firebase_keys import KEY_RING
+from src.database.config import get_async_db
+from src.database.crud.user import USER_CACHE, get_user_by_email
 
 logger = logging.getLogger(__name__)
 
 
 OAUTH2_SCHEME = OAuth2PasswordBearer(tokenUrl="/token")
 
+# Verified ID tokens, keyed by a hash of the raw token. Firebase ID tokens live
+# for an hour, so entries are also dropped at the token's own `exp`.
+TOKEN_CACHE = TTLCache(
+    maxsize=int(os.getenv("TOKEN_CACHE_MAX_SIZE", 10000)),
+    ttl=float(os.getenv("TOKEN_CACHE_TTL_SECONDS", 3600)),
+)
+
+
+def verify_token(token: str) -> dict:
+    """Verify a Firebase ID token, reusing the decoded claims of recently seen tokens.
+
+    Tokens are checked against the prefetched key ring once it has keys, and
+    through `auth.verify_id_token` until then; failures raise the errors of
+    whichever path was used (key ring errors are `ValueError`s).
+    """
+    cache_key = hashlib.sha256(token.encode()).digest()
+    decoded_token = TOKEN_CACHE.get(cache_key)
+    if decoded_token is not None:
+        return decoded_token
+
+    if KEY_RING.ready:
+        decoded_token = KEY_RING.verify(token)
+    else:
+        decoded_token = auth.verify_id_token(token, app=get_firebase_app())
+
+    # Convert the wall-clock expiry into the cache's monotonic clock.
+    expires_in = decoded_token["exp"] - time.time()
+    if expires_in > 0:
+        TOKEN_CACHE.set(cache_key, decoded_token, time.monotonic() + expires_in)
+    return decoded_token
+
 
 async def get_current_user(
-    token: str = Depends(OAUTH2_SCHEME), db: Session = Depends(get_db)
+    token: str = Depends(OAUTH2_SCHEME), db: AsyncSession = Depends(get_async_db)
 ) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -25,7 +61,7 @@ async def get_current_user(
     )
 
     try:
-        decoded_token = auth.verify_id_token(token, app=get_firebase_app())
+        decoded_token = verify_token(token)
     except (
         auth.CertificateFetchError,
         auth.UserDisabledError,
@@ -36,8 +72,18 @@ async def get_current_user(
 
     email = decoded_token["email"]
 
-    user = get_user_by_email(db, email)
+    user = USER_CACHE.get(email)
     if user is None:
-        logger.error(f"User authenticated but not found: {email}")
+        # A status change committed while the row is read evicts the email;
+        # the token keeps the row read before it from being cached.
+        fill_token = USER_CACHE.begin_fill()
+        user_row = await get_user_by_email(db, email)
+        if user_row is None:
+            logger.error(f"User authenticated but not found: {email}")
+            raise credentials_exception
+        user = User.model_validate(user_row)
+        USER_CACHE.fill(email, user, fill_token)
+
+    if user.status == UserStatus.DEACTIVATED:
         raise credentials_exception
-    return User.model_validate(user)
+    return user
@@ -0,0 +1,114 @@
+"""
+Small in-process caches shared by the request path.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire at a per-entry deadline.
+
+    Entries are dropped when they expire or when the cache grows past
+    `maxsize`, in which case the least recently used entry goes first.
+
+    A value read from elsewhere while the key is being deleted can be stale;
+    take a token with `begin_fill` before reading it and store it with
+    `fill`, which refuses it if the key was deleted in the meantime.
+    """
+
+    # Keys whose last deletion is remembered for rejecting stale fills;
+    # older ones are covered conservatively by `_forgotten_before`.
+    DELETION_HISTORY = 10000
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_fills = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._sequence = 0
+        self._deleted_at: OrderedDict[Hashable, int] = OrderedDict()
+        self._forgotten_before = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, expires_at: float | None = None) -> None:
+        """Store `value`; `expires_at` is a `time.monotonic()` deadline capped at the TTL."""
+        deadline = time.monotonic() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        with self._lock:
+            self._store(key, value, deadline)
+
+    def begin_fill(self) -> int:
+        with self._lock:
+            return self._sequence
+
+    def fill(
+        self, key: Hashable, value: Any, token: int, expires_at: float | None = None
+    ) -> bool:
+        """Like `set`, unless `key` was deleted since `begin_fill` returned `token`."""
+        deadline = time.monotonic() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        with self._lock:
+            if self._deleted_at.get(key, self._forgotten_before) > token:
+                self.stale_fills += 1
+                return False
+            self._store(key, value, deadline)
+            return True
+
+    def _store(self, key: Hashable, value: Any, deadline: float) -> None:
+        self._entries[key] = (deadline, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._sequence += 1
+            self._deleted_at[key] = self._sequence
+            self._deleted_at.move_to_end(key)
+            while len(self._deleted_at) > self.DELETION_HISTORY:
+                _, sequence = self._deleted_at.popitem(last=False)
+                self._forgotten_before = max(self._forgotten_before, sequence)
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            # Fills already in flight predate the clear and must not land.
+            self._sequence += 1
+            self._forgotten_before = self._sequence
+            self._deleted_at.clear()
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "stale_fills": self.stale_fills,
+            }
@@ -0,0 +1,43 @@
+"""
+Conditional GETs: ETags derived from cheap version queries.
+
+An endpoint computes a version tag for what it is about to return (row
+counts and latest `updated_at`, read from indexes), turns it into an ETag and
+answers a matching `If-None-Match` with 304 before loading or serializing the
+body.
+"""
+
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over `parts`, which must identify the representation.
+
+    Include the requesting user and the query string alongside the data
+    version, so different users or filters never share a tag.
+    """
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's `If-None-Match` matches `etag` (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = _opaque(etag)
+    return any(_opaque(tag) == opaque for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -1,19 +1,72 @@
 import os
-from sqlalchemy import create_engine
+import time
+import uuid
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from src.database.models import metadata_obj
+from src.metrics import Histogram
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL is not set")
 
+# Connection pool settings, shared by the sync and async engines.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+# Seconds to wait for a free connection before giving up with a 503.
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 5))
+# Seconds after which a pooled connection is replaced.
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# PgBouncer in transaction mode cannot keep named prepared statements across
+# transactions, so asyncpg's statement caches must be disabled.
+DB_PGBOUNCER_TRANSACTION_MODE = (
+    os.getenv("DB_PGBOUNCER_TRANSACTION_MODE", "false").lower() == "true"
+)
+
+# Rows fetched per round trip by server-side cursors behind streamed listings.
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", 500))
+
+_pool_options = {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_pre_ping": DB_POOL_PRE_PING,
+}
+
 # Create engine
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **_pool_options)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine used on the request path; same database, asyncpg driver.
+_async_url = make_url(DATABASE_URL).set(drivername="postgresql+asyncpg")
+_async_connect_args = {}
+if DB_PGBOUNCER_TRANSACTION_MODE:
+    _async_url = _async_url.update_query_dict({"prepared_statement_cache_size": "0"})
+    _async_connect_args = {
+        "statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+
+async_engine = create_async_engine(
+    _async_url, connect_args=_async_connect_args, **_pool_options
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+POOL_WAIT_SECONDS = Histogram(
+    [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+)
+pool_checkout_timeouts = 0
+
 
 def get_db():
     """Dependency for getting DB session"""
@@ -24,6 +77,39 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Dependency for getting an async DB session.
+
+    The connection is checked out up front so pool waits are measured here and
+    a checkout timeout surfaces before the endpoint runs.
+    """
+    global pool_checkout_timeouts
+    async with AsyncSessionLocal() as db:
+        start = time.perf_counter()
+        try:
+            await db.connection()
+        except PoolTimeoutError:
+            pool_checkout_timeouts += 1
+            raise
+        finally:
+            POOL_WAIT_SECONDS.observe(time.perf_counter() - start)
+        yield db
+
+
+def get_pool_stats() -> dict:
+    pool = async_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "timeout_seconds": DB_POOL_TIMEOUT,
+        "checkout_timeouts": pool_checkout_timeouts,
+        "wait_seconds": POOL_WAIT_SECONDS.snapshot(),
+    }
+
+
 def init_db():
     """Initialize the database by creating all tables"""
     metadata_obj.create_all(bind=engine)
@@ -0,0 +1,166 @@
+import os
+import secrets
+from datetime import timedelta
+from uuid import UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, func, insert, or_, select, update
+
+from src.database.models import (
+    inbound_email_addresses,
+    inbound_emails,
+    InboundEmailStatus,
+)
+
+# Domain whose mail is routed to the SMTP ingestion server.
+INBOUND_EMAIL_DOMAIN = os.getenv("INBOUND_EMAIL_DOMAIN", "localhost").lower()
+
+
+def _new_local_part() -> str:
+    # Lowercase and unguessable: mail servers may fold case, and the address
+    # is the only thing standing between a sender and the user's inbox.
+    return f"u-{secrets.token_hex(8)}"
+
+
+def _with_address(row: dict) -> dict:
+    row["address"] = f"{row['local_part']}@{INBOUND_EMAIL_DOMAIN}"
+    return row
+
+
+def _address_stmt(user_id: UUID):
+    return select(
+        inbound_email_addresses.c.local_part,
+        inbound_email_addresses.c.user_id,
+        inbound_email_addresses.c.created_at,
+    ).where(inbound_email_addresses.c.user_id == user_id)
+
+
+async def get_inbound_email_address(
+    db: AsyncSession,
+    user_id: UUID,
+) -> dict | None:
+    """Get the user's forwarding address, if they have one."""
+    result = await db.execute(_address_stmt(user_id))
+    row = result.first()
+    return _with_address(dict(row._mapping)) if row else None
+
+
+async def get_or_create_inbound_email_address(
+    db: AsyncSession,
+    user_id: UUID,
+) -> dict:
+    """Get the user's forwarding address, creating one on first use.
+
+    Concurrent first calls insert at most one address; the others read it.
+    """
+    stmt = (
+        pg_insert(inbound_email_addresses)
+        .values(local_part=_new_local_part(), user_id=user_id)
+        .on_conflict_do_nothing(index_elements=[inbound_email_addresses.c.user_id])
+        .returning(
+            inbound_email_addresses.c.local_part,
+            inbound_email_addresses.c.user_id,
+            inbound_email_addresses.c.created_at,
+        )
+    )
+    result = await db.execute(stmt)
+    row = result.first()
+    if row is None:
+        # The user already has an address
+        row = (await db.execute(_address_stmt(user_id))).first()
+    await db.commit()
+    return _with_address(dict(row._mapping))
+
+
+async def get_user_id_for_inbound_address(
+    db: AsyncSession,
+    local_part: str,
+) -> UUID | None:
+    """Look up the owner of a forwarding address by its primary key."""
+    stmt = select(inbound_email_addresses.c.user_id).where(
+        inbound_email_addresses.c.local_part == local_part.lower()
+    )
+    result = await db.execute(stmt)
+    return result.scalar()
+
+
+async def store_inbound_emails(
+    db: AsyncSession,
+    messages: list[dict],
+) -> list[UUID]:
+    """Persist raw inbound messages as pending inbox rows in one transaction.
+
+    Each message has `user_id`, `recipient`, `mail_from` and `raw_message`.
+    """
+    if not messages:
+        return []
+    stmt = insert(inbound_emails).returning(
+        inbound_emails.c.inbound_email_id, sort_by_parameter_order=True
+    )
+    result = await db.execute(stmt, messages)
+    await db.commit()
+    return list(result.scalars().all())
+
+
+async def claim_inbound_emails(
+    db: AsyncSession,
+    limit: int,
+    claim_timeout_seconds: float,
+) -> list[dict]:
+    """Claim up to `limit` messages for parsing, oldest first.
+
+    Pending messages are claimed along with ones whose previous claim is older
+    than `claim_timeout_seconds` (a worker died mid-batch). SKIP LOCKED lets
+    several workers claim concurrently without handing out the same message.
+    Claims are stamped and aged by the database clock, so workers whose
+    clocks drift neither steal live claims nor leave dead ones stuck.
+    """
+    claimable = (
+        select(inbound_emails.c.inbound_email_id)
+        .where(
+            or_(
+                inbound_emails.c.status == InboundEmailStatus.PENDING,
+                and_(
+                    inbound_emails.c.status == InboundEmailStatus.PROCESSING,
+                    inbound_emails.c.claimed_at
+                    < func.now() - timedelta(seconds=claim_timeout_seconds),
+                ),
+            )
+        )
+        .order_by(inbound_emails.c.received_at.asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        update(inbound_emails)
+        .where(inbound_emails.c.inbound_email_id.in_(claimable.scalar_subquery()))
+        .values(status=InboundEmailStatus.PROCESSING, claimed_at=func.now())
+        .returning(
+            inbound_emails.c.inbound_email_id,
+            inbound_emails.c.user_id,
+            inbound_emails.c.raw_message,
+        )
+    )
+    result = await db.execute(stmt)
+    await db.commit()
+    return [dict(row._mapping) for row in result.fetchall()]
+
+
+async def finish_inbound_email(
+    db: AsyncSession,
+    inbound_email_id: UUID,
+    status: InboundEmailStatus,
+    error: str | None = None,
+) -> None:
+    """Record the outcome of parsing a claimed message."""
+    stmt = (
+        update(inbound_emails)
+        .where(inbound_emails.c.inbound_email_id == inbound_email_id)
+        .values(
+            status=status,
+            error=error,
+            processed_at=func.now(),
+        )
+    )
+    await db.execute(stmt)
+    await db.commit()
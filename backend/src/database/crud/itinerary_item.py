@@ -1,20 +1,39 @@
-from datetime import datetime
-from uuid import UUID
-from typing import Any
-from sqlalchemy.orm import Session
-from sqlalchemy import insert, select, and_, or_, update, delete
+import hashlib
+import json
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+from typing import Any, AsyncIterator, Iterable, Mapping
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    insert,
+    select,
+    and_,
+    or_,
+    update,
+    delete,
+    exists,
+    func,
+    union_all,
+)
 
+from src.database.config import STREAM_BATCH_SIZE
+from src.database.crud.trip import accessible_trip_ids
 from src.database.models import (
     itinerary_items,
-    trips,
-    trip_participants,
-    ParticipantStatus,
+    trip_access,
     ItineraryItemType,
+    ITINERARY_ITEM_DETAIL_FILTER_KEYS,
 )
+from src.database.pagination import DEFAULT_PAGE_SIZE, Page, paginate
+from src.events import CREATED, DELETED, UPDATED, change_event, publish_events
+from src.response_cache import invalidate_trips, publish_trip_invalidations
 
 
-def create_itinerary_item(
-    db: Session,
+async def create_itinerary_item(
+    db: AsyncSession,
     created_by_user_id: UUID,
     type: ItineraryItemType,
     trip_id: UUID | None = None,
@@ -54,67 +73,272 @@ def create_itinerary_item(
         )
     )
 
-    item_result = db.execute(stmt_insert_item)
-    db.commit()
+    item_result = await db.execute(stmt_insert_item)
     created_item_row = item_result.first()
     if not created_item_row:
         raise ValueError("Itinerary item creation failed to return item data.")
+    await publish_events(db, _item_events(CREATED, [created_item_row._mapping]))
+    await publish_trip_invalidations(db, [trip_id])
+    await db.commit()
+    invalidate_trips([trip_id])
     return dict(created_item_row._mapping)
 
 
-def user_has_itinerary_item_access(
-    db: Session,
+async def create_itinerary_items(
+    db: AsyncSession,
+    created_by_user_id: UUID,
+    items: list[dict[str, Any]],
+) -> list[dict]:
+    """Create several itinerary items in one multi-row INSERT and transaction.
+
+    Each entry in `items` takes the keyword arguments of `create_itinerary_item`
+    other than `db` and `created_by_user_id`. Rows are returned in input order.
+    """
+    if not items:
+        return []
+
+    item_insert_values = [
+        {
+            "created_by_user_id": created_by_user_id,
+            "type": item["type"],
+            "trip_id": item.get("trip_id"),
+            "itinerary_datetime": item.get("itinerary_datetime"),
+            "booking_reference": item.get("booking_reference"),
+            "booking_url": item.get("booking_url"),
+            "notes": item.get("notes"),
+            "details": item.get("details"),
+        }
+        for item in items
+    ]
+
+    stmt_insert_items = insert(itinerary_items).returning(
+        itinerary_items.c.itinerary_item_id,
+        itinerary_items.c.trip_id,
+        itinerary_items.c.created_by_user_id,
+        itinerary_items.c.type,
+        itinerary_items.c.itinerary_datetime,
+        itinerary_items.c.booking_reference,
+        itinerary_items.c.booking_url,
+        itinerary_items.c.notes,
+        itinerary_items.c.details,
+        itinerary_items.c.created_at,
+        itinerary_items.c.updated_at,
+        sort_by_parameter_order=True,
+    )
+
+    items_result = await db.execute(stmt_insert_items, item_insert_values)
+    rows = [dict(row._mapping) for row in items_result.fetchall()]
+    await publish_events(db, _bulk_item_events(CREATED, created_by_user_id, rows))
+    await publish_trip_invalidations(db, (row["trip_id"] for row in rows))
+    await db.commit()
+    invalidate_trips(values["trip_id"] for values in item_insert_values)
+    return rows
+
+
+# Detail fields that, with the type, booking reference and itinerary time,
+# identify one booked segment; seats, names and free text are left out so a
+# resend with edited extras still matches.
+ITINERARY_ITEM_FINGERPRINT_FIELDS: dict[ItineraryItemType, tuple[str, ...]] = {
+    ItineraryItemType.FLIGHT: ("flight_number", "origin_airport_code", "departure_datetime"),
+    ItineraryItemType.BUS: ("bus_number", "origin_station", "departure_datetime"),
+    ItineraryItemType.TRAIN: ("train_number", "origin_station", "departure_datetime"),
+    ItineraryItemType.CAR_RENTAL: ("pickup_location", "pickup_datetime"),
+    ItineraryItemType.ACCOMMODATION: ("address", "check_in_datetime"),
+    ItineraryItemType.ACTIVITY: ("location_name", "start_datetime"),
+}
+
+
+def _fingerprint_value(field: str, value: Any) -> str | None:
+    if value is None:
+        return None
+    if field.endswith("_datetime") and isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    if isinstance(value, datetime):
+        # Naive datetimes are stored as UTC, so compare them as UTC.
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).isoformat()
+    return " ".join(str(value).split()).upper() or None
+
+
+def itinerary_item_fingerprint(item: dict[str, Any]) -> str | None:
+    """Stable hash of the fields identifying an item's booking.
+
+    `item` takes the keyword arguments of `create_itinerary_item`. Strings are
+    compared ignoring case and whitespace, and datetimes by their UTC instant.
+    Returns None when nothing identifies the booking, so such items are never
+    treated as repeats.
+    """
+    type = ItineraryItemType(item["type"])
+    details = item.get("details") or {}
+    key = [
+        _fingerprint_value(field, item.get(field))
+        for field in ("booking_reference", "itinerary_datetime")
+    ] + [
+        _fingerprint_value(field, details.get(field))
+        for field in ITINERARY_ITEM_FINGERPRINT_FIELDS.get(type, ())
+    ]
+    if all(value is None for value in key):
+        return None
+    raw = json.dumps([type.name] + key, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+async def upsert_itinerary_items(
+    db: AsyncSession,
+    created_by_user_id: UUID,
+    items: list[dict[str, Any]],
+) -> list[tuple[dict, bool]]:
+    """Create itinerary items unless the user already has the same booking.
+
+    Items are matched on `itinerary_item_fingerprint` with one
+    `INSERT ... ON CONFLICT DO NOTHING` against the unique
+    (created_by_user_id, fingerprint) index, so a repeat writes nothing.
+    Returns `(item, created)` pairs in input order, where a repeat carries the
+    existing item.
+    """
+    if not items:
+        return []
+
+    # Ids are assigned here so inserted rows can be matched back to the input.
+    item_insert_values = [
+        {
+            "itinerary_item_id": uuid4(),
+            "created_by_user_id": created_by_user_id,
+            "type": item["type"],
+            "trip_id": item.get("trip_id"),
+            "itinerary_datetime": item.get("itinerary_datetime"),
+            "booking_reference": item.get("booking_reference"),
+            "booking_url": item.get("booking_url"),
+            "notes": item.get("notes"),
+            "details": item.get("details"),
+            "fingerprint": itinerary_item_fingerprint(item),
+        }
+        for item in items
+    ]
+    item_columns = (
+        itinerary_items.c.itinerary_item_id,
+        itinerary_items.c.trip_id,
+        itinerary_items.c.created_by_user_id,
+        itinerary_items.c.type,
+        itinerary_items.c.itinerary_datetime,
+        itinerary_items.c.booking_reference,
+        itinerary_items.c.booking_url,
+        itinerary_items.c.notes,
+        itinerary_items.c.details,
+        itinerary_items.c.created_at,
+        itinerary_items.c.updated_at,
+    )
+
+    stmt_upsert_items = (
+        pg_insert(itinerary_items)
+        .on_conflict_do_nothing(index_elements=["created_by_user_id", "fingerprint"])
+        .returning(*item_columns)
+    )
+    result = await db.execute(stmt_upsert_items, item_insert_values)
+    inserted = {
+        row.itinerary_item_id: dict(row._mapping) for row in result.fetchall()
+    }
+
+    repeated_fingerprints = {
+        values["fingerprint"]
+        for values in item_insert_values
+        if values["itinerary_item_id"] not in inserted
+    }
+    existing = {}
+    if repeated_fingerprints:
+        stmt_existing = select(*item_columns, itinerary_items.c.fingerprint).where(
+            and_(
+                itinerary_items.c.created_by_user_id == created_by_user_id,
+                itinerary_items.c.fingerprint.in_(repeated_fingerprints),
+            )
+        )
+        for row in (await db.execute(stmt_existing)).fetchall():
+            row = dict(row._mapping)
+            existing[row.pop("fingerprint")] = row
+    await publish_events(
+        db, _bulk_item_events(CREATED, created_by_user_id, inserted.values())
+    )
+    await publish_trip_invalidations(db, (row["trip_id"] for row in inserted.values()))
+    await db.commit()
+    invalidate_trips(row["trip_id"] for row in inserted.values())
+
+    return [
+        (inserted[values["itinerary_item_id"]], True)
+        if values["itinerary_item_id"] in inserted
+        else (existing[values["fingerprint"]], False)
+        for values in item_insert_values
+    ]
+
+
+def _item_events(op: str, rows: Iterable[Mapping[str, Any]]) -> list[dict]:
+    """Change events for single itinerary item writes, to the trip and the creator."""
+    return [
+        change_event(
+            "itinerary_item",
+            op,
+            row["trip_id"],
+            id=row["itinerary_item_id"],
+            user_id=row["created_by_user_id"],
+        )
+        for row in rows
+    ]
+
+
+def _bulk_item_events(
+    op: str, created_by_user_id: UUID, rows: Iterable[Mapping[str, Any]]
+) -> list[dict]:
+    """One change event per trip touched by a bulk write, instead of one per item."""
+    trip_ids = {row["trip_id"] for row in rows}
+    return [
+        change_event("itinerary_item", op, trip_id, user_id=created_by_user_id)
+        for trip_id in trip_ids
+    ]
+
+
+def itinerary_item_access_clause(user_id: UUID) -> ColumnElement[bool]:
+    """SQL predicate that is true for `itinerary_items` rows the user created or can see through their trip."""
+    return or_(
+        # User created the item
+        itinerary_items.c.created_by_user_id == user_id,
+        # User has access to the item's trip
+        exists().where(
+            and_(
+                trip_access.c.trip_id == itinerary_items.c.trip_id,
+                trip_access.c.user_id == user_id,
+            )
+        ),
+    )
+
+
+async def user_has_itinerary_item_access(
+    db: AsyncSession,
     itinerary_item_id: UUID,
     user_id: UUID,
 ) -> bool:
     """Check if user has access to an itinerary item (either as creator or through trip access)."""
-    # Check if user is the item creator OR has access to the associated trip
     stmt = select(itinerary_items.c.itinerary_item_id).where(
         and_(
             itinerary_items.c.itinerary_item_id == itinerary_item_id,
-            or_(
-                # User created the item
-                itinerary_items.c.created_by_user_id == user_id,
-                # User has access to the trip (if item is associated with a trip)
-                and_(
-                    itinerary_items.c.trip_id.is_not(None),
-                    or_(
-                        # User owns the trip
-                        itinerary_items.c.trip_id.in_(
-                            select(trips.c.trip_id).where(
-                                trips.c.created_by_user_id == user_id
-                            )
-                        ),
-                        # User is a participant in the trip
-                        itinerary_items.c.trip_id.in_(
-                            select(trip_participants.c.trip_id).where(
-                                and_(
-                                    trip_participants.c.user_id == user_id,
-                                    trip_participants.c.status.in_(
-                                        [
-                                            ParticipantStatus.INVITED,
-                                            ParticipantStatus.JOINED,
-                                        ]
-                                    ),
-                                )
-                            )
-                        ),
-                    ),
-                ),
-            ),
+            itinerary_item_access_clause(user_id),
         )
     )
 
-    result = db.execute(stmt)
+    result = await db.execute(stmt)
     return result.first() is not None
 
 
-def get_itinerary_items_for_user(
-    db: Session,
+def _itinerary_items_for_user_stmt(
     user_id: UUID,
-    trip_id: UUID | None = None,
-) -> list[dict]:
-    """Get itinerary items for a user, optionally filtered by trip."""
+    trip_id: UUID | None,
+    type: ItineraryItemType | None,
+    datetime_from: datetime | None,
+    datetime_to: datetime | None,
+    detail_filters: dict[str, str] | None,
+) -> Select:
     # Build base query for items the user has access to
     stmt = select(
         itinerary_items.c.itinerary_item_id,
@@ -129,92 +353,99 @@ def get_itinerary_items_for_user(
         itinerary_items.c.created_at,
         itinerary_items.c.updated_at,
     ).where(
-        or_(
-            # User created the item
-            itinerary_items.c.created_by_user_id == user_id,
-            # User has access to the trip (if item is associated with a trip)
-            and_(
-                itinerary_items.c.trip_id.is_not(None),
-                or_(
-                    # User owns the trip
-                    itinerary_items.c.trip_id.in_(
-                        select(trips.c.trip_id).where(
-                            trips.c.created_by_user_id == user_id
-                        )
-                    ),
-                    # User is a participant in the trip
-                    itinerary_items.c.trip_id.in_(
-                        select(trip_participants.c.trip_id).where(
-                            and_(
-                                trip_participants.c.user_id == user_id,
-                                trip_participants.c.status.in_(
-                                    [
-                                        ParticipantStatus.INVITED,
-                                        ParticipantStatus.JOINED,
-                                    ]
-                                ),
-                            )
-                        )
-                    ),
+        # Items the user created, plus items on trips they can access; a UNION ALL
+        # of two index scans instead of an OR that forces a sequential scan.
+        itinerary_items.c.itinerary_item_id.in_(
+            union_all(
+                select(itinerary_items.c.itinerary_item_id).where(
+                    itinerary_items.c.created_by_user_id == user_id
+                ),
+                select(itinerary_items.c.itinerary_item_id).where(
+                    itinerary_items.c.trip_id.in_(accessible_trip_ids(user_id))
                 ),
-            ),
+            )
         )
     )
 
     # Filter by trip if specified
     if trip_id is not None:
         stmt = stmt.where(itinerary_items.c.trip_id == trip_id)
+    if type is not None:
+        stmt = stmt.where(itinerary_items.c.type == type)
+    if datetime_from is not None:
+        stmt = stmt.where(itinerary_items.c.itinerary_datetime >= datetime_from)
+    if datetime_to is not None:
+        stmt = stmt.where(itinerary_items.c.itinerary_datetime < datetime_to)
 
-    # Order by itinerary_datetime, then created_at
-    stmt = stmt.order_by(
-        itinerary_items.c.itinerary_datetime.asc().nulls_last(),
-        itinerary_items.c.created_at.asc(),
-    )
+    # Filter on indexed detail fields
+    for key, value in (detail_filters or {}).items():
+        if key not in ITINERARY_ITEM_DETAIL_FILTER_KEYS:
+            raise ValueError(f"Cannot filter itinerary items on details key {key!r}")
+        stmt = stmt.where(itinerary_items.c.details[key].astext == value)
 
-    result = db.execute(stmt)
-    return [dict(row._mapping) for row in result.fetchall()]
+    return stmt
 
 
-def get_itinerary_items_for_trip(
-    db: Session,
-    trip_id: UUID,
-) -> list[dict]:
-    """Get all itinerary items for a trip, ordered by itinerary_datetime."""
-    stmt = select(
-        itinerary_items.c.itinerary_item_id,
-        itinerary_items.c.trip_id,
-        itinerary_items.c.created_by_user_id,
-        itinerary_items.c.type,
-        itinerary_items.c.itinerary_datetime,
-        itinerary_items.c.booking_reference,
-        itinerary_items.c.booking_url,
-        itinerary_items.c.notes,
-        itinerary_items.c.details,
-        itinerary_items.c.created_at,
-        itinerary_items.c.updated_at,
-    ).where(itinerary_items.c.trip_id == trip_id)
+async def get_itinerary_items_for_user(
+    db: AsyncSession,
+    user_id: UUID,
+    trip_id: UUID | None = None,
+    type: ItineraryItemType | None = None,
+    datetime_from: datetime | None = None,
+    datetime_to: datetime | None = None,
+    detail_filters: dict[str, str] | None = None,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page:
+    """Get a page of itinerary items for a user, optionally filtered by trip, type, date range and detail fields.
 
-    # Order by itinerary_datetime, then by created_at for items without datetime
-    stmt = stmt.order_by(
+    `detail_filters` maps keys from `ITINERARY_ITEM_DETAIL_FILTER_KEYS` to the
+    exact value `details ->> key` must have; each key has an expression index.
+    """
+    stmt = _itinerary_items_for_user_stmt(
+        user_id, trip_id, type, datetime_from, datetime_to, detail_filters
+    )
+
+    # Order by itinerary_datetime, then created_at, with the ID breaking ties
+    return await paginate(
+        db,
+        stmt,
+        nullable_column=itinerary_items.c.itinerary_datetime,
+        tie_columns=[itinerary_items.c.created_at, itinerary_items.c.itinerary_item_id],
+        parsers=[datetime.fromisoformat, datetime.fromisoformat, UUID],
+        cursor=cursor,
+        limit=limit,
+    )
+
+
+async def stream_itinerary_items_for_user(
+    db: AsyncSession,
+    user_id: UUID,
+    trip_id: UUID | None = None,
+    type: ItineraryItemType | None = None,
+    datetime_from: datetime | None = None,
+    datetime_to: datetime | None = None,
+    detail_filters: dict[str, str] | None = None,
+) -> AsyncIterator[dict]:
+    """Yield every matching itinerary item in listing order through a server-side cursor."""
+    stmt = _itinerary_items_for_user_stmt(
+        user_id, trip_id, type, datetime_from, datetime_to, detail_filters
+    ).order_by(
         itinerary_items.c.itinerary_datetime.asc().nulls_last(),
         itinerary_items.c.created_at.asc(),
+        itinerary_items.c.itinerary_item_id.asc(),
     )
+    result = await db.stream(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+    async for row in result:
+        yield dict(row._mapping)
 
-    result = db.execute(stmt)
-    return [dict(row._mapping) for row in result.fetchall()]
 
-
-def get_itinerary_item_by_id(
-    db: Session,
+async def get_itinerary_item_by_id(
+    db: AsyncSession,
     itinerary_item_id: UUID,
     user_id: UUID,
 ) -> dict | None:
     """Get a single itinerary item by ID, ensuring the user has access to it."""
-    # First check if user has access
-    if not user_has_itinerary_item_access(db, itinerary_item_id, user_id):
-        return None
-
-    # If user has access, get the item details
     stmt = select(
         itinerary_items.c.itinerary_item_id,
         itinerary_items.c.trip_id,
@@ -227,17 +458,22 @@ def get_itinerary_item_by_id(
         itinerary_items.c.details,
         itinerary_items.c.created_at,
         itinerary_items.c.updated_at,
-    ).where(itinerary_items.c.itinerary_item_id == itinerary_item_id)
+    ).where(
+        and_(
+            itinerary_items.c.itinerary_item_id == itinerary_item_id,
+            itinerary_item_access_clause(user_id),
+        )
+    )
 
-    result = db.execute(stmt)
+    result = await db.execute(stmt)
     row = result.first()
     if not row:
         return None
     return dict(row._mapping)
 
 
-def update_itinerary_item(
-    db: Session,
+async def update_itinerary_item(
+    db: AsyncSession,
     itinerary_item_id: UUID,
     user_id: UUID,
     trip_id: UUID | None = None,
@@ -249,12 +485,8 @@ def update_itinerary_item(
     details: dict[str, Any] | None = None,
 ) -> dict | None:
     """Update an itinerary item if the user has access to it."""
-    # First check if user has access
-    if not user_has_itinerary_item_access(db, itinerary_item_id, user_id):
-        return None
-
     # Build update values (only include explicitly provided values)
-    update_values = {"updated_at": datetime.utcnow()}
+    update_values = {"updated_at": func.now()}
     if trip_id is not None:
         update_values["trip_id"] = trip_id
     if type is not None:
@@ -270,49 +502,92 @@ def update_itinerary_item(
     if details is not None:
         update_values["details"] = details
 
-    # Update the item
-    stmt = (
-        update(itinerary_items)
-        .where(itinerary_items.c.itinerary_item_id == itinerary_item_id)
-        .values(update_values)
-        .returning(
-            itinerary_items.c.itinerary_item_id,
-            itinerary_items.c.trip_id,
-            itinerary_items.c.created_by_user_id,
-            itinerary_items.c.type,
-            itinerary_items.c.itinerary_datetime,
-            itinerary_items.c.booking_reference,
-            itinerary_items.c.booking_url,
-            itinerary_items.c.notes,
-            itinerary_items.c.details,
-            itinerary_items.c.created_at,
-            itinerary_items.c.updated_at,
-        )
+    returning = [
+        itinerary_items.c.itinerary_item_id,
+        itinerary_items.c.trip_id,
+        itinerary_items.c.created_by_user_id,
+        itinerary_items.c.type,
+        itinerary_items.c.itinerary_datetime,
+        itinerary_items.c.booking_reference,
+        itinerary_items.c.booking_url,
+        itinerary_items.c.notes,
+        itinerary_items.c.details,
+        itinerary_items.c.created_at,
+        itinerary_items.c.updated_at,
+    ]
+    # The access check is part of the WHERE clause
+    accessible_item = and_(
+        itinerary_items.c.itinerary_item_id == itinerary_item_id,
+        itinerary_item_access_clause(user_id),
     )
+    if trip_id is None:
+        stmt = update(itinerary_items).where(accessible_item)
+    else:
+        # Moving the item changes the trip it leaves too. Read that trip from
+        # the access-checked row, locked so it is the one the update moves
+        # the item from, and return it alongside the new row.
+        previous = (
+            select(
+                itinerary_items.c.itinerary_item_id,
+                itinerary_items.c.trip_id.label("previous_trip_id"),
+            )
+            .where(accessible_item)
+            .with_for_update()
+            .subquery("previous")
+        )
+        stmt = update(itinerary_items).where(
+            itinerary_items.c.itinerary_item_id == previous.c.itinerary_item_id
+        )
+        returning.append(previous.c.previous_trip_id)
+    stmt = stmt.values(update_values).returning(*returning)
 
-    result = db.execute(stmt)
-    db.commit()
+    result = await db.execute(stmt)
     row = result.first()
+    if row:
+        item = dict(row._mapping)
+        previous_trip_id = item.pop("previous_trip_id", None)
+        events = _item_events(UPDATED, [item])
+        if previous_trip_id is not None and previous_trip_id != row.trip_id:
+            events.append(
+                change_event(
+                    "itinerary_item", UPDATED, previous_trip_id, id=itinerary_item_id
+                )
+            )
+        await publish_events(db, events)
+        await publish_trip_invalidations(db, [previous_trip_id, row.trip_id])
+    await db.commit()
     if not row:
         return None
-    return dict(row._mapping)
+    invalidate_trips([previous_trip_id, row.trip_id])
+    return item
 
 
-def delete_itinerary_item(
-    db: Session,
+async def delete_itinerary_item(
+    db: AsyncSession,
     itinerary_item_id: UUID,
     user_id: UUID,
 ) -> bool:
     """Delete an itinerary item if the user has access to it."""
-    # First check if user has access
-    if not user_has_itinerary_item_access(db, itinerary_item_id, user_id):
-        return False
-
-    # Delete the item
-    stmt = delete(itinerary_items).where(
-        itinerary_items.c.itinerary_item_id == itinerary_item_id
+    # Delete the item; the access check is part of the WHERE clause
+    stmt = (
+        delete(itinerary_items)
+        .where(
+            and_(
+                itinerary_items.c.itinerary_item_id == itinerary_item_id,
+                itinerary_item_access_clause(user_id),
+            )
+        )
+        .returning(
+            itinerary_items.c.itinerary_item_id,
+            itinerary_items.c.trip_id,
+            itinerary_items.c.created_by_user_id,
+        )
     )
 
-    result = db.execute(stmt)
-    db.commit()
-    return result.rowcount > 0
+    result = await db.execute(stmt)
+    deleted = result.fetchall()
+    await publish_events(db, _item_events(DELETED, [row._mapping for row in deleted]))
+    await publish_trip_invalidations(db, (row.trip_id for row in deleted))
+    await db.commit()
+    invalidate_trips(row.trip_id for row in deleted)
+    return len(deleted) > 0
@@ -0,0 +1,398 @@
+"""
+Delta sync: everything that changed for a user since a cursor.
+
+A cursor is a server timestamp. Rows count as changed when their
+`updated_at` is after it; trips the user was granted (or whose role changed)
+after it are sent whole, since their older rows were never synced; rows that
+left the user's view are read from `tombstones`, which database triggers
+write when an itinerary item is deleted or moved off a trip and when a trip
+access grant is revoked. Every read is an index range scan on `updated_at`
+or `deleted_at`, so a sync costs O(changes) rather than O(data).
+
+`updated_at` is stamped before a write commits, so a row can become visible
+with a timestamp older than a sync that ran in the meantime. The returned
+cursor therefore trails the database clock by SYNC_CURSOR_OVERLAP_SECONDS,
+which must exceed the longest write transaction; rows in that window are
+sent again on the next sync, so clients apply changes as upserts by ID.
+
+Both kinds of sync are paged: each response holds at most `limit` rows,
+trips first, then itinerary items, then participants, then (for a delta
+sync) deletions, each section in keyset order on `updated_at` or
+`deleted_at`. While `has_more` is set, the returned cursor resumes the sync
+where the page ended; the last page returns a delta cursor taken from the
+clock at the first page, so whatever changed while the client was paging
+arrives on its next sync.
+
+Tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS are pruned, and cursors
+older than that are rejected so the client falls back to a full sync:
+
+    python -m src.database.crud.sync --prune
+"""
+
+import argparse
+import asyncio
+import os
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import and_, delete, exists, func, or_, select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.crud.itinerary_item import itinerary_item_access_clause
+from src.database.crud.trip import accessible_trip_ids
+from src.database.models import (
+    itinerary_items,
+    tombstones,
+    trip_access,
+    trip_participants,
+    trips,
+    users,
+    TombstoneEntityType,
+)
+from src.database.pagination import (
+    DEFAULT_PAGE_SIZE,
+    NEXT,
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+)
+
+SYNC_CURSOR_OVERLAP_SECONDS = float(os.getenv("SYNC_CURSOR_OVERLAP_SECONDS", 10))
+SYNC_TOMBSTONE_RETENTION_DAYS = float(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", 30))
+
+
+class SyncCursorExpiredError(InvalidCursorError):
+    """Raised for a cursor older than the tombstone retention; resync from scratch."""
+
+
+def _parse_timestamp(value: str) -> datetime:
+    timestamp = datetime.fromisoformat(value)
+    if timestamp.tzinfo is None:
+        raise ValueError("cursor timestamp has no time zone")
+    return timestamp
+
+
+def _parse_section(value: str) -> str:
+    if value not in _SYNC_SECTIONS:
+        raise ValueError(f"unknown sync section {value!r}")
+    return value
+
+
+def _decode_sync_cursor(
+    cursor: str,
+) -> tuple[datetime | None, datetime | None, str | None, str | None]:
+    """`(since, started_at, section, page_cursor)` of a sync cursor.
+
+    A delta cursor holds only `since`. A later page of a full sync holds
+    the time the sync started, the section it is in and the page cursor
+    within that section; a later page of a delta sync also holds `since`.
+    """
+    try:
+        return decode_cursor(cursor, [_parse_timestamp])[1][0], None, None, None
+    except InvalidCursorError:
+        pass
+    try:
+        started_at, section, page_cursor = decode_cursor(
+            cursor, [_parse_timestamp, _parse_section, str]
+        )[1]
+        return None, started_at, section, page_cursor
+    except InvalidCursorError:
+        since, started_at, section, page_cursor = decode_cursor(
+            cursor, [_parse_timestamp, _parse_timestamp, _parse_section, str]
+        )[1]
+        return since, started_at, section, page_cursor
+
+
+def _encode_page_cursor(
+    since: datetime | None, started_at: datetime, section: str, page_cursor: str | None
+) -> str:
+    key = [started_at, section, page_cursor]
+    return encode_cursor(NEXT, key if since is None else [since, *key])
+
+
+def _granted_trip_ids(user_id: UUID, since: datetime):
+    """Trips the user gained access to, or changed role on, after `since`."""
+    return select(trip_access.c.trip_id).where(
+        and_(trip_access.c.user_id == user_id, trip_access.c.updated_at > since)
+    )
+
+
+def _changed_trips_stmt(user_id: UUID, since: datetime | None):
+    stmt = select(
+        trips.c.trip_id,
+        trips.c.name,
+        trips.c.description,
+        trips.c.created_by_user_id,
+        trips.c.start_date,
+        trips.c.end_date,
+        trips.c.created_at,
+        trips.c.updated_at,
+    )
+    if since is None:
+        return stmt.where(trips.c.trip_id.in_(accessible_trip_ids(user_id)))
+    # One scan per way a trip can have changed for the user; an OR across
+    # them hides how few rows match, and Postgres reads every trip instead.
+    changed_ids = union_all(
+        select(trips.c.trip_id).where(
+            and_(
+                trips.c.trip_id.in_(accessible_trip_ids(user_id)),
+                trips.c.updated_at > since,
+            )
+        ),
+        _granted_trip_ids(user_id, since),
+    )
+    return stmt.where(trips.c.trip_id.in_(changed_ids))
+
+
+def _changed_itinerary_items_stmt(user_id: UUID, since: datetime | None):
+    if since is None:
+        changed_ids = union_all(
+            select(itinerary_items.c.itinerary_item_id).where(
+                itinerary_items.c.created_by_user_id == user_id
+            ),
+            select(itinerary_items.c.itinerary_item_id).where(
+                itinerary_items.c.trip_id.in_(accessible_trip_ids(user_id))
+            ),
+        )
+    else:
+        # Separate index range scans per access path; trips can hold many
+        # items, so an OR over the whole set would read all of them.
+        changed_ids = union_all(
+            select(itinerary_items.c.itinerary_item_id).where(
+                and_(
+                    itinerary_items.c.created_by_user_id == user_id,
+                    itinerary_items.c.updated_at > since,
+                )
+            ),
+            select(itinerary_items.c.itinerary_item_id).where(
+                and_(
+                    itinerary_items.c.trip_id.in_(accessible_trip_ids(user_id)),
+                    itinerary_items.c.updated_at > since,
+                )
+            ),
+            select(itinerary_items.c.itinerary_item_id).where(
+                itinerary_items.c.trip_id.in_(_granted_trip_ids(user_id, since))
+            ),
+        )
+    return select(
+        itinerary_items.c.itinerary_item_id,
+        itinerary_items.c.trip_id,
+        itinerary_items.c.created_by_user_id,
+        itinerary_items.c.type,
+        itinerary_items.c.itinerary_datetime,
+        itinerary_items.c.booking_reference,
+        itinerary_items.c.booking_url,
+        itinerary_items.c.notes,
+        itinerary_items.c.details,
+        itinerary_items.c.created_at,
+        itinerary_items.c.updated_at,
+    ).where(itinerary_items.c.itinerary_item_id.in_(changed_ids))
+
+
+def _changed_participants_stmt(user_id: UUID, since: datetime | None):
+    stmt = (
+        select(
+            trip_participants.c.trip_id,
+            trip_participants.c.user_id,
+            trip_participants.c.status,
+            trip_participants.c.created_at,
+            trip_participants.c.updated_at,
+            users.c.email,
+            users.c.given_name,
+            users.c.family_name,
+        )
+        .select_from(
+            trip_participants.join(users, trip_participants.c.user_id == users.c.user_id)
+        )
+    )
+    if since is None:
+        return stmt.where(
+            trip_participants.c.trip_id.in_(accessible_trip_ids(user_id))
+        )
+    # As for trips, a scan per way the row can have changed instead of an OR.
+    participant = tuple_(trip_participants.c.trip_id, trip_participants.c.user_id)
+    changed_keys = union_all(
+        select(trip_participants.c.trip_id, trip_participants.c.user_id).where(
+            and_(
+                trip_participants.c.trip_id.in_(accessible_trip_ids(user_id)),
+                trip_participants.c.updated_at > since,
+            )
+        ),
+        select(trip_participants.c.trip_id, trip_participants.c.user_id).where(
+            trip_participants.c.trip_id.in_(_granted_trip_ids(user_id, since))
+        ),
+    )
+    return stmt.where(participant.in_(changed_keys))
+
+
+def _tombstones_stmt(user_id: UUID, since: datetime):
+    relevant_ids = union_all(
+        # Items the user created and trips they lost access to
+        select(tombstones.c.tombstone_id).where(
+            and_(tombstones.c.user_id == user_id, tombstones.c.deleted_at > since)
+        ),
+        # Items that left a trip the user can see
+        select(tombstones.c.tombstone_id).where(
+            and_(
+                tombstones.c.entity_type == TombstoneEntityType.ITINERARY_ITEM,
+                tombstones.c.trip_id.in_(accessible_trip_ids(user_id)),
+                tombstones.c.deleted_at > since,
+            )
+        ),
+    )
+    # Moved items and re-granted trips can still be visible; those arrive as
+    # changed rows instead.
+    still_visible = or_(
+        and_(
+            tombstones.c.entity_type == TombstoneEntityType.ITINERARY_ITEM,
+            exists().where(
+                and_(
+                    itinerary_items.c.itinerary_item_id == tombstones.c.entity_id,
+                    itinerary_item_access_clause(user_id),
+                )
+            ),
+        ),
+        and_(
+            tombstones.c.entity_type == TombstoneEntityType.TRIP,
+            exists().where(
+                and_(
+                    trip_access.c.trip_id == tombstones.c.entity_id,
+                    trip_access.c.user_id == user_id,
+                )
+            ),
+        ),
+    )
+    return select(
+        tombstones.c.tombstone_id,
+        tombstones.c.entity_type,
+        tombstones.c.entity_id,
+        tombstones.c.trip_id,
+        tombstones.c.deleted_at,
+    ).where(and_(tombstones.c.tombstone_id.in_(relevant_ids), ~still_visible))
+
+
+# Sections in the order a sync pages through them: the statement, its
+# timestamp column, and the columns that break ties in that order. A full
+# sync replaces the client's state, so it skips `deleted`.
+_SYNC_SECTIONS = {
+    "trips": (_changed_trips_stmt, trips.c.updated_at, [trips.c.trip_id]),
+    "itinerary_items": (
+        _changed_itinerary_items_stmt,
+        itinerary_items.c.updated_at,
+        [itinerary_items.c.itinerary_item_id],
+    ),
+    "participants": (
+        _changed_participants_stmt,
+        trip_participants.c.updated_at,
+        [trip_participants.c.trip_id, trip_participants.c.user_id],
+    ),
+    "deleted": (_tombstones_stmt, tombstones.c.deleted_at, [tombstones.c.tombstone_id]),
+}
+
+
+async def get_changes_since(
+    db: AsyncSession,
+    user_id: UUID,
+    cursor: str | None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> dict:
+    """Trips, itinerary items, participants and deletions changed since `cursor`.
+
+    Returns at most `limit` rows; while `has_more` is set, pass the result's
+    `cursor` again for the next page. Without a cursor everything the user
+    can see is returned and `deleted` is empty; the client replaces its
+    local state once `has_more` is false. The last page's `cursor` is the
+    one to pass next time.
+    """
+    since = started_at = section = page_cursor = None
+    if cursor:
+        since, started_at, section, page_cursor = _decode_sync_cursor(cursor)
+
+    now = (await db.execute(select(func.now()))).scalar_one()
+    if since is not None and since < now - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS):
+        raise SyncCursorExpiredError(
+            "Sync cursor is older than the deletion history; sync again without it"
+        )
+
+    return await _sync_page(
+        db, user_id, since, started_at or now, section or "trips", page_cursor, limit
+    )
+
+
+async def _sync_page(
+    db: AsyncSession,
+    user_id: UUID,
+    since: datetime | None,
+    started_at: datetime,
+    section: str,
+    page_cursor: str | None,
+    limit: int,
+) -> dict:
+    """Up to `limit` rows of a sync, starting in `section` at `page_cursor`.
+
+    Rows changed since `since`, or all of them for a full sync when it is None.
+    """
+    changes = {name: [] for name in _SYNC_SECTIONS}
+    names = [name for name in _SYNC_SECTIONS if since is not None or name != "deleted"]
+    remaining = limit
+    for name in names[names.index(section):]:
+        if remaining == 0:
+            changes["cursor"] = _encode_page_cursor(since, started_at, name, None)
+            changes["has_more"] = True
+            return changes
+        build_stmt, timestamp, tie_columns = _SYNC_SECTIONS[name]
+        page = await paginate(
+            db,
+            build_stmt(user_id, since),
+            nullable_column=timestamp,
+            tie_columns=tie_columns,
+            parsers=[datetime.fromisoformat] + [UUID] * len(tie_columns),
+            cursor=page_cursor,
+            limit=remaining,
+        )
+        changes[name] = page.items
+        remaining -= len(page.items)
+        page_cursor = None
+        if page.next_cursor:
+            changes["cursor"] = _encode_page_cursor(
+                since, started_at, name, page.next_cursor
+            )
+            changes["has_more"] = True
+            return changes
+
+    next_since = started_at - timedelta(seconds=SYNC_CURSOR_OVERLAP_SECONDS)
+    if since is not None:
+        next_since = max(next_since, since)
+    changes["cursor"] = encode_cursor(NEXT, [next_since])
+    changes["has_more"] = False
+    return changes
+
+
+async def prune_tombstones(db: AsyncSession) -> int:
+    """Delete tombstones past the retention period and return how many."""
+    stmt = delete(tombstones).where(
+        tombstones.c.deleted_at
+        < func.now() - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS)
+    )
+    result = await db.execute(stmt)
+    await db.commit()
+    return result.rowcount
+
+
+async def _main() -> None:
+    from src.database.config import AsyncSessionLocal, async_engine
+
+    async with AsyncSessionLocal() as db:
+        count = await prune_tombstones(db)
+        print(f"Pruned {count} tombstones")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prune expired sync tombstones")
+    parser.add_argument(
+        "--prune", action="store_true", required=True, help="delete expired tombstones"
+    )
+    parser.parse_args()
+    asyncio.run(_main())
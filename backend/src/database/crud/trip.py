@@ -1,13 +1,33 @@
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import AsyncIterator
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import insert, select, and_, or_, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import (
+    JSON,
+    ColumnElement,
+    Select,
+    Text,
+    case,
+    cast,
+    func,
+    insert,
+    literal,
+    select,
+    and_,
+    update,
+    exists,
+)
 
-from src.database.models import trips, trip_participants, ParticipantStatus
+from src.database.config import STREAM_BATCH_SIZE
+from src.database.models import itinerary_items, trips, trip_access, TripAccessRole
+from src.database.pagination import DEFAULT_PAGE_SIZE, Page, paginate
+from src.events import CREATED, GRANTED, UPDATED, change_event, publish_events
+from src.response_cache import invalidate_trips, publish_trip_invalidations
 
 
-def create_trip(
-    db: Session,
+async def create_trip(
+    db: AsyncSession,
     name: str,
     created_by_user_id: UUID,
     description: str | None = None,
@@ -37,21 +57,44 @@ def create_trip(
         )
     )
 
-    trip_result = db.execute(stmt_insert_trip)
-    db.commit()
+    trip_result = await db.execute(stmt_insert_trip)
     created_trip_row = trip_result.first()
     if not created_trip_row:
         raise ValueError("Trip creation failed to return trip data.")
+    await publish_events(
+        db,
+        [
+            change_event(
+                "trip",
+                CREATED,
+                created_trip_row.trip_id,
+                id=created_trip_row.trip_id,
+                user_id=created_by_user_id,
+                access=GRANTED,
+            )
+        ],
+    )
+    await db.commit()
     return dict(created_trip_row._mapping)
 
 
-def get_trips_for_user(
-    db: Session,
+def accessible_trip_ids(
     user_id: UUID,
-    future_only: bool = True,
-) -> list[dict]:
-    """Get trips for a user (created by them or where they are a participant), optionally filtering to future trips only."""
-    # Get trips where user is owner OR participant
+    roles: tuple[TripAccessRole, ...] = tuple(TripAccessRole),
+) -> Select:
+    """IDs of trips the user holds one of `roles` on, read from the trip_access table."""
+    return select(trip_access.c.trip_id).where(
+        and_(trip_access.c.user_id == user_id, trip_access.c.role.in_(roles))
+    )
+
+
+def _trips_for_user_stmt(
+    user_id: UUID,
+    future_only: bool,
+    start_from: datetime | None,
+    start_to: datetime | None,
+) -> Select:
+    # Get trips where user is owner OR a joined participant
     stmt = select(
         trips.c.trip_id,
         trips.c.name,
@@ -62,73 +105,133 @@ def get_trips_for_user(
         trips.c.created_at,
         trips.c.updated_at,
     ).where(
-        or_(
-            trips.c.created_by_user_id == user_id,
-            trips.c.trip_id.in_(
-                select(trip_participants.c.trip_id).where(
-                    and_(
-                        trip_participants.c.user_id == user_id,
-                        trip_participants.c.status == ParticipantStatus.JOINED,
-                    )
-                )
-            ),
+        trips.c.trip_id.in_(
+            accessible_trip_ids(
+                user_id, (TripAccessRole.OWNER, TripAccessRole.JOINED)
+            )
         )
     )
 
     if future_only:
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
         stmt = stmt.where(
             and_(trips.c.start_date.is_not(None), trips.c.start_date >= now)
         )
+    if start_from is not None:
+        stmt = stmt.where(trips.c.start_date >= start_from)
+    if start_to is not None:
+        stmt = stmt.where(trips.c.start_date < start_to)
+    return stmt
+
+
+async def get_accessible_trip_ids(
+    db: AsyncSession,
+    user_id: UUID,
+    trip_ids: set[UUID],
+) -> set[UUID]:
+    """Return the subset of `trip_ids` the user has access to, in one query."""
+    if not trip_ids:
+        return set()
+    stmt = accessible_trip_ids(user_id).where(trip_access.c.trip_id.in_(trip_ids))
+    result = await db.execute(stmt)
+    return set(result.scalars().all())
+
+
+async def get_all_accessible_trip_ids(db: AsyncSession, user_id: UUID) -> set[UUID]:
+    """IDs of every trip the user holds any role on."""
+    result = await db.execute(accessible_trip_ids(user_id))
+    return set(result.scalars().all())
+
+
+async def get_trips_for_user(
+    db: AsyncSession,
+    user_id: UUID,
+    future_only: bool = True,
+    start_from: datetime | None = None,
+    start_to: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page:
+    """Get a page of trips for a user (created by them or where they are a participant), optionally filtering to future trips only or a start date range."""
+    stmt = _trips_for_user_stmt(user_id, future_only, start_from, start_to)
+
+    # Ordered by start_date, with trip_id breaking ties
+    return await paginate(
+        db,
+        stmt,
+        nullable_column=trips.c.start_date,
+        tie_columns=[trips.c.trip_id],
+        parsers=[datetime.fromisoformat, UUID],
+        cursor=cursor,
+        limit=limit,
+    )
 
-    stmt = stmt.order_by(trips.c.start_date.asc())
 
-    result = db.execute(stmt)
-    return [dict(row._mapping) for row in result.fetchall()]
+async def get_trips_version(
+    db: AsyncSession,
+    user_id: UUID,
+    future_only: bool = True,
+    start_from: datetime | None = None,
+    start_to: datetime | None = None,
+) -> tuple:
+    """Version tag of the user's trip listing: row count and latest update.
+
+    Any insert, update, removal or loss of access changes it. Answered from
+    indexes alone.
+    """
+    stmt = _trips_for_user_stmt(
+        user_id, future_only, start_from, start_to
+    ).with_only_columns(func.count(), func.max(trips.c.updated_at))
+    result = await db.execute(stmt)
+    return tuple(result.one())
+
+
+async def stream_trips_for_user(
+    db: AsyncSession,
+    user_id: UUID,
+    future_only: bool = True,
+    start_from: datetime | None = None,
+    start_to: datetime | None = None,
+) -> AsyncIterator[dict]:
+    """Yield every matching trip in listing order through a server-side cursor."""
+    stmt = _trips_for_user_stmt(user_id, future_only, start_from, start_to).order_by(
+        trips.c.start_date.asc().nulls_last(), trips.c.trip_id.asc()
+    )
+    result = await db.stream(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+    async for row in result:
+        yield dict(row._mapping)
 
 
-def user_has_trip_access(
-    db: Session,
+def trip_access_clause(user_id: UUID) -> ColumnElement[bool]:
+    """SQL predicate that is true for `trips` rows the user owns or is invited to or has joined."""
+    return exists().where(
+        and_(
+            trip_access.c.trip_id == trips.c.trip_id,
+            trip_access.c.user_id == user_id,
+        )
+    )
+
+
+async def user_has_trip_access(
+    db: AsyncSession,
     trip_id: UUID,
     user_id: UUID,
 ) -> bool:
     """Check if user has access to a trip (either as owner or participant)."""
-    # Check if user is the trip owner OR a trip participant
     stmt = select(trips.c.trip_id).where(
-        and_(
-            trips.c.trip_id == trip_id,
-            or_(
-                trips.c.created_by_user_id == user_id,
-                trips.c.trip_id.in_(
-                    select(trip_participants.c.trip_id).where(
-                        and_(
-                            trip_participants.c.trip_id == trip_id,
-                            trip_participants.c.user_id == user_id,
-                            trip_participants.c.status.in_(
-                                [ParticipantStatus.INVITED, ParticipantStatus.JOINED]
-                            ),
-                        )
-                    )
-                ),
-            ),
-        )
+        and_(trips.c.trip_id == trip_id, trip_access_clause(user_id))
     )
 
-    result = db.execute(stmt)
+    result = await db.execute(stmt)
     return result.first() is not None
 
 
-def get_trip_by_id(
-    db: Session,
+async def get_trip_by_id(
+    db: AsyncSession,
     trip_id: UUID,
     user_id: UUID,
 ) -> dict | None:
     """Get a single trip by ID, ensuring the user has access to it."""
-    # First check if user has access
-    if not user_has_trip_access(db, trip_id, user_id):
-        return None
-
-    # If user has access, get the trip details
     stmt = select(
         trips.c.trip_id,
         trips.c.name,
@@ -138,17 +241,148 @@ def get_trip_by_id(
         trips.c.end_date,
         trips.c.created_at,
         trips.c.updated_at,
-    ).where(trips.c.trip_id == trip_id)
+    ).where(and_(trips.c.trip_id == trip_id, trip_access_clause(user_id)))
 
-    result = db.execute(stmt)
+    result = await db.execute(stmt)
     row = result.first()
     if not row:
         return None
     return dict(row._mapping)
 
 
-def update_trip(
-    db: Session,
+def _json_timestamp(column: ColumnElement) -> ColumnElement:
+    # ISO 8601 in UTC with a "Z" suffix, exactly as pydantic encodes the API's
+    # other timestamps: six fractional digits, left out on a whole second.
+    # Independent of the session's TimeZone setting.
+    utc = func.timezone("UTC", column)
+    return func.to_char(
+        utc,
+        case(
+            (func.date_trunc("second", utc) == utc, 'YYYY-MM-DD"T"HH24:MI:SS"Z"'),
+            else_='YYYY-MM-DD"T"HH24:MI:SS.US"Z"',
+        ),
+    )
+
+
+def _json_object(**fields: ColumnElement) -> ColumnElement:
+    args = []
+    for name, value in fields.items():
+        args += [literal(name), value]
+    return func.json_build_object(*args)
+
+
+async def get_trip_details_json(
+    db: AsyncSession,
+    trip_id: UUID,
+    user_id: UUID,
+) -> str | None:
+    """Get a trip and its itinerary items as a `TripDetails` JSON document.
+
+    Postgres builds the document in one statement, access check included, and
+    it is returned as text ready to send. Returns None if the trip does not
+    exist or the user has no access to it.
+    """
+    item = itinerary_items.c
+    items_json = (
+        select(
+            func.json_agg(
+                aggregate_order_by(
+                    _json_object(
+                        itinerary_item_id=item.itinerary_item_id,
+                        trip_id=item.trip_id,
+                        created_by_user_id=item.created_by_user_id,
+                        # Enums are stored by name; the API uses the lowercase values.
+                        type=func.lower(cast(item.type, Text)),
+                        itinerary_datetime=_json_timestamp(item.itinerary_datetime),
+                        booking_reference=item.booking_reference,
+                        booking_url=item.booking_url,
+                        notes=item.notes,
+                        details=item.details,
+                        created_at=_json_timestamp(item.created_at),
+                        updated_at=_json_timestamp(item.updated_at),
+                    ),
+                    item.itinerary_datetime.asc().nulls_last(),
+                    item.created_at.asc(),
+                    # Same total order as the paged item listing
+                    item.itinerary_item_id.asc(),
+                )
+            )
+        )
+        .where(item.trip_id == trips.c.trip_id)
+        .scalar_subquery()
+    )
+    stmt = select(
+        cast(
+            _json_object(
+                trip_id=trips.c.trip_id,
+                name=trips.c.name,
+                description=trips.c.description,
+                created_by_user_id=trips.c.created_by_user_id,
+                start_date=_json_timestamp(trips.c.start_date),
+                end_date=_json_timestamp(trips.c.end_date),
+                created_at=_json_timestamp(trips.c.created_at),
+                updated_at=_json_timestamp(trips.c.updated_at),
+                itinerary_items=func.coalesce(items_json, cast(literal("[]"), JSON)),
+            ),
+            Text,
+        )
+    ).where(and_(trips.c.trip_id == trip_id, trip_access_clause(user_id)))
+
+    result = await db.execute(stmt)
+    return result.scalar()
+
+
+async def get_trip_access_role(
+    db: AsyncSession,
+    trip_id: UUID,
+    user_id: UUID,
+) -> str | None:
+    """The user's `TripAccessRole` on a trip, or None without access."""
+    stmt = select(trip_access.c.role).where(
+        and_(trip_access.c.trip_id == trip_id, trip_access.c.user_id == user_id)
+    )
+    result = await db.execute(stmt)
+    return result.scalar()
+
+
+async def get_trip_details_version(
+    db: AsyncSession,
+    trip_id: UUID,
+    user_id: UUID,
+) -> tuple | None:
+    """Viewer role and version tag of a trip's details document.
+
+    Returns `(role, trip updated_at, item count, latest item updated_at)`, or
+    None if the user has no access. Answered from indexes alone.
+    """
+    trip_items = itinerary_items.c.trip_id == trips.c.trip_id
+    stmt = (
+        select(
+            trip_access.c.role,
+            trips.c.updated_at,
+            select(func.count()).where(trip_items).scalar_subquery(),
+            select(func.max(itinerary_items.c.updated_at))
+            .where(trip_items)
+            .scalar_subquery(),
+        )
+        .select_from(
+            trips.join(
+                trip_access,
+                and_(
+                    trip_access.c.trip_id == trips.c.trip_id,
+                    trip_access.c.user_id == user_id,
+                ),
+            )
+        )
+        .where(trips.c.trip_id == trip_id)
+    )
+    result = await db.execute(stmt)
+    row = result.first()
+    return tuple(row) if row else None
+
+
+async def update_trip(
+    db: AsyncSession,
     trip_id: UUID,
     user_id: UUID,
     name: str | None = None,
@@ -157,12 +391,8 @@ def update_trip(
     end_date: datetime | None = None,
 ) -> dict | None:
     """Update a trip if the user has access to it."""
-    # First check if user has access
-    if not user_has_trip_access(db, trip_id, user_id):
-        return None
-
     # Build update values (only include non-None values)
-    update_values = {"updated_at": datetime.utcnow()}
+    update_values = {"updated_at": func.now()}
     if name is not None:
         update_values["name"] = name
     if description is not None:
@@ -172,10 +402,10 @@ def update_trip(
     if end_date is not None:
         update_values["end_date"] = end_date
 
-    # Update the trip
+    # Update the trip; the access check is part of the WHERE clause
     stmt_update = (
         update(trips)
-        .where(trips.c.trip_id == trip_id)
+        .where(and_(trips.c.trip_id == trip_id, trip_access_clause(user_id)))
         .values(update_values)
         .returning(
             trips.c.trip_id,
@@ -189,9 +419,13 @@ def update_trip(
         )
     )
 
-    result = db.execute(stmt_update)
-    db.commit()
+    result = await db.execute(stmt_update)
     updated_row = result.first()
+    if updated_row:
+        await publish_events(db, [change_event("trip", UPDATED, trip_id, id=trip_id)])
+        await publish_trip_invalidations(db, [trip_id])
+    await db.commit()
     if not updated_row:
         return None
+    invalidate_trips([trip_id])
     return dict(updated_row._mapping)
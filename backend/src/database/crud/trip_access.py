@@ -0,0 +1,117 @@
+"""
+Consistency checks for the `trip_access` table.
+
+`trip_access` is maintained by database triggers on `trips` and
+`trip_participants`. These helpers recompute the expected grants from the
+source tables so drift can be detected and repaired:
+
+    python -m src.database.crud.trip_access            # report drift
+    python -m src.database.crud.trip_access --rebuild  # rebuild the table
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# One row per (user, trip): ownership wins over participation.
+EXPECTED_GRANTS_SQL = """
+SELECT DISTINCT ON (user_id, trip_id) user_id, trip_id, role
+FROM (
+    SELECT created_by_user_id AS user_id, trip_id, 'owner' AS role, 0 AS rank
+    FROM trips
+    UNION ALL
+    SELECT user_id, trip_id, lower(status::text), 1
+    FROM trip_participants
+    WHERE status IN ('INVITED', 'JOINED')
+) AS grants
+ORDER BY user_id, trip_id, rank
+"""
+
+
+async def find_trip_access_drift(db: AsyncSession) -> list[dict]:
+    """Return rows where `trip_access` disagrees with the source tables.
+
+    Each row has `user_id`, `trip_id`, `expected_role` and `actual_role`; a
+    `None` role means the grant is missing on that side.
+    """
+    stmt = text(
+        f"""
+        SELECT
+            coalesce(expected.user_id, actual.user_id) AS user_id,
+            coalesce(expected.trip_id, actual.trip_id) AS trip_id,
+            expected.role AS expected_role,
+            actual.role AS actual_role
+        FROM ({EXPECTED_GRANTS_SQL}) AS expected
+        FULL OUTER JOIN trip_access AS actual
+            ON actual.user_id = expected.user_id
+            AND actual.trip_id = expected.trip_id
+        WHERE expected.role IS DISTINCT FROM actual.role
+        """
+    )
+    result = await db.execute(stmt)
+    return [dict(row._mapping) for row in result]
+
+
+async def rebuild_trip_access(db: AsyncSession) -> int:
+    """Recompute `trip_access` from the source tables and return the number of grants.
+
+    Only drifted rows are touched, so unchanged grants keep their `updated_at`
+    and only grants that really go away leave a tombstone for sync.
+    """
+    # Block writers to the source tables so the triggers cannot interleave.
+    await db.execute(
+        text("LOCK TABLE trips, trip_participants, trip_access IN SHARE ROW EXCLUSIVE MODE")
+    )
+    await db.execute(
+        text(
+            f"""
+            DELETE FROM trip_access AS actual
+            WHERE NOT EXISTS (
+                SELECT 1 FROM ({EXPECTED_GRANTS_SQL}) AS expected
+                WHERE expected.user_id = actual.user_id
+                    AND expected.trip_id = actual.trip_id
+            )
+            """
+        )
+    )
+    await db.execute(
+        text(
+            f"""
+            INSERT INTO trip_access (user_id, trip_id, role) {EXPECTED_GRANTS_SQL}
+            ON CONFLICT (user_id, trip_id) DO UPDATE
+                SET role = EXCLUDED.role, updated_at = now()
+                WHERE trip_access.role IS DISTINCT FROM EXCLUDED.role
+            """
+        )
+    )
+    result = await db.execute(text("SELECT count(*) FROM trip_access"))
+    await db.commit()
+    return result.scalar()
+
+
+async def _main(rebuild: bool) -> None:
+    from src.database.config import AsyncSessionLocal, async_engine
+
+    async with AsyncSessionLocal() as db:
+        drift = await find_trip_access_drift(db)
+        for row in drift:
+            print(
+                f"user={row['user_id']} trip={row['trip_id']} "
+                f"expected={row['expected_role']} actual={row['actual_role']}"
+            )
+        print(f"{len(drift)} drifted trip_access rows")
+        if rebuild:
+            count = await rebuild_trip_access(db)
+            print(f"Rebuilt trip_access with {count} grants")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--rebuild", action="store_true", help="rebuild trip_access from the source tables"
+    )
+    args = parser.parse_args()
+    asyncio.run(_main(args.rebuild))
@@ -1,51 +1,66 @@
 from datetime import datetime
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import insert, select, update, and_, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import (
+    String,
+    and_,
+    any_,
+    bindparam,
+    exists,
+    func,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 
+from src.database.crud.trip import trip_access_clause
 from src.database.models import trip_participants, users, trips, ParticipantStatus
+from src.database.pagination import DEFAULT_PAGE_SIZE, Page, paginate
+from src.events import (
+    CREATED,
+    GRANTED,
+    REVOKED,
+    UPDATED,
+    change_event,
+    publish_events,
+)
+from src.response_cache import invalidate_trips, publish_trip_invalidations
 
 
-def invite_user_to_trip(
-    db: Session,
+async def invite_users_to_trip(
+    db: AsyncSession,
     trip_id: UUID,
-    user_email: str,
+    user_emails: list[str],
     inviter_user_id: UUID,
-) -> dict | None:
-    """Invite a user to a trip by email. Returns the invitation record if successful."""
-    # First find the user by email
-    user_stmt = select(users.c.user_id).where(users.c.email == user_email)
-    user_result = db.execute(user_stmt)
-    user_row = user_result.first()
-    
-    if not user_row:
-        return None  # User not found
-    
-    invited_user_id = user_row.user_id
-    
-    # Check if user is already invited or participating
-    existing_stmt = select(trip_participants.c.status).where(
-        and_(
-            trip_participants.c.trip_id == trip_id,
-            trip_participants.c.user_id == invited_user_id
-        )
+) -> dict[str, dict | None]:
+    """Invite users to a trip by email in a single statement.
+
+    Returns a mapping from each email that belongs to a user to the new
+    invitation record, or to None if that user already has a relationship
+    with the trip or owns it. Emails of unknown users are left out.
+    """
+    matched = (
+        select(users.c.user_id, users.c.email)
+        .where(users.c.email == any_(bindparam("emails", type_=ARRAY(String))))
+        .cte("matched")
     )
-    existing_result = db.execute(existing_stmt)
-    existing_row = existing_result.first()
-    
-    if existing_row:
-        return None  # User already has a relationship with this trip
-    
-    # Create invitation
-    invitation_values = {
-        "trip_id": trip_id,
-        "user_id": invited_user_id,
-        "status": ParticipantStatus.INVITED,
-    }
-    
-    stmt = (
-        insert(trip_participants)
-        .values(invitation_values)
+    owner_id = (
+        select(trips.c.created_by_user_id)
+        .where(trips.c.trip_id == trip_id)
+        .scalar_subquery()
+    )
+    inserted = (
+        pg_insert(trip_participants)
+        .from_select(
+            ["trip_id", "user_id", "status"],
+            select(
+                literal(trip_id, trip_participants.c.trip_id.type),
+                matched.c.user_id,
+                literal(ParticipantStatus.INVITED, trip_participants.c.status.type),
+            ).where(matched.c.user_id != owner_id),
+        )
+        .on_conflict_do_nothing(index_elements=["trip_id", "user_id"])
         .returning(
             trip_participants.c.trip_id,
             trip_participants.c.user_id,
@@ -53,18 +68,62 @@ def invite_user_to_trip(
             trip_participants.c.created_at,
             trip_participants.c.updated_at,
         )
+        .cte("inserted")
     )
-    
-    result = db.execute(stmt)
-    db.commit()
-    created_row = result.first()
-    if not created_row:
-        return None
-    return dict(created_row._mapping)
+    stmt = select(
+        matched.c.email,
+        inserted.c.trip_id,
+        inserted.c.user_id,
+        inserted.c.status,
+        inserted.c.created_at,
+        inserted.c.updated_at,
+    ).select_from(
+        matched.outerjoin(inserted, inserted.c.user_id == matched.c.user_id)
+    )
+
+    result = await db.execute(stmt, {"emails": list(dict.fromkeys(user_emails))})
+    invitations = {}
+    for row in result.fetchall():
+        invitation = dict(row._mapping)
+        email = invitation.pop("email")
+        invitations[email] = invitation if invitation["user_id"] is not None else None
+
+    invited = [invitation for invitation in invitations.values() if invitation]
+    if invited:
+        await publish_events(
+            db,
+            [
+                change_event(
+                    "participant",
+                    CREATED,
+                    trip_id,
+                    id=invitation["user_id"],
+                    user_id=invitation["user_id"],
+                    access=GRANTED,
+                )
+                for invitation in invited
+            ],
+        )
+        await publish_trip_invalidations(db, [trip_id])
+    await db.commit()
+    if invited:
+        invalidate_trips([trip_id])
+    return invitations
+
+
+async def invite_user_to_trip(
+    db: AsyncSession,
+    trip_id: UUID,
+    user_email: str,
+    inviter_user_id: UUID,
+) -> dict | None:
+    """Invite a user to a trip by email. Returns the invitation record if successful."""
+    invitations = await invite_users_to_trip(db, trip_id, [user_email], inviter_user_id)
+    return invitations.get(user_email)
 
 
-def get_user_invitations(
-    db: Session,
+async def get_user_invitations(
+    db: AsyncSession,
     user_id: UUID,
 ) -> list[dict]:
     """Get all pending invitations for a user."""
@@ -90,12 +149,12 @@ def get_user_invitations(
         )
     ).order_by(trip_participants.c.created_at.desc())
     
-    result = db.execute(stmt)
+    result = await db.execute(stmt)
     return [dict(row._mapping) for row in result.fetchall()]
 
 
-def respond_to_invitation(
-    db: Session,
+async def respond_to_invitation(
+    db: AsyncSession,
     trip_id: UUID,
     user_id: UUID,
     response: ParticipantStatus,  # Should be JOINED or DECLINED
@@ -116,7 +175,7 @@ def respond_to_invitation(
         )
         .values(
             status=response,
-            updated_at=datetime.utcnow()
+            updated_at=func.now()
         )
         .returning(
             trip_participants.c.trip_id,
@@ -127,33 +186,126 @@ def respond_to_invitation(
         )
     )
     
-    result = db.execute(stmt)
-    db.commit()
+    result = await db.execute(stmt)
     updated_row = result.first()
+    if updated_row:
+        await publish_events(
+            db,
+            [
+                change_event(
+                    "participant",
+                    UPDATED,
+                    trip_id,
+                    id=user_id,
+                    user_id=user_id,
+                    access=GRANTED if response == ParticipantStatus.JOINED else REVOKED,
+                )
+            ],
+        )
+        await publish_trip_invalidations(db, [trip_id])
+    await db.commit()
     if not updated_row:
         return None
+    invalidate_trips([trip_id])
     return dict(updated_row._mapping)
 
 
-def get_trip_participants(
-    db: Session,
+async def get_trip_participants(
+    db: AsyncSession,
     trip_id: UUID,
-) -> list[dict]:
-    """Get all participants for a trip (including pending invitations)."""
+    user_id: UUID,
+    status: ParticipantStatus | None = None,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page:
+    """Get a page of a trip's participants (including pending invitations), optionally filtered by status.
+
+    The page is empty if the trip does not exist or the user has no access to it.
+    """
+    stmt = (
+        select(
+            trip_participants.c.trip_id,
+            trip_participants.c.user_id,
+            trip_participants.c.status,
+            trip_participants.c.created_at,
+            trip_participants.c.updated_at,
+            users.c.email,
+            users.c.given_name,
+            users.c.family_name,
+        )
+        .select_from(
+            trip_participants.join(users, trip_participants.c.user_id == users.c.user_id)
+        )
+        .where(
+            and_(
+                trip_participants.c.trip_id == trip_id,
+                exists().where(
+                    and_(trips.c.trip_id == trip_id, trip_access_clause(user_id))
+                ),
+            )
+        )
+    )
+    if status is not None:
+        stmt = stmt.where(trip_participants.c.status == status)
+
+    # Order by invitation time, with the user ID breaking ties
+    return await paginate(
+        db,
+        stmt,
+        nullable_column=trip_participants.c.created_at,
+        tie_columns=[trip_participants.c.user_id],
+        parsers=[datetime.fromisoformat, UUID],
+        cursor=cursor,
+        limit=limit,
+    )
+
+
+async def get_trip_participant_counts(
+    db: AsyncSession,
+    trip_id: UUID,
+    user_id: UUID,
+) -> dict[ParticipantStatus, int] | None:
+    """Number of a trip's participants in each status, or None without access.
+
+    Statuses nobody is in are left out. The access check and the counts share
+    one statement: the trip row is outer-joined to its participants, so an
+    accessible trip always yields at least one row.
+    """
+    stmt = (
+        select(trip_participants.c.status, func.count(trip_participants.c.user_id))
+        .select_from(
+            trips.outerjoin(
+                trip_participants, trip_participants.c.trip_id == trips.c.trip_id
+            )
+        )
+        .where(and_(trips.c.trip_id == trip_id, trip_access_clause(user_id)))
+        .group_by(trip_participants.c.status)
+    )
+    result = await db.execute(stmt)
+    rows = result.fetchall()
+    if not rows:
+        return None
+    return {row[0]: row[1] for row in rows if row[0] is not None}
+
+
+async def get_trip_participants_version(
+    db: AsyncSession,
+    trip_id: UUID,
+    user_id: UUID,
+) -> tuple | None:
+    """Version tag of a trip's participant list, or None without access.
+
+    Combines the participant count with the latest participant update;
+    answered from indexes alone. User profile fields are not covered, as
+    nothing edits them yet.
+    """
+    trip_rows = trip_participants.c.trip_id == trips.c.trip_id
     stmt = select(
-        trip_participants.c.trip_id,
-        trip_participants.c.user_id,
-        trip_participants.c.status,
-        trip_participants.c.created_at,
-        trip_participants.c.updated_at,
-        users.c.email,
-        users.c.given_name,
-        users.c.family_name,
-    ).select_from(
-        trip_participants.join(users, trip_participants.c.user_id == users.c.user_id)
-    ).where(
-        trip_participants.c.trip_id == trip_id
-    ).order_by(trip_participants.c.created_at.asc())
-    
-    result = db.execute(stmt)
-    return [dict(row._mapping) for row in result.fetchall()]
\ No newline at end of file
+        select(func.count()).where(trip_rows).scalar_subquery(),
+        select(func.max(trip_participants.c.updated_at))
+        .where(trip_rows)
+        .scalar_subquery(),
+    ).where(and_(trips.c.trip_id == trip_id, trip_access_clause(user_id)))
+    result = await db.execute(stmt)
+    row = result.first()
+    return tuple(row) if row else None
@@ -1,14 +1,27 @@
+import os
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import update, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import exists, false, insert, select, true, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
+from src.cache import TTLCache
 from src.database.models import users, UserStatus
+from src.invalidation import INVALIDATION_BUS, publish_invalidations
 
+# Authenticated users keyed by email, filled by `src.auth.get_current_user`.
+# The write paths below evict entries, in every process, so status changes
+# apply immediately.
+USER_CACHE = TTLCache(
+    maxsize=int(os.getenv("USER_CACHE_MAX_SIZE", 10000)),
+    ttl=float(os.getenv("USER_CACHE_TTL_SECONDS", 60)),
+)
+INVALIDATION_BUS.register("users", USER_CACHE.delete, USER_CACHE.clear)
 
-def create_user(
-    db: Session,
+
+async def create_user(
+    db: AsyncSession,
     email: str,
     password_hash: str,
     given_name: str,
@@ -33,29 +46,94 @@ def create_user(
     )
 
     try:
-        result = db.execute(stmt)
-        db.commit()
+        result = await db.execute(stmt)
+        await publish_invalidations(db, "users", [email])
+        await db.commit()
+        USER_CACHE.delete(email)
         first_result = result.first()
         return dict(first_result._mapping) if first_result else None
     except Exception as e:
-        db.rollback()
+        await db.rollback()
+        raise e
+
+
+async def get_or_create_user(
+    db: AsyncSession,
+    email: str,
+    password_hash: str,
+    given_name: str,
+    family_name: str,
+    profile_picture_url: Optional[str] = None,
+    oauth_provider: Optional[str] = None,
+    oauth_provider_user_id: Optional[str] = None,
+) -> tuple[dict, bool]:
+    """Get the user with `email`, creating it if there is none.
+
+    Returns the user and whether it was created. The insert skips an existing
+    email without touching its row, and the same statement reads that row
+    back, so a returning user costs one round trip and writes nothing. A
+    concurrent first sign-in for the same email waits for the other to commit
+    and, as its snapshot predates that row, falls back to a plain select
+    instead of failing.
+    """
+    inserted = (
+        pg_insert(users)
+        .values(
+            email=email,
+            password_hash=password_hash,
+            given_name=given_name,
+            family_name=family_name,
+            profile_picture_url=profile_picture_url,
+            oauth_provider=oauth_provider,
+            oauth_provider_user_id=oauth_provider_user_id,
+        )
+        .on_conflict_do_nothing(index_elements=[users.c.email])
+        .returning(*users.c, true().label("created"))
+        .cte("inserted")
+    )
+    stmt = select(inserted).union_all(
+        select(*users.c, false().label("created")).where(
+            users.c.email == email, ~exists(select(inserted.c.user_id))
+        )
+    )
+
+    try:
+        row = (await db.execute(stmt)).first()
+        if row is None:
+            row = (
+                await db.execute(
+                    select(*users.c, false().label("created")).where(
+                        users.c.email == email
+                    )
+                )
+            ).one()
+        user = dict(row._mapping)
+        created = user.pop("created")
+        if created:
+            await publish_invalidations(db, "users", [email])
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
         raise e
+    if created:
+        USER_CACHE.delete(email)
+    return user, created
 
 
-def get_user(db: Session, user_id: UUID) -> Optional[dict]:
+async def get_user(db: AsyncSession, user_id: UUID) -> Optional[dict]:
     stmt = select(users).where(users.c.user_id == user_id)
-    result = db.execute(stmt).first()
+    result = (await db.execute(stmt)).first()
     return dict(result._mapping) if result else None
 
 
-def get_user_by_email(db: Session, email: str) -> Optional[dict]:
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[dict]:
     stmt = select(users).where(users.c.email == email)
-    result = db.execute(stmt).first()
+    result = (await db.execute(stmt)).first()
     return dict(result._mapping) if result else None
 
 
-def update_user_status(
-    db: Session, user_id: UUID, status: UserStatus
+async def update_user_status(
+    db: AsyncSession, user_id: UUID, status: UserStatus
 ) -> Optional[dict]:
     stmt = (
         update(users)
@@ -63,7 +141,12 @@ def update_user_status(
         .values(status=status.value)
         .returning(users)
     )
-    result = db.execute(stmt)
-    db.commit()
+    result = await db.execute(stmt)
     row = result.first()
-    return dict(row._mapping) if row else None
+    if row:
+        await publish_invalidations(db, "users", [row.email])
+    await db.commit()
+    if not row:
+        return None
+    USER_CACHE.delete(row.email)
+    return dict(row._mapping)
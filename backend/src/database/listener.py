@@ -0,0 +1,133 @@
+"""
+One Postgres connection per process for LISTEN/NOTIFY.
+
+Notifications are delivered outside the connection pool on a dedicated
+asyncpg connection that `DatabaseListener` keeps open, re-establishing it
+with backoff when it drops. Postgres does not queue notifications for a
+disconnected listener, so anything sent during the gap is lost; handlers
+registered with `on_reconnect` run after every reconnect to recover.
+
+LISTEN needs a session-level connection: behind PgBouncer in transaction
+mode, point `DB_LISTEN_URL` at Postgres directly.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Callable
+
+import asyncpg
+from sqlalchemy import make_url
+
+from src.database.config import DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+DB_LISTEN_URL = os.getenv("DB_LISTEN_URL", DATABASE_URL)
+# Seconds between liveness checks of the listening connection.
+DB_LISTEN_KEEPALIVE_SECONDS = float(os.getenv("DB_LISTEN_KEEPALIVE_SECONDS", 15))
+DB_LISTEN_MAX_RETRY_SECONDS = float(os.getenv("DB_LISTEN_MAX_RETRY_SECONDS", 30))
+
+
+def _asyncpg_dsn(url: str) -> str:
+    return make_url(url).set(drivername="postgresql").render_as_string(
+        hide_password=False
+    )
+
+
+class DatabaseListener:
+    """Dispatches notifications on subscribed channels to their handlers."""
+
+    def __init__(self, url: str = DB_LISTEN_URL):
+        self._dsn = _asyncpg_dsn(url)
+        self._handlers: dict[str, list[Callable[[str], None]]] = {}
+        self._reconnect_handlers: list[Callable[[], None]] = []
+        self._task: asyncio.Task | None = None
+        self.connected = False
+        self.reconnects = 0
+
+    def subscribe(self, channel: str, handler: Callable[[str], None]) -> None:
+        """Call `handler` with the payload of every notification on `channel`.
+
+        Register handlers before `start`. Handlers run on the event loop and
+        must not block.
+        """
+        self._handlers.setdefault(channel, []).append(handler)
+
+    def on_reconnect(self, handler: Callable[[], None]) -> None:
+        """Call `handler` whenever the connection is re-established after a drop."""
+        self._reconnect_handlers.append(handler)
+
+    async def start(self) -> None:
+        if self._task is None and self._handlers:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _dispatch(self, connection, pid, channel: str, payload: str) -> None:
+        for handler in self._handlers.get(channel, ()):
+            try:
+                handler(payload)
+            except Exception as e:
+                logger.error(f"Error handling notification on {channel}: {e}")
+
+    async def _run(self) -> None:
+        delay = 1.0
+        first = True
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self._dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                for channel in self._handlers:
+                    await connection.add_listener(channel, self._dispatch)
+                self.connected = True
+                delay = 1.0
+                if not first:
+                    self.reconnects += 1
+                    logger.info("Reconnected database listener")
+                    for handler in self._reconnect_handlers:
+                        try:
+                            handler()
+                        except Exception as e:
+                            logger.error(f"Error in listener reconnect handler: {e}")
+                while not closed.is_set():
+                    try:
+                        await asyncio.wait_for(
+                            closed.wait(), timeout=DB_LISTEN_KEEPALIVE_SECONDS
+                        )
+                    except asyncio.TimeoutError:
+                        # A dead peer is only noticed on the next round trip.
+                        await connection.execute(
+                            "SELECT 1", timeout=DB_LISTEN_KEEPALIVE_SECONDS
+                        )
+                raise ConnectionError("connection closed")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Database listener connection lost: {e}")
+            finally:
+                first = False
+                self.connected = False
+                if connection is not None:
+                    connection.terminate()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, DB_LISTEN_MAX_RETRY_SECONDS)
+
+    def stats(self) -> dict:
+        return {
+            "connected": self.connected,
+            "reconnects": self.reconnects,
+            "channels": sorted(self._handlers),
+        }
+
+
+LISTENER = DatabaseListener()
@@ -4,15 +4,16 @@ from sqlalchemy import (
     String,
     DateTime,
     ForeignKey,
+    Index,
     MetaData,
     Table,
-    JSON,
     Float,
+    LargeBinary,
     Enum as SQLEnum,
     func,
     text,
 )
-from sqlalchemy.dialects.postgresql import UUID, TIMESTAMP
+from sqlalchemy.dialects.postgresql import JSONB, UUID, TIMESTAMP
 
 metadata_obj = MetaData()
 
@@ -32,6 +33,12 @@ class ParticipantStatus(StrEnum):
     LEFT = "left"
 
 
+class TripAccessRole(StrEnum):
+    OWNER = "owner"
+    JOINED = "joined"
+    INVITED = "invited"
+
+
 class ItineraryItemType(StrEnum):
     UNKNOWN = "unknown"
     FLIGHT = "flight"
@@ -42,6 +49,18 @@ class ItineraryItemType(StrEnum):
     ACTIVITY = "activity"
 
 
+class TombstoneEntityType(StrEnum):
+    TRIP = "trip"
+    ITINERARY_ITEM = "itinerary_item"
+
+
+class InboundEmailStatus(StrEnum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    PARSED = "parsed"
+    FAILED = "failed"
+
+
 metadata = MetaData()
 
 users = Table(
@@ -113,6 +132,13 @@ trips = Table(
         server_default=func.now(),
         onupdate=func.now(),
     ),
+    Index("ix_trips_created_by_user_id_start_date", "created_by_user_id", "start_date"),
+    # Covers the trip listing filters and version tags (ETags) as index-only scans.
+    Index(
+        "ix_trips_trip_id_start_date_updated_at",
+        "trip_id",
+        postgresql_include=["start_date", "updated_at"],
+    ),
 )
 
 trip_participants = Table(
@@ -143,6 +169,62 @@ trip_participants = Table(
         server_default=func.now(),
         onupdate=func.now(),
     ),
+    Index(
+        "ix_trip_participants_user_id_status",
+        "user_id",
+        "status",
+        postgresql_include=["trip_id"],
+    ),
+    Index(
+        "ix_trip_participants_user_id_created_at_invited",
+        "user_id",
+        "created_at",
+        postgresql_where=text("status = 'INVITED'"),
+    ),
+    Index("ix_trip_participants_trip_id_created_at", "trip_id", "created_at"),
+    Index(
+        "ix_trip_participants_trip_id_status_created_at",
+        "trip_id",
+        "status",
+        "created_at",
+    ),
+    Index("ix_trip_participants_trip_id_updated_at", "trip_id", "updated_at"),
+)
+
+# Denormalized access grants, one row per (user, trip) the user can see. Kept in
+# sync with trips and trip_participants by database triggers; see
+# src/database/crud/trip_access.py for the consistency checker.
+trip_access = Table(
+    "trip_access",
+    metadata_obj,
+    Column(
+        "user_id",
+        UUID(as_uuid=True),
+        ForeignKey("users.user_id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "trip_id",
+        UUID(as_uuid=True),
+        ForeignKey("trips.trip_id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    ),
+    Column("role", String, nullable=False),
+    # When the grant was created or its role last changed; the sync endpoint
+    # sends the full contents of trips granted since the client's cursor.
+    Column(
+        "updated_at",
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    ),
+    Index(
+        "ix_trip_access_user_id_role",
+        "user_id",
+        "role",
+        postgresql_include=["trip_id"],
+    ),
 )
 
 trip_segments = Table(
@@ -197,7 +279,10 @@ itinerary_items = Table(
     Column("booking_reference", String, nullable=True),
     Column("booking_url", String, nullable=True),
     Column("notes", String, nullable=True),
-    Column("details", JSON, nullable=True),
+    Column("details", JSONB, nullable=True),
+    # Hash of the booking's identifying fields for ingested items; see
+    # `itinerary_item_fingerprint`. NULL for items created by hand.
+    Column("fingerprint", String, nullable=True),
     Column(
         "created_at",
         TIMESTAMP(timezone=True),
@@ -211,8 +296,57 @@ itinerary_items = Table(
         server_default=func.now(),
         onupdate=func.now(),
     ),
+    Index(
+        "ix_itinerary_items_created_by_user_id_fingerprint",
+        "created_by_user_id",
+        "fingerprint",
+        unique=True,
+    ),
+    Index("ix_itinerary_items_trip_id_updated_at", "trip_id", "updated_at"),
+    Index(
+        "ix_itinerary_items_created_by_user_id_updated_at",
+        "created_by_user_id",
+        "updated_at",
+    ),
+    Index(
+        "ix_itinerary_items_trip_id_itinerary_datetime",
+        "trip_id",
+        "itinerary_datetime",
+        "created_at",
+    ),
+    Index(
+        "ix_itinerary_items_created_by_user_id_itinerary_datetime",
+        "created_by_user_id",
+        "itinerary_datetime",
+        "created_at",
+    ),
+)
+
+# Keys of the type-specific detail schemas in src/schemas/itinerary_item.py that
+# can be filtered on; each has an expression index on `details ->> key`.
+ITINERARY_ITEM_DETAIL_FILTER_KEYS = (
+    "flight_number",
+    "origin_airport_code",
+    "destination_airport_code",
+    "train_number",
+    "bus_number",
+    "origin_station",
+    "destination_station",
 )
 
+# Containment queries (`details @> ...`) on any other key.
+Index(
+    "ix_itinerary_items_details",
+    itinerary_items.c.details,
+    postgresql_using="gin",
+    postgresql_ops={"details": "jsonb_path_ops"},
+)
+for _key in ITINERARY_ITEM_DETAIL_FILTER_KEYS:
+    Index(
+        f"ix_itinerary_items_details_{_key}",
+        itinerary_items.c.details[_key].astext,
+    )
+
 itinerary_participants = Table(
     "itinerary_participants",
     metadata_obj,
@@ -245,3 +379,103 @@ itinerary_participants = Table(
         onupdate=func.now(),
     ),
 )
+
+# Records of rows that disappeared from a user's view, written by database
+# triggers: itinerary items deleted or moved off a trip (`trip_id` is the trip
+# they left, `user_id` their creator) and trip access grants revoked
+# (`user_id` lost access to `trip_id`). Read by the sync endpoint and pruned
+# after SYNC_TOMBSTONE_RETENTION_DAYS; see src/database/crud/sync.py.
+tombstones = Table(
+    "tombstones",
+    metadata_obj,
+    Column(
+        "tombstone_id",
+        UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+    ),
+    Column("entity_type", String, nullable=False),
+    Column("entity_id", UUID(as_uuid=True), nullable=False),
+    Column("trip_id", UUID(as_uuid=True), nullable=True),
+    Column("user_id", UUID(as_uuid=True), nullable=True),
+    Column(
+        "deleted_at",
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    ),
+    Index("ix_tombstones_trip_id_deleted_at", "trip_id", "deleted_at"),
+    Index("ix_tombstones_user_id_deleted_at", "user_id", "deleted_at"),
+    Index("ix_tombstones_deleted_at", "deleted_at"),
+)
+
+# Per-user recipient addresses for email forwarding: mail sent to
+# `<local_part>@INBOUND_EMAIL_DOMAIN` lands in that user's inbox.
+inbound_email_addresses = Table(
+    "inbound_email_addresses",
+    metadata_obj,
+    Column("local_part", String, primary_key=True),
+    Column(
+        "user_id",
+        UUID(as_uuid=True),
+        ForeignKey("users.user_id", ondelete="CASCADE"),
+        nullable=False,
+        # One forwarding address per user
+        index=True,
+        unique=True,
+    ),
+    Column(
+        "created_at",
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    ),
+)
+
+# Raw forwarded messages, written by the SMTP ingestion server and consumed by
+# the parser.
+inbound_emails = Table(
+    "inbound_emails",
+    metadata_obj,
+    Column(
+        "inbound_email_id",
+        UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+    ),
+    Column(
+        "user_id",
+        UUID(as_uuid=True),
+        ForeignKey("users.user_id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    Column("recipient", String, nullable=False),
+    Column("mail_from", String, nullable=True),
+    Column("raw_message", LargeBinary, nullable=False),
+    Column(
+        "status",
+        SQLEnum(InboundEmailStatus, create_type=False),
+        nullable=False,
+        server_default=text("'PENDING'"),
+    ),
+    Column("error", String, nullable=True),
+    Column(
+        "received_at",
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    ),
+    # Set when a parser worker claims the message; stale claims are retried.
+    Column("claimed_at", TIMESTAMP(timezone=True), nullable=True),
+    Column("processed_at", TIMESTAMP(timezone=True), nullable=True),
+    Index(
+        "ix_inbound_emails_received_at_pending",
+        "received_at",
+        postgresql_where=text("status = 'PENDING'"),
+    ),
+    Index(
+        "ix_inbound_emails_claimed_at_processing",
+        "claimed_at",
+        postgresql_where=text("status = 'PROCESSING'"),
+    ),
+)
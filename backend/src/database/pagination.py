@@ -0,0 +1,153 @@
+"""
+Keyset (cursor) pagination helpers for list queries.
+
+Listings are ordered by a nullable leading column (NULLS LAST) followed by
+non-null tiebreaker columns that make the order total. A cursor records the
+sort key of the first or last row of a page, so fetching the next page is an
+index range scan instead of an ever-growing OFFSET.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Sequence
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Select, and_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+NEXT = "next"
+PREV = "prev"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client sends a cursor that cannot be decoded."""
+
+
+@dataclass
+class Page:
+    items: list[dict]
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(direction: str, values: Sequence[Any]) -> str:
+    """Encode a sort key into an opaque, URL-safe cursor."""
+    raw = json.dumps(
+        {"d": direction, "k": [_jsonable(value) for value in values]},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: str, parsers: Sequence[Callable[[Any], Any]]
+) -> tuple[str, list[Any]]:
+    """Decode a cursor into its direction and sort key, parsing each value with `parsers`."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        direction, values = data["d"], data["k"]
+        if direction not in (NEXT, PREV) or len(values) != len(parsers):
+            raise ValueError("cursor does not match this listing")
+        return direction, [
+            None if value is None else parse(value)
+            for parse, value in zip(parsers, values)
+        ]
+    except (binascii.Error, UnicodeDecodeError, KeyError, TypeError, ValueError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {e}")
+
+
+def _keyset_blocks(
+    nullable_column: ColumnElement,
+    tie_columns: Sequence[ColumnElement],
+    key: Sequence[Any] | None,
+    after: bool,
+) -> list[ColumnElement[bool] | None]:
+    """Predicates for the rows strictly after (or before) `key`, one per block, in order.
+
+    The non-null and the null block of `nullable_column NULLS LAST,
+    *tie_columns` order are read separately: each is then a single row-value
+    comparison that an index on the sort columns serves as a range scan,
+    where an OR across both blocks would make Postgres filter rows instead.
+    """
+    if key is None:
+        return [None]
+    lead, ties = key[0], key[1:]
+    is_null = nullable_column.is_(None)
+    if lead is None:
+        tie_tuple = tuple_(*tie_columns)
+        tie_cmp = tie_tuple > tuple_(*ties) if after else tie_tuple < tuple_(*ties)
+        # Every non-null row sorts before the null block.
+        blocks = [and_(is_null, tie_cmp)]
+        return blocks if after else blocks + [nullable_column.is_not(None)]
+    row = tuple_(nullable_column, *tie_columns)
+    # A row with a null lead compares as null, so this is the non-null block.
+    blocks = [row > tuple_(lead, *ties) if after else row < tuple_(lead, *ties)]
+    # The null block sorts after every non-null row; a NOT NULL column has none.
+    if after and getattr(nullable_column, "nullable", True):
+        blocks.append(is_null)
+    return blocks
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select,
+    nullable_column: ColumnElement,
+    tie_columns: Sequence[ColumnElement],
+    parsers: Sequence[Callable[[Any], Any]],
+    cursor: str | None,
+    limit: int,
+) -> Page:
+    """Run `stmt` one page at a time, ordered by `nullable_column NULLS LAST, *tie_columns`.
+
+    `stmt` must select every sort column under its own name. A page that
+    reaches the end of the non-null block takes a second statement to read
+    on into the null block.
+    """
+    direction, key = decode_cursor(cursor, parsers) if cursor else (NEXT, None)
+    forward = direction == NEXT
+    if forward:
+        order = [nullable_column.asc().nulls_last()] + [c.asc() for c in tie_columns]
+    else:
+        order = [nullable_column.desc().nulls_first()] + [c.desc() for c in tie_columns]
+    blocks = _keyset_blocks(nullable_column, tie_columns, key, forward)
+
+    # One extra row tells us whether another page exists in this direction.
+    # The next block is only read when the one before runs out.
+    rows = []
+    for block in blocks:
+        block_stmt = stmt if block is None else stmt.where(block)
+        block_stmt = block_stmt.order_by(*order).limit(limit + 1 - len(rows))
+        result = await db.execute(block_stmt)
+        rows += [dict(row._mapping) for row in result.fetchall()]
+        if len(rows) > limit:
+            break
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not forward:
+        rows.reverse()
+
+    sort_names = [nullable_column.name] + [c.name for c in tie_columns]
+    page = Page(items=rows)
+    if rows:
+        has_next = has_more if forward else True
+        has_prev = has_more if not forward else key is not None
+        if has_next:
+            page.next_cursor = encode_cursor(NEXT, [rows[-1][n] for n in sort_names])
+        if has_prev:
+            page.prev_cursor = encode_cursor(PREV, [rows[0][n] for n in sort_names])
+    return page
@@ -0,0 +1,209 @@
+"""
+Live change events for trips, participants and itinerary items.
+
+CRUD write paths call `publish_events` inside their transaction; it queues a
+Postgres NOTIFY, which is delivered when the transaction commits and dropped
+if it rolls back. Every process holds a single LISTEN connection (see
+`src.database.listener`) and `EVENT_HUB` fans each event out, in memory, to
+the subscriptions it concerns: those watching the event's trip, and those
+of the user the event names. Each client stream is one subscription.
+
+Events are compact hints, not data:
+
+    {"kind": "itinerary_item", "op": "updated", "trip_id": "...", "id": "..."}
+
+A client reacts by fetching what changed, typically through the sync
+endpoint. When a client falls behind, or the listener reconnected and events
+may have been lost, it receives `{"kind": "resync"}` instead.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Awaitable, Iterable
+from uuid import UUID
+
+from sqlalchemy import String, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.listener import LISTENER
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = "trip_events"
+# Events buffered per subscription before it is told to resync instead.
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", 100))
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+
+# Values of an event's `access` field, telling the hub to start or stop
+# routing a trip's events to the user the event names.
+GRANTED = "granted"
+REVOKED = "revoked"
+
+RESYNC = {"kind": "resync"}
+
+
+def change_event(
+    kind: str,
+    op: str,
+    trip_id: UUID | None = None,
+    id: UUID | None = None,
+    user_id: UUID | None = None,
+    access: str | None = None,
+) -> dict:
+    """Build an event; `user_id` also delivers it to that user's streams.
+
+    Bulk writes leave out `id` and send one event per trip.
+    """
+    event = {"kind": kind, "op": op}
+    if id is not None:
+        event["id"] = str(id)
+    if trip_id is not None:
+        event["trip_id"] = str(trip_id)
+    if user_id is not None:
+        event["user_id"] = str(user_id)
+    if access is not None:
+        event["access"] = access
+    return event
+
+
+async def publish_events(db: AsyncSession, events: Iterable[dict]) -> None:
+    """Queue `events` for delivery when the current transaction commits."""
+    payloads = [json.dumps(event, separators=(",", ":")) for event in events]
+    if not payloads:
+        return
+    payload = func.unnest(bindparam("payloads", type_=ARRAY(String))).column_valued()
+    stmt = select(func.pg_notify(EVENTS_CHANNEL, payload))
+    await db.execute(stmt, {"payloads": payloads})
+
+
+@dataclass(eq=False)
+class Subscription:
+    user_id: str
+    trip_ids: set[str] = field(default_factory=set)
+    queue: asyncio.Queue = field(
+        default_factory=lambda: asyncio.Queue(maxsize=EVENTS_QUEUE_SIZE)
+    )
+
+    def deliver(self, event: dict) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Whatever is queued is superseded by a full resync.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+
+class EventHub:
+    """Routes events from the process's listener to its subscriptions."""
+
+    def __init__(self):
+        self._by_trip: dict[str, set[Subscription]] = {}
+        self._by_user: dict[str, set[Subscription]] = {}
+        # Trip events seen by subscriptions whose trips are still being read,
+        # and whether each was delivered to them.
+        self._holding: dict[Subscription, list[tuple[dict, bool]]] = {}
+        self.events = 0
+        self.deliveries = 0
+
+    async def subscribe(
+        self, user_id: UUID, trip_ids: Awaitable[Iterable[UUID]]
+    ) -> Subscription:
+        """Subscribe to the user's events and to those of the trips `trip_ids` reads.
+
+        Trip events dispatched while `trip_ids` is awaited are held and
+        delivered once the trips are watched, so none are lost in between.
+        """
+        subscription = Subscription(user_id=str(user_id))
+        self._by_user.setdefault(subscription.user_id, set()).add(subscription)
+        held = self._holding[subscription] = []
+        try:
+            loaded = set(map(str, await trip_ids))
+        except BaseException:
+            self.unsubscribe(subscription)
+            raise
+        finally:
+            del self._holding[subscription]
+        # The read may predate a revocation that arrived while it ran.
+        for event, _ in held:
+            if (
+                event.get("access") == REVOKED
+                and event.get("user_id") == subscription.user_id
+            ):
+                loaded.discard(event["trip_id"])
+        added = loaded - subscription.trip_ids
+        self.watch(subscription, added)
+        for event, delivered in held:
+            if not delivered and event["trip_id"] in added:
+                subscription.deliver(event)
+        return subscription
+
+    def watch(self, subscription: Subscription, trip_ids: Iterable[UUID]) -> None:
+        for trip_id in map(str, trip_ids):
+            subscription.trip_ids.add(trip_id)
+            self._by_trip.setdefault(trip_id, set()).add(subscription)
+
+    def unwatch(self, subscription: Subscription, trip_id: str) -> None:
+        subscription.trip_ids.discard(trip_id)
+        subscriptions = self._by_trip.get(trip_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._by_trip[trip_id]
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for trip_id in list(subscription.trip_ids):
+            self.unwatch(subscription, trip_id)
+        subscriptions = self._by_user.get(subscription.user_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._by_user[subscription.user_id]
+
+    def dispatch(self, event: dict) -> None:
+        self.events += 1
+        trip_id = event.get("trip_id")
+        user_id = event.get("user_id")
+        user_subscriptions = self._by_user.get(user_id, set())
+        if trip_id is not None and event.get("access") == GRANTED:
+            for subscription in user_subscriptions:
+                self.watch(subscription, [trip_id])
+        recipients = self._by_trip.get(trip_id, set()) | user_subscriptions
+        for subscription in recipients:
+            subscription.deliver(event)
+        self.deliveries += len(recipients)
+        if trip_id is not None:
+            for subscription, held in self._holding.items():
+                held.append((event, subscription in recipients))
+        if trip_id is not None and event.get("access") == REVOKED:
+            for subscription in user_subscriptions:
+                self.unwatch(subscription, trip_id)
+
+    def resync_all(self) -> None:
+        """Tell every subscription to resync, e.g. after events may have been lost."""
+        for subscriptions in list(self._by_user.values()):
+            for subscription in subscriptions:
+                subscription.deliver(RESYNC)
+
+    def _on_notification(self, payload: str) -> None:
+        self.dispatch(json.loads(payload))
+
+    def stats(self) -> dict:
+        return {
+            "subscriptions": sum(len(s) for s in self._by_user.values()),
+            "watched_trips": len(self._by_trip),
+            "events": self.events,
+            "deliveries": self.deliveries,
+        }
+
+
+EVENT_HUB = EventHub()
+LISTENER.subscribe(EVENTS_CHANNEL, EVENT_HUB._on_notification)
+LISTENER.on_reconnect(EVENT_HUB.resync_all)
@@ -1,3 +1,5 @@
+import os
+
 import firebase_admin
 
 
@@ -7,3 +9,7 @@ def get_firebase_app():
     except ValueError:
         firebase_app = firebase_admin.initialize_app()
     return firebase_app
+
+
+def get_firebase_project_id() -> str | None:
+    return os.getenv("FIREBASE_PROJECT_ID") or get_firebase_app().project_id
@@ -0,0 +1,151 @@
+"""
+Local verification of Firebase ID tokens against a prefetched signing-key ring.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+
+import jwt
+import requests
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_JWKS_URL = "https://www.googleapis.com/service_accounts/v1/jwk/securetoken@system.gserviceaccount.com"
+
+_MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+
+class InvalidTokenError(ValueError):
+    """Raised when a token fails local verification."""
+
+
+class FirebaseKeyRing:
+    """Keeps Google's token signing keys in memory and refreshes them in the background.
+
+    `start` prefetches the keys and schedules a refresh ahead of the `max-age`
+    advertised by the key endpoint, so verification never waits on the network.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str = GOOGLE_JWKS_URL,
+        refresh_margin_seconds: float = 300,
+        retry_interval_seconds: float = 30,
+        unknown_kid_refresh_interval_seconds: float = 60,
+    ):
+        self.jwks_url = jwks_url
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.retry_interval_seconds = retry_interval_seconds
+        self.unknown_kid_refresh_interval_seconds = unknown_kid_refresh_interval_seconds
+        self.project_id: str | None = None
+        self._keys: dict[str, jwt.PyJWK] = {}
+        self._max_age: float = 0
+        self._last_refresh_at = float("-inf")
+        self._refresh_task: asyncio.Task | None = None
+        self._refresh_requested = asyncio.Event()
+
+    @property
+    def ready(self) -> bool:
+        return self.project_id is not None and bool(self._keys)
+
+    async def start(self, project_id: str) -> None:
+        self.project_id = project_id
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.error(f"Failed to prefetch Firebase signing keys: {e}")
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    async def refresh(self) -> None:
+        self._last_refresh_at = time.monotonic()
+        response = await asyncio.to_thread(requests.get, self.jwks_url, timeout=10)
+        response.raise_for_status()
+        keys = {
+            jwk["kid"]: jwt.PyJWK(jwk, algorithm="RS256")
+            for jwk in response.json()["keys"]
+        }
+        if not keys:
+            raise ValueError("Signing key endpoint returned no keys")
+        match = _MAX_AGE_PATTERN.search(response.headers.get("Cache-Control", ""))
+        self._max_age = float(match.group(1)) if match else 0
+        self._keys = keys
+        logger.info(f"Loaded {len(keys)} Firebase signing keys (max-age {self._max_age}s)")
+
+    async def _refresh_loop(self) -> None:
+        delay = self._next_refresh_delay()
+        while True:
+            try:
+                await asyncio.wait_for(self._refresh_requested.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            self._refresh_requested.clear()
+            try:
+                await self.refresh()
+                delay = self._next_refresh_delay()
+            except Exception as e:
+                logger.error(f"Failed to refresh Firebase signing keys: {e}")
+                delay = self.retry_interval_seconds
+
+    def _next_refresh_delay(self) -> float:
+        if not self._keys:
+            return self.retry_interval_seconds
+        return max(
+            self._max_age - self.refresh_margin_seconds, self.retry_interval_seconds
+        )
+
+    def verify(self, token: str) -> dict:
+        """Verify a Firebase ID token and return its claims, mirroring `auth.verify_id_token`."""
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except jwt.PyJWTError as e:
+            raise InvalidTokenError(f"Malformed token: {e}")
+
+        key = self._keys.get(kid)
+        if key is None:
+            # Keys rotate ahead of use, so an unknown kid is most likely forged;
+            # still wake the refresher in case we are behind, but not more often
+            # than the interval, so a stream of forged tokens cannot make every
+            # request trigger a key fetch.
+            since_refresh = time.monotonic() - self._last_refresh_at
+            if since_refresh >= self.unknown_kid_refresh_interval_seconds:
+                self._refresh_requested.set()
+            raise InvalidTokenError(f"Unknown signing key: {kid}")
+
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=["RS256"],
+                audience=self.project_id,
+                issuer=f"https://securetoken.google.com/{self.project_id}",
+                options={"require": ["exp", "iat", "aud", "iss", "sub"]},
+            )
+        except jwt.PyJWTError as e:
+            raise InvalidTokenError(f"Invalid token: {e}")
+
+        if not claims["sub"] or len(claims["sub"]) > 128:
+            raise InvalidTokenError("Invalid subject claim")
+        if claims.get("auth_time", 0) > time.time():
+            raise InvalidTokenError("Token auth_time is in the future")
+        claims["uid"] = claims["sub"]
+        return claims
+
+
+KEY_RING = FirebaseKeyRing(
+    jwks_url=os.getenv("FIREBASE_JWKS_URL", GOOGLE_JWKS_URL),
+    unknown_kid_refresh_interval_seconds=float(
+        os.getenv("FIREBASE_UNKNOWN_KID_REFRESH_INTERVAL_SECONDS", 60)
+    ),
+)
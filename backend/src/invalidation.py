@@ -0,0 +1,118 @@
+"""
+Cross-process cache invalidation over Postgres LISTEN/NOTIFY.
+
+In-process caches (users, trip responses) are private to each worker, so a
+write handled by one worker must also evict the entries the others hold.
+CRUD write paths call `publish_invalidations` inside their transaction with
+the cache's name and the affected keys; Postgres delivers the notification
+to every listening process when the transaction commits, and never if it
+rolls back. Each process applies the keys through the callbacks its caches
+registered with `INVALIDATION_BUS`, skipping its own messages: the writing
+process evicts locally right after committing.
+
+Postgres does not queue notifications for a disconnected listener, so when
+the listening connection is re-established every registered cache is
+flushed in full.
+"""
+
+import json
+import logging
+from typing import Callable, Hashable, Iterable
+from uuid import uuid4
+
+from sqlalchemy import String, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.listener import LISTENER, DatabaseListener
+
+logger = logging.getLogger(__name__)
+
+INVALIDATIONS_CHANNEL = "cache_invalidations"
+# Keys per notification, keeping payloads well under Postgres' 8000 byte limit.
+KEYS_PER_NOTIFICATION = 100
+
+
+class InvalidationBus:
+    """Applies invalidations published by other processes to local caches."""
+
+    def __init__(self, listener: DatabaseListener):
+        # Identifies this process's own messages, which it has already applied.
+        self.origin = uuid4().hex
+        self._caches: dict[str, tuple[Callable[[str], None], Callable[[], None]]] = {}
+        self.received = 0
+        self.applied = 0
+        self.flushes = 0
+        listener.subscribe(INVALIDATIONS_CHANNEL, self._on_notification)
+        listener.on_reconnect(self.flush)
+
+    def register(
+        self,
+        cache: str,
+        invalidate: Callable[[str], None],
+        clear: Callable[[], None],
+    ) -> None:
+        """Route invalidations of `cache` to `invalidate(key)`; `clear()` flushes it."""
+        self._caches[cache] = (invalidate, clear)
+
+    def _on_notification(self, payload: str) -> None:
+        message = json.loads(payload)
+        self.received += 1
+        if message["origin"] == self.origin:
+            return
+        callbacks = self._caches.get(message["cache"])
+        if callbacks is None:
+            return
+        invalidate, _ = callbacks
+        for key in message["keys"]:
+            invalidate(key)
+        self.applied += 1
+
+    def flush(self) -> None:
+        """Clear every registered cache, e.g. after invalidations may have been missed."""
+        for cache, (_, clear) in self._caches.items():
+            try:
+                clear()
+            except Exception as e:
+                logger.error(f"Error flushing cache {cache}: {e}")
+        self.flushes += 1
+        logger.info(f"Flushed {len(self._caches)} caches")
+
+    def stats(self) -> dict:
+        return {
+            "origin": self.origin,
+            "caches": sorted(self._caches),
+            "received": self.received,
+            "applied": self.applied,
+            "flushes": self.flushes,
+        }
+
+
+INVALIDATION_BUS = InvalidationBus(LISTENER)
+
+
+async def publish_invalidations(
+    db: AsyncSession, cache: str, keys: Iterable[Hashable | None]
+) -> None:
+    """Queue invalidation of `keys` in `cache` on every process; sent when `db` commits.
+
+    Keys are sent as strings. The caller still evicts them from its own cache
+    after committing.
+    """
+    keys = sorted({str(key) for key in keys if key is not None})
+    if not keys:
+        return
+    payloads = [
+        json.dumps(
+            {
+                "origin": INVALIDATION_BUS.origin,
+                "cache": cache,
+                "keys": keys[i : i + KEYS_PER_NOTIFICATION],
+            },
+            separators=(",", ":"),
+        )
+        for i in range(0, len(keys), KEYS_PER_NOTIFICATION)
+    ]
+    payload = func.unnest(bindparam("payloads", type_=ARRAY(String))).column_valued()
+    stmt = select(func.pg_notify(INVALIDATIONS_CHANNEL, payload))
+    await db.execute(stmt, {"payloads": payloads})
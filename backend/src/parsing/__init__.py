@@ -0,0 +1,17 @@
+"""
+Booking-confirmation parsing: turns forwarded emails into itinerary items.
+"""
+
+from src.parsing.registry import (
+    EXTRACTORS,
+    Extractor,
+    extract_itinerary_items,
+    register_extractor,
+)
+
+__all__ = [
+    "EXTRACTORS",
+    "Extractor",
+    "extract_itinerary_items",
+    "register_extractor",
+]
@@ -0,0 +1,5 @@
+"""
+Bundled vendor extractors; importing this package registers them.
+"""
+
+from src.parsing.extractors import amtrak, booking_com, united  # noqa: F401
@@ -0,0 +1,49 @@
+import re
+from typing import Any
+
+from src.database.models import ItineraryItemType
+from src.parsing.message import ParsedEmail
+from src.parsing.registry import Extractor, parse_datetime, register_extractor
+
+_DATETIME_FORMATS = ("%b %d, %Y %I:%M %p",)
+
+_RESERVATION = re.compile(r"Reservation Number\s*[-:]\s*([A-Z0-9]{6})\b")
+_SEGMENT = re.compile(
+    r"^Train (?P<number>\d{1,4})\b[^\n]*\n"
+    r"Depart:\s*(?P<origin>[^\n]+?)\s+(?P<departure>\w{3} \d{1,2}, \d{4} \d{1,2}:\d{2} [AP]M)\s*\n"
+    r"Arrive:\s*(?P<destination>[^\n]+?)\s+(?P<arrival>\w{3} \d{1,2}, \d{4} \d{1,2}:\d{2} [AP]M)"
+    r"(?:\s*\nSeat:\s*(?P<seat>[^\n]+))?",
+    re.M,
+)
+
+
+@register_extractor
+class AmtrakExtractor(Extractor):
+    """Amtrak eTicket and reservation confirmations."""
+
+    name = "amtrak"
+    sender_pattern = re.compile(r"@(?:[\w-]+\.)*amtrak\.com$")
+
+    def extract(self, email: ParsedEmail) -> list[dict[str, Any]]:
+        reservation = _RESERVATION.search(email.text)
+        items = []
+        for segment in _SEGMENT.finditer(email.text):
+            departure = parse_datetime(segment["departure"], _DATETIME_FORMATS)
+            arrival = parse_datetime(segment["arrival"], _DATETIME_FORMATS)
+            items.append(
+                {
+                    "type": ItineraryItemType.TRAIN,
+                    "itinerary_datetime": departure,
+                    "booking_reference": reservation.group(1) if reservation else None,
+                    "details": {
+                        "origin_station": segment["origin"],
+                        "destination_station": segment["destination"],
+                        "departure_datetime": departure.isoformat() if departure else None,
+                        "arrival_datetime": arrival.isoformat() if arrival else None,
+                        "train_company": "Amtrak",
+                        "train_number": segment["number"],
+                        "seat": segment["seat"].strip() if segment["seat"] else None,
+                    },
+                }
+            )
+        return items
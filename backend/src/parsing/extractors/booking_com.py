@@ -0,0 +1,58 @@
+import re
+from typing import Any
+
+from src.database.models import ItineraryItemType
+from src.parsing.message import ParsedEmail
+from src.parsing.registry import Extractor, parse_datetime, register_extractor
+
+_DATE_FORMATS = ("%A, %d %B %Y %H:%M", "%A, %d %B %Y")
+
+_BOOKING_NUMBER = re.compile(r"(?:Booking|Confirmation) number:\s*(\d{8,12})\b")
+_PROPERTY = re.compile(r"^Your booking (?:at|in) (?P<name>[^\n]+?) is confirmed", re.M)
+_ADDRESS = re.compile(r"^Address:\s*(?P<address>[^\n]+)", re.M)
+_CHECK_IN = re.compile(
+    r"^Check-in:\s*(?P<date>\w+, \d{1,2} \w+ \d{4})(?:\s*\(from (?P<time>\d{1,2}:\d{2})\))?",
+    re.M,
+)
+_CHECK_OUT = re.compile(
+    r"^Check-out:\s*(?P<date>\w+, \d{1,2} \w+ \d{4})(?:\s*\(until (?P<time>\d{1,2}:\d{2})\))?",
+    re.M,
+)
+
+
+def _stay_datetime(match: re.Match | None):
+    if not match:
+        return None
+    value = match["date"] + (f" {match['time']}" if match["time"] else "")
+    return parse_datetime(value, _DATE_FORMATS)
+
+
+@register_extractor
+class BookingComExtractor(Extractor):
+    """Booking.com accommodation confirmations."""
+
+    name = "booking_com"
+    sender_pattern = re.compile(r"@(?:[\w-]+\.)*booking\.com$")
+    subject_pattern = re.compile(r"confirm", re.I)
+
+    def extract(self, email: ParsedEmail) -> list[dict[str, Any]]:
+        check_in = _stay_datetime(_CHECK_IN.search(email.text))
+        check_out = _stay_datetime(_CHECK_OUT.search(email.text))
+        if check_in is None:
+            return []
+        booking_number = _BOOKING_NUMBER.search(email.text)
+        property_name = _PROPERTY.search(email.text)
+        address = _ADDRESS.search(email.text)
+        return [
+            {
+                "type": ItineraryItemType.ACCOMMODATION,
+                "itinerary_datetime": check_in,
+                "booking_reference": booking_number.group(1) if booking_number else None,
+                "notes": property_name["name"] if property_name else None,
+                "details": {
+                    "address": address["address"].strip() if address else None,
+                    "check_in_datetime": check_in.isoformat(),
+                    "check_out_datetime": check_out.isoformat() if check_out else None,
+                },
+            }
+        ]
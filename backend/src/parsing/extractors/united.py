@@ -0,0 +1,52 @@
+import re
+from typing import Any
+
+from src.database.models import ItineraryItemType
+from src.parsing.message import ParsedEmail
+from src.parsing.registry import Extractor, parse_datetime, register_extractor
+
+_DATETIME_FORMATS = ("%a, %b %d, %Y %I:%M %p",)
+
+_CONFIRMATION = re.compile(r"Confirmation (?:number|code):\s*([A-Z0-9]{6})\b")
+_SEGMENT = re.compile(
+    r"\bUA\s?(?P<number>\d{1,4})\b.*?"
+    r"Departs:\s*(?P<origin_city>[^\n(]+?)\s*\((?P<origin>[A-Z]{3})\)\s*"
+    r"(?P<departure>\w{3}, \w{3} \d{1,2}, \d{4} \d{1,2}:\d{2} [AP]M).*?"
+    r"Arrives:\s*(?P<destination_city>[^\n(]+?)\s*\((?P<destination>[A-Z]{3})\)\s*"
+    r"(?P<arrival>\w{3}, \w{3} \d{1,2}, \d{4} \d{1,2}:\d{2} [AP]M)"
+    r"(?:\s*Seat:\s*(?P<seat>[0-9]{1,2}[A-K]))?",
+    re.S,
+)
+
+
+@register_extractor
+class UnitedExtractor(Extractor):
+    """United Airlines e-ticket receipts and itinerary confirmations."""
+
+    name = "united"
+    sender_pattern = re.compile(r"@(?:[\w-]+\.)*united\.com$")
+    subject_pattern = re.compile(r"confirmation|itinerary|eTicket", re.I)
+
+    def extract(self, email: ParsedEmail) -> list[dict[str, Any]]:
+        confirmation = _CONFIRMATION.search(email.text)
+        items = []
+        for segment in _SEGMENT.finditer(email.text):
+            departure = parse_datetime(segment["departure"], _DATETIME_FORMATS)
+            arrival = parse_datetime(segment["arrival"], _DATETIME_FORMATS)
+            items.append(
+                {
+                    "type": ItineraryItemType.FLIGHT,
+                    "itinerary_datetime": departure,
+                    "booking_reference": confirmation.group(1) if confirmation else None,
+                    "details": {
+                        "origin_airport_code": segment["origin"],
+                        "destination_airport_code": segment["destination"],
+                        "departure_datetime": departure.isoformat() if departure else None,
+                        "arrival_datetime": arrival.isoformat() if arrival else None,
+                        "airline_name": "United Airlines",
+                        "flight_number": f"UA{segment['number']}",
+                        "seat": segment["seat"],
+                    },
+                }
+            )
+        return items
@@ -0,0 +1,147 @@
+"""
+MIME decoding for forwarded booking confirmations.
+"""
+
+import re
+from dataclasses import dataclass
+from email import message_from_bytes
+from email.header import decode_header, make_header
+from email.message import Message
+from email.utils import parseaddr
+from html.parser import HTMLParser
+
+# "From: United Airlines <notifications@united.com>" inside a forwarded body.
+_FORWARDED_FROM = re.compile(r"^\s*>?\s*From:\s*(.+)$", re.M | re.I)
+_FORWARDED_SUBJECT = re.compile(r"^\s*>?\s*Subject:\s*(.+)$", re.M | re.I)
+_BLANK_RUNS = re.compile(r"\n\s*\n+")
+_SPACE_RUNS = re.compile(r"[ \t\r\f\v\xa0]+")
+
+_BLOCK_TAGS = {"br", "p", "div", "tr", "li", "h1", "h2", "h3", "h4", "table", "td", "th"}
+
+
+@dataclass
+class ParsedEmail:
+    """The parts of a message the extractors look at."""
+
+    sender: str
+    subject: str
+    text: str
+
+
+class _TextExtractor(HTMLParser):
+    """Flattens HTML to text, keeping block boundaries as line breaks."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._parts: list[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self._skip += 1
+        elif tag in _BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style"):
+            self._skip = max(0, self._skip - 1)
+        elif tag in _BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self._parts.append(data)
+
+    def text(self) -> str:
+        return "".join(self._parts)
+
+
+def html_to_text(html: str) -> str:
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return parser.text()
+
+
+def _normalize(text: str) -> str:
+    lines = (_SPACE_RUNS.sub(" ", line).strip() for line in text.splitlines())
+    return _BLANK_RUNS.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _find_body(message: Message) -> Message | None:
+    """The HTML body if there is one, else the plain-text body.
+
+    Attachments and nested messages are skipped; confirmations put the HTML
+    version last, so the first HTML part wins over earlier plain parts.
+    """
+    plain = None
+    for part in message.walk():
+        content_type = part.get_content_type()
+        if content_type == "message/rfc822":
+            break
+        if part.get("Content-Disposition", "").lower().startswith("attachment"):
+            continue
+        if content_type == "text/html":
+            return part
+        if content_type == "text/plain" and plain is None:
+            plain = part
+    return plain
+
+
+def _body_text(message: Message) -> str:
+    part = _find_body(message)
+    if part is None:
+        return ""
+    payload = part.get_payload(decode=True) or b""
+    charset = part.get_content_charset() or "utf-8"
+    try:
+        content = payload.decode(charset, errors="replace")
+    except LookupError:
+        content = payload.decode("utf-8", errors="replace")
+    if part.get_content_type() == "text/html":
+        content = html_to_text(content)
+    return _normalize(content)
+
+
+def _header(message: Message, name: str) -> str:
+    value = message.get(name, "")
+    if "=?" not in value:
+        return str(value).strip()
+    return str(make_header(decode_header(value))).strip()
+
+
+def _address(value: str) -> str:
+    return parseaddr(value)[1].lower()
+
+
+def parse_mime(raw: bytes) -> ParsedEmail:
+    """Decode a raw message, looking through forwarding to the original sender.
+
+    Forwards arrive either with the original attached as `message/rfc822` or
+    inlined below a "Forwarded message" header block; in both cases the
+    original sender and subject are what identify the vendor.
+    """
+    # The compat32 policy leaves headers as strings instead of running every
+    # one through the header registry, which dominates parsing time; only the
+    # few headers used below are decoded.
+    message = message_from_bytes(raw)
+
+    for part in message.walk():
+        if part.get_content_type() == "message/rfc822":
+            original = part.get_payload(0)
+            return ParsedEmail(
+                sender=_address(_header(original, "From")),
+                subject=_header(original, "Subject"),
+                text=_body_text(original),
+            )
+
+    text = _body_text(message)
+    sender = _address(_header(message, "From"))
+    subject = _header(message, "Subject")
+    forwarded_from = _FORWARDED_FROM.search(text)
+    if forwarded_from:
+        sender = _address(forwarded_from.group(1))
+        forwarded_subject = _FORWARDED_SUBJECT.search(text, forwarded_from.end())
+        if forwarded_subject:
+            subject = forwarded_subject.group(1).strip()
+    return ParsedEmail(sender=sender, subject=subject, text=text)
@@ -0,0 +1,74 @@
+"""
+Registry of per-vendor extractors that turn booking confirmations into
+itinerary items.
+"""
+
+import logging
+import re
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, ClassVar
+
+from src.parsing.message import ParsedEmail, parse_mime
+
+logger = logging.getLogger(__name__)
+
+EXTRACTORS: list["Extractor"] = []
+
+
+class Extractor(ABC):
+    """Base class for vendor extractors.
+
+    Subclasses set `sender_pattern` (and optionally `subject_pattern`) to
+    precompiled regexes that identify the vendor's mail, and implement
+    `extract` to return itinerary items shaped like `CreateItineraryItemRequest`
+    fields, with `details` following the matching TypedDict in
+    `src/schemas/itinerary_item.py`.
+    """
+
+    name: ClassVar[str]
+    sender_pattern: ClassVar[re.Pattern]
+    subject_pattern: ClassVar[re.Pattern | None] = None
+
+    def matches(self, email: ParsedEmail) -> bool:
+        if not self.sender_pattern.search(email.sender):
+            return False
+        return self.subject_pattern is None or bool(
+            self.subject_pattern.search(email.subject)
+        )
+
+    @abstractmethod
+    def extract(self, email: ParsedEmail) -> list[dict[str, Any]]: ...
+
+
+def register_extractor(cls: type[Extractor]) -> type[Extractor]:
+    """Class decorator adding an extractor to the registry."""
+    EXTRACTORS.append(cls())
+    return cls
+
+
+def parse_datetime(value: str, formats: tuple[str, ...]) -> datetime | None:
+    for fmt in formats:
+        try:
+            return datetime.strptime(value.strip(), fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def extract_itinerary_items(raw_message: bytes) -> list[dict[str, Any]]:
+    """Decode a raw message and run the first extractor that recognises it.
+
+    Runs in parser worker processes, so it takes and returns only picklable
+    values. Returns an empty list for mail no extractor recognises.
+    """
+    # Importing the package registers the bundled extractors.
+    import src.parsing.extractors  # noqa: F401
+
+    email = parse_mime(raw_message)
+    for extractor in EXTRACTORS:
+        if extractor.matches(email):
+            items = extractor.extract(email)
+            logger.debug(f"{extractor.name} extracted {len(items)} items")
+            return items
+    return []
@@ -0,0 +1,123 @@
+"""
+Parser worker: claims pending inbound emails and saves the itinerary items
+extracted from them.
+
+Runs as its own process next to the API and the SMTP server:
+
+    python -m src.parsing.worker
+
+MIME decoding, HTML flattening and pattern matching run on a process pool so
+they use every core and never share an event loop with request handling.
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from dotenv import load_dotenv
+
+from src.database.config import AsyncSessionLocal, async_engine
+from src.database.crud.inbound_email import (
+    claim_inbound_emails,
+    finish_inbound_email,
+)
+from src.database.crud.itinerary_item import upsert_itinerary_items
+from src.database.models import InboundEmailStatus
+from src.parsing.registry import extract_itinerary_items
+
+logger = logging.getLogger(__name__)
+
+PARSER_PROCESSES = int(os.getenv("PARSER_PROCESSES", os.cpu_count() or 1))
+PARSER_BATCH_SIZE = int(os.getenv("PARSER_BATCH_SIZE", 100))
+PARSER_POLL_INTERVAL_SECONDS = float(os.getenv("PARSER_POLL_INTERVAL_SECONDS", 2))
+# Claims older than this are assumed abandoned and handed out again.
+PARSER_CLAIM_TIMEOUT_SECONDS = float(os.getenv("PARSER_CLAIM_TIMEOUT_SECONDS", 300))
+
+
+async def process_batch(pool: ProcessPoolExecutor) -> int:
+    """Parse and save one batch of claimed messages; returns the batch size.
+
+    Raises `BrokenProcessPool` if a parser process died. Messages that had
+    not been parsed by then stay claimed and are handed out again once their
+    claim times out; only errors raised by the extractors mark a message
+    `FAILED`.
+    """
+    async with AsyncSessionLocal() as db:
+        claimed = await claim_inbound_emails(
+            db, PARSER_BATCH_SIZE, PARSER_CLAIM_TIMEOUT_SECONDS
+        )
+        if not claimed:
+            return 0
+
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    pool, extract_itinerary_items, email["raw_message"]
+                )
+                for email in claimed
+            ),
+            return_exceptions=True,
+        )
+
+        broken = False
+        for email, items in zip(claimed, results):
+            if isinstance(items, BrokenProcessPool):
+                broken = True
+                continue
+            try:
+                if isinstance(items, BaseException):
+                    raise items
+                # Upserted so a message forwarded twice, or re-parsed after
+                # its claim timed out, doesn't duplicate items.
+                await upsert_itinerary_items(
+                    db, created_by_user_id=email["user_id"], items=items
+                )
+                await finish_inbound_email(
+                    db, email["inbound_email_id"], InboundEmailStatus.PARSED
+                )
+            except Exception as e:
+                logger.error(
+                    f"Error parsing inbound email {email['inbound_email_id']}: {e}"
+                )
+                await db.rollback()
+                await finish_inbound_email(
+                    db,
+                    email["inbound_email_id"],
+                    InboundEmailStatus.FAILED,
+                    error=str(e),
+                )
+        if broken:
+            raise BrokenProcessPool("A parser process terminated abruptly")
+        return len(claimed)
+
+
+async def run() -> None:
+    pool = ProcessPoolExecutor(PARSER_PROCESSES)
+    logger.info(f"Parsing inbound emails on {PARSER_PROCESSES} processes")
+    try:
+        while True:
+            try:
+                count = await process_batch(pool)
+            except BrokenProcessPool as e:
+                # A dead process (OOM kill, crash in a C extension) breaks the
+                # whole pool; replace it rather than failing every later message.
+                logger.error(f"Parser process pool broke, starting a new one: {e}")
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = ProcessPoolExecutor(PARSER_PROCESSES)
+                continue
+            if count < PARSER_BATCH_SIZE:
+                await asyncio.sleep(PARSER_POLL_INTERVAL_SECONDS)
+    finally:
+        pool.shutdown(cancel_futures=True)
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    load_dotenv()
+    asyncio.run(run())
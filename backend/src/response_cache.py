@@ -0,0 +1,206 @@
+"""
+Response cache for trip-scoped reads, invalidated by the CRUD write paths.
+
+Entries are keyed by `(trip_id, permission_class, variant)`: the trip the
+response describes, the viewer's access role on it, and whatever else shapes
+the body (endpoint and query parameters). Every CRUD function that writes a
+trip, its itinerary items or its participants calls `invalidate_trips` after
+committing, which drops all entries of those trips.
+
+A reader that misses takes a fill token before querying and hands it back
+with the result; the backend refuses the fill if the trip was invalidated in
+between, so a read racing a write can never store the pre-write body.
+
+Each worker process has its own cache, so the write paths also queue the
+invalidation for the other processes with `publish_trip_invalidations`
+before committing; see `src.invalidation`.
+
+The backend is chosen with `RESPONSE_CACHE_BACKEND` (`module:Class`); it is
+constructed with the byte budget and must implement `ResponseCacheBackend`.
+The default keeps entries in process memory.
+"""
+
+import importlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Hashable, Iterable, Protocol
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.invalidation import INVALIDATION_BUS, publish_invalidations
+
+RESPONSE_CACHE_BACKEND = os.getenv(
+    "RESPONSE_CACHE_BACKEND", "src.response_cache:MemoryBackend"
+)
+# Total size of cached bodies and headers; 0 disables caching.
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+CacheKey = tuple[UUID, str, Hashable]
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers.items())
+
+
+class ResponseCacheBackend(Protocol):
+    def get(self, key: CacheKey) -> CachedResponse | None: ...
+
+    def begin_fill(self, trip_id: UUID) -> int:
+        """Token to pass to `fill` for a response about to be read from the database."""
+        ...
+
+    def fill(self, key: CacheKey, value: CachedResponse, token: int) -> bool:
+        """Store `value` unless its trip was invalidated since `token` was taken."""
+        ...
+
+    def invalidate(self, trip_id: UUID) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> dict: ...
+
+
+class MemoryBackend:
+    """In-process LRU bounded by the total size of cached responses."""
+
+    # Trips whose last invalidation is remembered for rejecting stale fills;
+    # older ones are covered conservatively by `_forgotten_before`.
+    INVALIDATION_HISTORY = 10000
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.fills = 0
+        self.stale_fills = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self._bytes = 0
+        self._entries: OrderedDict[CacheKey, CachedResponse] = OrderedDict()
+        self._keys_by_trip: dict[UUID, set[CacheKey]] = {}
+        self._sequence = 0
+        self._invalidated_at: OrderedDict[UUID, int] = OrderedDict()
+        self._forgotten_before = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> CachedResponse | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def begin_fill(self, trip_id: UUID) -> int:
+        with self._lock:
+            return self._sequence
+
+    def fill(self, key: CacheKey, value: CachedResponse, token: int) -> bool:
+        trip_id = key[0]
+        size = value.size
+        with self._lock:
+            last_invalidated = self._invalidated_at.get(trip_id, self._forgotten_before)
+            if last_invalidated > token:
+                self.stale_fills += 1
+                return False
+            if size > self.max_bytes:
+                return False
+            self._remove(key)
+            self._entries[key] = value
+            self._keys_by_trip.setdefault(trip_id, set()).add(key)
+            self._bytes += size
+            self.fills += 1
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            return True
+
+    def invalidate(self, trip_id: UUID) -> None:
+        with self._lock:
+            self._sequence += 1
+            self._invalidated_at[trip_id] = self._sequence
+            self._invalidated_at.move_to_end(trip_id)
+            while len(self._invalidated_at) > self.INVALIDATION_HISTORY:
+                _, sequence = self._invalidated_at.popitem(last=False)
+                self._forgotten_before = max(self._forgotten_before, sequence)
+            for key in list(self._keys_by_trip.get(trip_id, ())):
+                self._remove(key)
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            # Fills already in flight predate the clear and must not land.
+            self._sequence += 1
+            self._forgotten_before = self._sequence
+            self._invalidated_at.clear()
+            self._entries.clear()
+            self._keys_by_trip.clear()
+            self._bytes = 0
+            self.invalidations += 1
+
+    def _remove(self, key: CacheKey) -> None:
+        value = self._entries.pop(key, None)
+        if value is None:
+            return
+        self._bytes -= value.size
+        keys = self._keys_by_trip[key[0]]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_trip[key[0]]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "fills": self.fills,
+                "stale_fills": self.stale_fills,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
+
+
+def _load_backend(path: str) -> ResponseCacheBackend:
+    module_name, _, class_name = path.partition(":")
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    return backend_class(RESPONSE_CACHE_MAX_BYTES)
+
+
+RESPONSE_CACHE: ResponseCacheBackend = _load_backend(RESPONSE_CACHE_BACKEND)
+
+
+INVALIDATION_BUS.register(
+    "trip_responses",
+    lambda trip_id: RESPONSE_CACHE.invalidate(UUID(trip_id)),
+    RESPONSE_CACHE.clear,
+)
+
+
+async def publish_trip_invalidations(
+    db: AsyncSession, trip_ids: Iterable[UUID | None]
+) -> None:
+    """Invalidate `trip_ids` on the other processes once `db` commits; call before committing."""
+    await publish_invalidations(db, "trip_responses", trip_ids)
+
+
+def invalidate_trips(trip_ids: Iterable[UUID | None]) -> None:
+    """Drop cached responses of every trip in `trip_ids`; call after committing a write."""
+    for trip_id in set(trip_ids):
+        if trip_id is not None:
+            RESPONSE_CACHE.invalidate(trip_id)
@@ -0,0 +1,11 @@
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict
+
+
+class InboundEmailAddress(BaseModel):
+    """The address a user forwards booking confirmations to."""
+
+    address: str
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
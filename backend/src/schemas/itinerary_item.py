@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Any, TypedDict, Union
 import uuid
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
 
 from src.database.models import ItineraryItemType
 
@@ -27,7 +27,9 @@ class ItineraryItem(BaseModel):
         "itinerary_item_id", "trip_id", "created_by_user_id", mode="before"
     )
     @classmethod
-    def uuid_to_string(cls, v: Any) -> str:
+    def uuid_to_string(cls, v: Any, info: ValidationInfo) -> str | None:
+        if v is None and info.field_name == "trip_id":
+            return None
         if isinstance(v, uuid.UUID):
             return str(v)
         if not isinstance(v, str):
@@ -135,3 +137,45 @@ class ItineraryItemUpdate(BaseModel):
         if not isinstance(v, str):
             raise ValueError(f"Invalid value {v} for str-like field.")
         return v
+
+
+# Upper bound on items accepted by one bulk create request.
+MAX_BULK_ITINERARY_ITEMS = 500
+
+
+class BulkCreateItineraryItemsRequest(BaseModel):
+    """Schema for creating several itinerary items at once.
+
+    Items are validated one by one against `CreateItineraryItemRequest`, so an
+    invalid item is reported in its result instead of rejecting the batch.
+    """
+
+    items: list[dict[str, Any]] = Field(max_length=MAX_BULK_ITINERARY_ITEMS)
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class BulkItineraryItemResult(BaseModel):
+    """Outcome for the item at `index` of a bulk create request."""
+
+    index: int
+    item: ItineraryItem | None = None
+    error: str | None = None
+
+
+class BulkCreateItineraryItemsResponse(BaseModel):
+    results: list[BulkItineraryItemResult]
+
+
+class IngestItineraryItemResult(BulkItineraryItemResult):
+    """Outcome for the item at `index` of an ingest request.
+
+    `created` is false when the item repeats a booking the user already has;
+    `item` is then the existing item.
+    """
+
+    created: bool = False
+
+
+class IngestItineraryItemsResponse(BaseModel):
+    results: list[IngestItineraryItemResult]
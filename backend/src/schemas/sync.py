@@ -0,0 +1,47 @@
+from datetime import datetime
+import uuid
+from typing import Any
+from pydantic import BaseModel, ConfigDict, field_validator
+
+from src.database.models import TombstoneEntityType
+from src.schemas.itinerary_item import ItineraryItem
+from src.schemas.trip import Trip
+from src.schemas.trip_participant import TripParticipantWithUser
+
+
+class Tombstone(BaseModel):
+    """A trip or itinerary item that left the user's view."""
+
+    entity_type: TombstoneEntityType
+    entity_id: str
+    trip_id: str | None = None
+    deleted_at: datetime
+
+    model_config = ConfigDict(from_attributes=True, extra="forbid")
+
+    @field_validator("entity_id", "trip_id", mode="before")
+    @classmethod
+    def uuid_to_string(cls, v: Any) -> str | None:
+        if v is None:
+            return None
+        if isinstance(v, uuid.UUID):
+            return str(v)
+        if not isinstance(v, str):
+            raise ValueError(f"Invalid value {v} for str-like field.")
+        return v
+
+
+class SyncChanges(BaseModel):
+    """Everything that changed for the user since a sync cursor.
+
+    Rows are current state to upsert by ID; `deleted` lists what to drop.
+    Pass `cursor` as `since` on the next sync; while `has_more` is set,
+    there are more pages to fetch that way.
+    """
+
+    trips: list[Trip]
+    itinerary_items: list[ItineraryItem]
+    participants: list[TripParticipantWithUser]
+    deleted: list[Tombstone]
+    cursor: str
+    has_more: bool
@@ -3,6 +3,8 @@ import uuid
 from typing import Any
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from src.schemas.itinerary_item import ItineraryItem
+
 
 class Trip(BaseModel):
     trip_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -49,7 +51,7 @@ class TripDetails(BaseModel):
     updated_at: datetime
     
     # Include itinerary items
-    itinerary_items: list[dict] = []
+    itinerary_items: list[ItineraryItem] = []
 
     model_config = ConfigDict(from_attributes=True, extra="forbid")
 
@@ -1,7 +1,8 @@
 from datetime import datetime
+from enum import StrEnum
 import uuid
 from typing import Any
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from src.database.models import ParticipantStatus
 
@@ -58,6 +59,33 @@ class InviteUserRequest(BaseModel):
     email: str
 
 
+# Upper bound on emails accepted by one batch invite request.
+MAX_BATCH_INVITATIONS = 500
+
+
+class BatchInviteUsersRequest(BaseModel):
+    emails: list[str] = Field(min_length=1, max_length=MAX_BATCH_INVITATIONS)
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class InvitationOutcome(StrEnum):
+    INVITED = "invited"
+    ALREADY_PARTICIPANT = "already_participant"
+    USER_NOT_FOUND = "user_not_found"
+
+
+class BatchInvitationResult(BaseModel):
+    """Outcome for one email of a batch invite request."""
+
+    email: str
+    outcome: InvitationOutcome
+
+
+class BatchInviteUsersResponse(BaseModel):
+    results: list[BatchInvitationResult]
+
+
 class RespondToInvitationRequest(BaseModel):
     response: ParticipantStatus
 
@@ -84,3 +112,10 @@ class TripParticipantWithUser(BaseModel):
         if not isinstance(v, str):
             raise ValueError(f"Invalid value {v} for str-like field.")
         return v
+
+
+class TripParticipantCounts(BaseModel):
+    """Participants of a trip per status; statuses nobody is in are left out."""
+
+    counts: dict[ParticipantStatus, int]
+    total: int
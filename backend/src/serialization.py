@@ -0,0 +1,63 @@
+"""
+Fast-path JSON serialization for rows read from the database.
+
+Response models validate their input, and FastAPI validates and encodes a
+returned model again against `response_model`. Rows straight from our own
+queries are already well-typed, so list and detail endpoints instead encode
+them in one pass with a precompiled `TypeAdapter` over a TypedDict mirroring
+the response model, and return the bytes directly. `response_model` stays on
+the route for the OpenAPI schema.
+"""
+
+import uuid
+from functools import lru_cache
+from typing import Any, Mapping, TypedDict, Union, get_args
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+def _row_annotation(name: str, annotation: Any) -> Any:
+    # ID columns come back as UUIDs; the models convert them to strings with a
+    # validator, which serialization can do directly.
+    if name.endswith("_id") and str in (annotation, *get_args(annotation)):
+        return Union[uuid.UUID, annotation]
+    return annotation
+
+
+def row_type(model: type[BaseModel], **overrides: Any) -> type:
+    """TypedDict with `model`'s fields, for serializing rows shaped like it.
+
+    `overrides` replaces the annotation of the named fields, e.g. to give a
+    nested list of rows its own row type.
+    """
+    fields = {
+        name: overrides.get(name, _row_annotation(name, field.annotation))
+        for name, field in model.model_fields.items()
+    }
+    return TypedDict(f"{model.__name__}Row", fields, total=False)
+
+
+@lru_cache
+def row_adapter(model: type[BaseModel], **overrides: Any) -> TypeAdapter:
+    """Precompiled serializer for one row shaped like `model`."""
+    return TypeAdapter(row_type(model, **overrides))
+
+
+@lru_cache
+def rows_adapter(model: type[BaseModel], **overrides: Any) -> TypeAdapter:
+    """Precompiled serializer for a list of rows shaped like `model`."""
+    return TypeAdapter(list[row_type(model, **overrides)])
+
+
+def json_response(
+    adapter: TypeAdapter,
+    content: Any,
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    """Encode trusted `content` with `adapter` into a JSON response, skipping validation."""
+    return Response(
+        content=adapter.dump_json(content),
+        media_type="application/json",
+        headers=headers,
+    )
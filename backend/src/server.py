@@ -2,12 +2,23 @@ import os
 import uvicorn
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from dotenv import load_dotenv
 import logging
 
-from src.api.v1 import signin, trip, itinerary_item
+from src.api.v1 import signin, trip, itinerary_item, inbound_email, sync, events
+from src.auth import TOKEN_CACHE
+from src.database.config import get_pool_stats
+from src.database.crud.user import USER_CACHE
+from src.database.listener import LISTENER
+from src.events import EVENT_HUB
+from src.invalidation import INVALIDATION_BUS
+from src.response_cache import RESPONSE_CACHE
+from src.firebase import get_firebase_project_id
+from src.firebase_keys import KEY_RING
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -15,9 +26,26 @@ logging.basicConfig(
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    try:
+        project_id = get_firebase_project_id()
+    except Exception as e:
+        logger.error(f"Failed to determine Firebase project ID: {e}")
+        project_id = None
+    if project_id:
+        await KEY_RING.start(project_id)
+    else:
+        logger.warning(
+            "No Firebase project ID configured; verifying tokens through firebase_admin"
+        )
+    await LISTENER.start()
     yield
+    await LISTENER.stop()
+    await KEY_RING.stop()
 
 app = FastAPI(title="Trips", lifespan=lifespan)
 
@@ -28,16 +56,44 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Prev-Cursor"],
 )
 
 app.include_router(signin.router, tags=["auth"])
 app.include_router(trip.router, prefix="/api/v1", tags=["trip"])
 app.include_router(itinerary_item.router, prefix="/api/v1", tags=["itinerary"])
+app.include_router(inbound_email.router, prefix="/api/v1", tags=["inbound-email"])
+app.include_router(sync.router, prefix="/api/v1", tags=["sync"])
+app.include_router(events.router, prefix="/api/v1", tags=["events"])
+
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    logger.warning(f"Timed out waiting for a database connection: {exc}")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "The service is busy, please retry shortly"},
+        headers={"Retry-After": os.getenv("DB_RETRY_AFTER_SECONDS", "1")},
+    )
+
 
 @app.get("/healthz")
 async def health_check():
     return {"status": "ok"}
 
+
+@app.get("/metrics")
+async def metrics():
+    return {
+        "db_pool": get_pool_stats(),
+        "token_cache": TOKEN_CACHE.stats(),
+        "user_cache": USER_CACHE.stats(),
+        "response_cache": RESPONSE_CACHE.stats(),
+        "listener": LISTENER.stats(),
+        "events": EVENT_HUB.stats(),
+        "invalidations": INVALIDATION_BUS.stats(),
+    }
+
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
     uvicorn.run(app, host="0.0.0.0", port=port)
@@ -0,0 +1,133 @@
+"""
+SMTP server that accepts forwarded booking emails into the inbox table.
+
+Runs as its own process next to the API:
+
+    python -m src.smtp_server
+
+Recipients are checked against `inbound_email_addresses` while the envelope
+is received, and each accepted message is stored raw as a pending
+`inbound_emails` row before it is acknowledged. Parsing happens later, off
+the SMTP path.
+"""
+
+import asyncio
+import logging
+import os
+from uuid import UUID
+
+from aiosmtpd.smtp import SMTP, Envelope, Session
+from dotenv import load_dotenv
+
+from src.cache import TTLCache
+from src.database.config import AsyncSessionLocal, async_engine
+from src.database.crud.inbound_email import (
+    INBOUND_EMAIL_DOMAIN,
+    get_user_id_for_inbound_address,
+    store_inbound_emails,
+)
+
+logger = logging.getLogger(__name__)
+
+SMTP_HOST = os.getenv("SMTP_HOST", "0.0.0.0")
+SMTP_PORT = int(os.getenv("SMTP_PORT", 8025))
+SMTP_MAX_MESSAGE_BYTES = int(os.getenv("SMTP_MAX_MESSAGE_BYTES", 10 * 1024 * 1024))
+
+# Known recipient -> user_id; addresses never change owner, so entries only
+# expire to bound memory and pick up deleted addresses eventually.
+RECIPIENT_CACHE = TTLCache(maxsize=10000, ttl=300)
+
+
+class InboundEmailHandler:
+    """aiosmtpd handler that routes messages to per-user inboxes."""
+
+    async def resolve_recipient(self, address: str) -> UUID | None:
+        local_part, _, domain = address.rpartition("@")
+        if not local_part or domain.lower() != INBOUND_EMAIL_DOMAIN:
+            return None
+        local_part = local_part.lower()
+
+        user_id = RECIPIENT_CACHE.get(local_part)
+        if user_id is None:
+            async with AsyncSessionLocal() as db:
+                user_id = await get_user_id_for_inbound_address(db, local_part)
+            if user_id is not None:
+                RECIPIENT_CACHE.set(local_part, user_id)
+        return user_id
+
+    async def handle_RCPT(
+        self,
+        server: SMTP,
+        session: Session,
+        envelope: Envelope,
+        address: str,
+        rcpt_options: list[str],
+    ) -> str:
+        try:
+            user_id = await self.resolve_recipient(address)
+        except Exception as e:
+            logger.error(f"Error resolving recipient {address}: {e}")
+            return "451 4.3.0 Temporary lookup failure"
+        if user_id is None:
+            return "550 5.1.1 Recipient address rejected"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(
+        self, server: SMTP, session: Session, envelope: Envelope
+    ) -> str:
+        try:
+            messages = []
+            user_ids = set()
+            for recipient in envelope.rcpt_tos:
+                user_id = await self.resolve_recipient(recipient)
+                # Each inbox gets the message once, however it was addressed
+                # (the same address twice, or in different case).
+                if user_id is None or user_id in user_ids:
+                    continue
+                user_ids.add(user_id)
+                messages.append(
+                    {
+                        "user_id": user_id,
+                        "recipient": recipient,
+                        "mail_from": envelope.mail_from,
+                        "raw_message": envelope.original_content,
+                    }
+                )
+            async with AsyncSessionLocal() as db:
+                await store_inbound_emails(db, messages)
+        except Exception as e:
+            # A 4xx reply makes the sending server retry later.
+            logger.error(f"Error storing inbound email from {envelope.mail_from}: {e}")
+            return "451 4.3.0 Temporary failure, try again later"
+        return "250 Message accepted for delivery"
+
+
+async def serve(host: str = SMTP_HOST, port: int = SMTP_PORT) -> None:
+    handler = InboundEmailHandler()
+    loop = asyncio.get_running_loop()
+    server = await loop.create_server(
+        lambda: SMTP(
+            handler,
+            data_size_limit=SMTP_MAX_MESSAGE_BYTES,
+            enable_SMTPUTF8=True,
+        ),
+        host=host,
+        port=port,
+    )
+    logger.info(f"Accepting mail for @{INBOUND_EMAIL_DOMAIN} on {host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    # aiosmtpd logs every SMTP command at INFO.
+    logging.getLogger("mail.log").setLevel(logging.WARNING)
+    load_dotenv()
+    asyncio.run(serve())
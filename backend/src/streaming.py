@@ -0,0 +1,77 @@
+"""
+Streamed JSON responses for listings too large to build in memory.
+
+Rows come from a server-side cursor and are encoded one at a time into a JSON
+array, or into newline-delimited JSON when the client asks for
+`application/x-ndjson`, so memory per request stays flat regardless of the
+number of rows.
+"""
+
+import logging
+from typing import Any, AsyncIterator, Callable
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from src.database.config import AsyncSessionLocal
+from src.serialization import row_adapter
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Encoded rows are flushed to the client in chunks of roughly this many bytes.
+CHUNK_SIZE = 64 * 1024
+
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def rows_from_new_session(
+    stream_rows: Callable[..., AsyncIterator[dict]], **kwargs: Any
+) -> AsyncIterator[dict]:
+    """Run a CRUD streaming function on a session owned by the response body.
+
+    The request's own session is closed before a streaming body is sent.
+    """
+    async with AsyncSessionLocal() as db:
+        async for row in stream_rows(db, **kwargs):
+            yield row
+
+
+async def _encode(
+    rows: AsyncIterator[dict], model: type[BaseModel], ndjson: bool
+) -> AsyncIterator[bytes]:
+    adapter = row_adapter(model)
+    opening, separator, closing = (b"", b"\n", b"\n") if ndjson else (b"[", b",", b"]")
+    buffer = bytearray(opening)
+    first = True
+    try:
+        async for row in rows:
+            if not first:
+                buffer += separator
+            first = False
+            buffer += adapter.dump_json(row)
+            if len(buffer) >= CHUNK_SIZE:
+                yield bytes(buffer)
+                buffer.clear()
+    except Exception:
+        # Headers are already sent, so the only signal left is a truncated body.
+        logger.exception("Error while streaming response")
+        raise
+    if not ndjson or not first:
+        buffer += closing
+    yield bytes(buffer)
+
+
+def streaming_response(
+    request: Request, rows: AsyncIterator[dict], model: type[BaseModel]
+) -> StreamingResponse:
+    """Stream `rows` shaped like `model`, as NDJSON if the client accepts it or a JSON array otherwise."""
+    ndjson = wants_ndjson(request)
+    return StreamingResponse(
+        _encode(rows, model, ndjson),
+        media_type=NDJSON_MEDIA_TYPE if ndjson else "application/json",
+    )
@@ -0,0 +1,248 @@
+"""
+The hot CRUD calls behind the API endpoints, for the statement count and
+query plan tests.
+
+Each call runs against `Subjects` picked from the load test population:
+someone who owns two trips, an item of theirs, and an outsider who can see
+neither trip.
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterator
+from uuid import UUID, uuid4
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from benchmarks.loadtest.seed import SeededUser
+from src.database.crud.itinerary_item import (
+    create_itinerary_item,
+    delete_itinerary_item,
+    get_itinerary_item_by_id,
+    get_itinerary_items_for_user,
+    update_itinerary_item,
+)
+from src.database.crud.trip import (
+    get_trip_access_role,
+    get_trip_by_id,
+    get_trip_details_json,
+    get_trip_details_version,
+    get_trips_for_user,
+    get_trips_version,
+    update_trip,
+)
+from src.database.crud.trip_participant import (
+    get_trip_participant_counts,
+    get_trip_participants,
+    get_trip_participants_version,
+    get_user_invitations,
+    invite_users_to_trip,
+)
+from src.database.models import ItineraryItemType
+
+# A write that changed something also sends one NOTIFY for its change events
+# and one for the trips whose cached responses it invalidates.
+WRITE = 3
+
+
+@dataclass
+class Subjects:
+    owner_id: UUID
+    outsider_id: UUID
+    trip_id: UUID
+    other_trip_id: UUID
+    item_id: UUID | None = None
+
+
+@dataclass
+class Operation:
+    name: str
+    statements: int
+    call: Callable[[AsyncSession, Subjects], Awaitable]
+
+
+async def create_item(db: AsyncSession, s: Subjects) -> dict:
+    return await create_itinerary_item(
+        db,
+        created_by_user_id=s.owner_id,
+        type=ItineraryItemType.ACTIVITY,
+        trip_id=s.trip_id,
+        notes="Created by the CRUD call tests",
+        details={"description": "CRUD call activity"},
+    )
+
+
+OPERATIONS = [
+    Operation("create_itinerary_item", WRITE, create_item),
+    Operation(
+        "get_trip_by_id",
+        1,
+        lambda db, s: get_trip_by_id(db, s.trip_id, s.owner_id),
+    ),
+    Operation(
+        "get_trip_by_id, no access",
+        1,
+        lambda db, s: get_trip_by_id(db, s.trip_id, s.outsider_id),
+    ),
+    Operation(
+        "get_trip_details_json",
+        1,
+        lambda db, s: get_trip_details_json(db, s.trip_id, s.owner_id),
+    ),
+    Operation(
+        "get_trip_details_json, no access",
+        1,
+        lambda db, s: get_trip_details_json(db, s.trip_id, s.outsider_id),
+    ),
+    Operation(
+        "get_trip_details_version",
+        1,
+        lambda db, s: get_trip_details_version(db, s.trip_id, s.owner_id),
+    ),
+    Operation(
+        "get_trip_access_role",
+        1,
+        lambda db, s: get_trip_access_role(db, s.trip_id, s.owner_id),
+    ),
+    Operation(
+        "get_trips_for_user",
+        1,
+        lambda db, s: get_trips_for_user(db, s.owner_id, future_only=False),
+    ),
+    Operation(
+        "get_trips_version",
+        1,
+        lambda db, s: get_trips_version(db, s.owner_id, future_only=False),
+    ),
+    Operation(
+        "get_itinerary_items_for_user, by trip",
+        1,
+        lambda db, s: get_itinerary_items_for_user(db, s.owner_id, trip_id=s.trip_id),
+    ),
+    Operation(
+        "get_itinerary_item_by_id",
+        1,
+        lambda db, s: get_itinerary_item_by_id(db, s.item_id, s.owner_id),
+    ),
+    Operation(
+        "get_itinerary_item_by_id, no access",
+        1,
+        lambda db, s: get_itinerary_item_by_id(db, s.item_id, s.outsider_id),
+    ),
+    Operation(
+        "get_trip_participants",
+        1,
+        lambda db, s: get_trip_participants(db, s.trip_id, s.owner_id),
+    ),
+    Operation(
+        "get_trip_participants, no access",
+        1,
+        lambda db, s: get_trip_participants(db, s.trip_id, s.outsider_id),
+    ),
+    Operation(
+        "get_trip_participant_counts",
+        1,
+        lambda db, s: get_trip_participant_counts(db, s.trip_id, s.owner_id),
+    ),
+    Operation(
+        "get_trip_participants_version",
+        1,
+        lambda db, s: get_trip_participants_version(db, s.trip_id, s.owner_id),
+    ),
+    Operation(
+        "get_user_invitations",
+        1,
+        lambda db, s: get_user_invitations(db, s.outsider_id),
+    ),
+    Operation(
+        "update_trip",
+        WRITE,
+        lambda db, s: update_trip(
+            db, s.trip_id, s.owner_id, description=f"Updated {uuid4().hex}"
+        ),
+    ),
+    Operation(
+        "update_trip, no access",
+        1,
+        lambda db, s: update_trip(db, s.trip_id, s.outsider_id, name="Not allowed"),
+    ),
+    Operation(
+        "update_itinerary_item",
+        WRITE,
+        lambda db, s: update_itinerary_item(db, s.item_id, s.owner_id, notes="Updated"),
+    ),
+    Operation(
+        "update_itinerary_item, move to another trip",
+        WRITE,
+        lambda db, s: update_itinerary_item(
+            db, s.item_id, s.owner_id, trip_id=s.other_trip_id
+        ),
+    ),
+    Operation(
+        "update_itinerary_item, move without access",
+        1,
+        lambda db, s: update_itinerary_item(
+            db, s.item_id, s.outsider_id, trip_id=s.trip_id
+        ),
+    ),
+    Operation(
+        "update_itinerary_item, no access",
+        1,
+        lambda db, s: update_itinerary_item(db, s.item_id, s.outsider_id, notes="No"),
+    ),
+    Operation(
+        "invite_users_to_trip, unknown emails",
+        1,
+        lambda db, s: invite_users_to_trip(
+            db,
+            s.trip_id,
+            [f"nobody-{uuid4().hex}@example.com" for _ in range(10)],
+            s.owner_id,
+        ),
+    ),
+    Operation(
+        "delete_itinerary_item, no access",
+        1,
+        lambda db, s: delete_itinerary_item(db, s.item_id, s.outsider_id),
+    ),
+    Operation(
+        "delete_itinerary_item",
+        WRITE,
+        lambda db, s: delete_itinerary_item(db, s.item_id, s.owner_id),
+    ),
+]
+
+
+def pick_subjects(population: list[SeededUser]) -> Subjects:
+    """The first seeded user with two trips, and someone who sees neither."""
+    owner = next(user for user in population if len(user.own_trips) >= 2)
+    trip_id, other_trip_id = (trip["trip_id"] for trip in owner.own_trips[:2])
+    outsider = next(
+        user
+        for user in population
+        if user is not owner
+        and trip_id not in user.trip_ids
+        and other_trip_id not in user.trip_ids
+    )
+    return Subjects(
+        owner_id=owner.user_id,
+        outsider_id=outsider.user_id,
+        trip_id=trip_id,
+        other_trip_id=other_trip_id,
+    )
+
+
+@contextmanager
+def recorded_statements(engine: AsyncEngine) -> Iterator[list[tuple[str, Any]]]:
+    """Collect `(statement, parameters)` for everything sent through `engine` meanwhile."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from src.database.crud import inbound_email
+from src.database.crud.inbound_email import (
+    claim_inbound_emails,
+    finish_inbound_email,
+    store_inbound_emails,
+)
+from src.database.models import InboundEmailStatus, inbound_emails
+
+CLAIM_TIMEOUT_SECONDS = 60
+
+
+class _ClockAnHourAhead(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return super().now(tz) + timedelta(hours=1)
+
+
+async def _claim(db, ids: list, timeout: float = CLAIM_TIMEOUT_SECONDS) -> set:
+    # Other tests' messages may be claimable too; only ours matter here.
+    claimed = await claim_inbound_emails(db, limit=1000, claim_timeout_seconds=timeout)
+    return {row["inbound_email_id"] for row in claimed} & set(ids)
+
+
+@pytest.fixture
+async def stored(db, make_user):
+    user_id = (await make_user())["user_id"]
+    return await store_inbound_emails(
+        db,
+        [
+            {
+                "user_id": user_id,
+                "recipient": "u-test@localhost",
+                "mail_from": "bookings@example.com",
+                "raw_message": f"Subject: Booking {n}\r\n\r\nConfirmed.".encode(),
+            }
+            for n in range(2)
+        ],
+    )
+
+
+async def test_claims_are_timed_by_the_database_clock(db, stored, monkeypatch):
+    # A worker whose clock runs ahead must not take over a live claim.
+    monkeypatch.setattr(inbound_email, "datetime", _ClockAnHourAhead, raising=False)
+    assert await _claim(db, stored) == set(stored)
+    assert await _claim(db, stored) == set()
+
+    claimed_at = await db.scalar(
+        select(func.max(inbound_emails.c.claimed_at)).where(
+            inbound_emails.c.inbound_email_id.in_(stored)
+        )
+    )
+    assert claimed_at <= await db.scalar(select(func.now()))
+    await db.commit()
+
+
+async def test_stale_claims_are_reclaimed(db, stored):
+    assert await _claim(db, stored) == set(stored)
+
+    assert await _claim(db, stored, timeout=0) == set(stored)
+
+
+async def test_finish_records_the_outcome(db, stored):
+    await _claim(db, stored)
+
+    await finish_inbound_email(
+        db, stored[0], InboundEmailStatus.FAILED, error="Unparsable"
+    )
+
+    stmt = select(inbound_emails).where(inbound_emails.c.inbound_email_id == stored[0])
+    row = (await db.execute(stmt)).one()
+    assert row.status == InboundEmailStatus.FAILED and row.error == "Unparsable"
+    assert row.claimed_at <= row.processed_at
+    assert await _claim(db, stored, timeout=0) == {stored[1]}
@@ -0,0 +1,143 @@
+"""
+`FirebaseKeyRing` against a stand-in JWKS endpoint: which tokens it accepts,
+how it follows key rotation, and how often unknown key IDs refresh the keys.
+"""
+
+import asyncio
+import time
+from typing import Callable
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from benchmarks.loadtest.issuer import LocalIssuer
+from src.firebase_keys import FirebaseKeyRing, InvalidTokenError
+
+UNKNOWN_KID_REFRESH_INTERVAL_SECONDS = 1.0
+
+EMAIL = "key-ring@example.com"
+
+
+def _accepts(ring: FirebaseKeyRing, token: str) -> bool:
+    try:
+        ring.verify(token)
+    except InvalidTokenError:
+        return False
+    return True
+
+
+def _resigned(token: str, key, algorithm: str = "RS256") -> str:
+    """`token`'s header and claims signed again with `key`."""
+    header = jwt.get_unverified_header(token)
+    claims = jwt.decode(token, options={"verify_signature": False})
+    return jwt.encode(claims, key, algorithm=algorithm, headers={"kid": header["kid"]})
+
+
+async def _wait_for(condition: Callable[[], bool], timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.05)
+    return True
+
+
+@pytest.fixture
+def key_issuer():
+    """An issuer of its own, so rotating its keys leaves the app's alone."""
+    issuer = LocalIssuer()
+    issuer.start()
+    yield issuer
+    issuer.stop()
+
+
+@pytest.fixture
+async def ring(key_issuer):
+    ring = FirebaseKeyRing(
+        jwks_url=key_issuer.jwks_url,
+        unknown_kid_refresh_interval_seconds=UNKNOWN_KID_REFRESH_INTERVAL_SECONDS,
+    )
+    await ring.start(key_issuer.project_id)
+    yield ring
+    await ring.stop()
+
+
+def test_accepts_the_issuers_token(key_issuer, ring):
+    claims = ring.verify(key_issuer.mint("uid-1", EMAIL))
+
+    assert claims["uid"] == "uid-1"
+
+
+def test_rejects_an_expired_token(key_issuer, ring):
+    assert not _accepts(ring, key_issuer.mint("uid-1", EMAIL, lifetime_seconds=-60))
+
+
+def test_rejects_a_token_signed_with_another_key_under_a_known_kid(key_issuer, ring):
+    attacker_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    token = _resigned(key_issuer.mint("uid-1", EMAIL), attacker_key)
+
+    assert not _accepts(ring, token)
+
+
+def test_rejects_a_token_whose_claims_were_altered(key_issuer, ring):
+    header, payload, signature = key_issuer.mint("uid-1", EMAIL).split(".")
+    tampered = jwt.utils.base64url_encode(
+        jwt.utils.base64url_decode(payload).replace(b"uid-1", b"uid-2")
+    ).decode()
+
+    assert not _accepts(ring, f"{header}.{tampered}.{signature}")
+
+
+def test_rejects_an_unsigned_token(key_issuer, ring):
+    token = key_issuer.mint("uid-1", EMAIL)
+    unsigned = jwt.encode(
+        jwt.decode(token, options={"verify_signature": False}),
+        None,
+        algorithm="none",
+        headers={"kid": key_issuer.kid},
+    )
+
+    assert not _accepts(ring, unsigned)
+
+
+def test_rejects_another_projects_token(ring):
+    foreign = LocalIssuer(project_id="another-project")
+
+    assert not _accepts(ring, foreign.mint("uid-1", EMAIL))
+
+
+async def test_unknown_kids_refresh_once_per_interval(key_issuer, ring):
+    foreign_token = LocalIssuer(project_id="another-project").mint("uid-1", EMAIL)
+    await asyncio.sleep(UNKNOWN_KID_REFRESH_INTERVAL_SECONDS)
+    fetches = key_issuer.fetches
+
+    # A burst of unknown kids spread over half an interval.
+    for _ in range(100):
+        _accepts(ring, foreign_token)
+        await asyncio.sleep(UNKNOWN_KID_REFRESH_INTERVAL_SECONDS / 200)
+
+    assert key_issuer.fetches - fetches == 1
+
+
+async def test_follows_a_key_rotation(key_issuer, ring):
+    previous = key_issuer.mint("uid-1", EMAIL)
+    await asyncio.sleep(UNKNOWN_KID_REFRESH_INTERVAL_SECONDS)
+
+    # The new key is published alongside the old one.
+    key_issuer.rotate()
+    rotated = key_issuer.mint("uid-1", EMAIL)
+    _accepts(ring, rotated)
+
+    assert await _wait_for(lambda: _accepts(ring, rotated))
+    assert _accepts(ring, previous)
+
+
+async def test_drops_a_key_the_issuer_stopped_publishing(key_issuer, ring):
+    retired = key_issuer.mint("uid-1", EMAIL)
+    await asyncio.sleep(UNKNOWN_KID_REFRESH_INTERVAL_SECONDS)
+
+    key_issuer.rotate(keep_previous=False)
+    _accepts(ring, key_issuer.mint("uid-1", EMAIL))
+
+    assert await _wait_for(lambda: not _accepts(ring, retired))
@@ -0,0 +1,55 @@
+"""
+The hot CRUD statements must not fall back to sequential scans.
+
+Each call runs against the seeded population and every statement it sends
+is EXPLAINed with its actual parameters. trips, trip_participants,
+itinerary_items and trip_access grow with every user, and each hot query
+has an index to use on them.
+"""
+
+import re
+
+import pytest
+from sqlalchemy import func, select
+
+from src.database.config import AsyncSessionLocal
+from src.database.crud.sync import get_changes_since
+from src.database.pagination import NEXT, encode_cursor
+from tests.crud_calls import OPERATIONS, recorded_statements
+
+GUARDED_TABLES = ("trips", "trip_participants", "itinerary_items", "trip_access")
+
+_SEQ_SCAN = re.compile(rf"Seq Scan on ({'|'.join(GUARDED_TABLES)})\b")
+
+
+async def _delta_sync(db, s):
+    # As a client that synced a moment ago
+    since = (await db.execute(select(func.now()))).scalar_one()
+    return await get_changes_since(db, s.owner_id, encode_cursor(NEXT, [since]))
+
+
+CALLS = [(operation.name, operation.call) for operation in OPERATIONS] + [
+    ("get_changes_since, full sync", lambda db, s: get_changes_since(db, s.owner_id, None)),
+    ("get_changes_since, delta", _delta_sync),
+]
+
+
+@pytest.mark.parametrize("call", [call for _, call in CALLS], ids=[name for name, _ in CALLS])
+async def test_no_sequential_scans(engine, subjects, call):
+    async with AsyncSessionLocal() as db:
+        with recorded_statements(engine) as statements:
+            await call(db, subjects)
+
+    plans = []
+    async with engine.connect() as conn:
+        for statement, parameters in statements:
+            # NOTIFYs read no tables.
+            if "pg_notify" in statement:
+                continue
+            result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+            plans.append((statement, "\n".join(row[0] for row in result)))
+        await conn.rollback()
+
+    assert plans
+    for statement, plan in plans:
+        assert not _SEQ_SCAN.search(plan), f"{statement}\n{plan}"
@@ -0,0 +1,64 @@
+import asyncio
+from uuid import uuid4
+
+from sqlalchemy import func, select, text
+
+from src.database.config import AsyncSessionLocal
+from src.database.crud.user import get_or_create_user
+from src.database.models import users
+
+CONCURRENCY = 20
+
+PROFILE = {"password_hash": "", "given_name": "Signin", "family_name": "Race"}
+
+
+def _email() -> str:
+    return f"signin-{uuid4().hex}@example.com"
+
+
+async def _get_or_create(email: str) -> tuple[dict, bool]:
+    async with AsyncSessionLocal() as db:
+        return await get_or_create_user(db, email=email, **PROFILE)
+
+
+async def _row_count(db, email: str) -> int:
+    return await db.scalar(select(func.count()).where(users.c.email == email))
+
+
+async def test_parallel_first_signins_create_one_user(client, issuer, db):
+    email = _email()
+    token = issuer.mint(uuid4().hex, email, "Signin", "Race")
+
+    responses = await asyncio.gather(
+        *(
+            client.post("/signin", headers={"Authorization": f"Bearer {token}"})
+            for _ in range(CONCURRENCY)
+        )
+    )
+
+    assert [response.status_code for response in responses] == [200] * CONCURRENCY
+    assert await _row_count(db, email) == 1
+
+
+async def test_racing_upserts_agree_on_the_created_user(engine, db):
+    email = _email()
+
+    results = await asyncio.gather(*(_get_or_create(email) for _ in range(CONCURRENCY)))
+
+    assert sum(created for _, created in results) == 1
+    assert len({user["user_id"] for user, _ in results}) == 1
+    assert await _row_count(db, email) == 1
+
+
+async def test_existing_user_is_returned_without_a_write(engine, db):
+    email = _email()
+    created_user, created = await _get_or_create(email)
+    xmin = select(text("xmin")).select_from(users).where(users.c.email == email)
+    version = await db.scalar(xmin)
+    await db.commit()
+
+    user, created_again = await _get_or_create(email)
+
+    assert created and not created_again
+    assert user == created_user
+    assert await db.scalar(xmin) == version
@@ -0,0 +1,19 @@
+"""
+Reads, access check included, take one statement whether or not the user
+may see the row. Writes take one statement for the change, plus the
+NOTIFYs that publish its events and cache invalidations.
+"""
+
+import pytest
+
+from src.database.config import AsyncSessionLocal
+from tests.crud_calls import OPERATIONS, recorded_statements
+
+
+@pytest.mark.parametrize("operation", OPERATIONS, ids=lambda operation: operation.name)
+async def test_statement_count(engine, subjects, operation):
+    async with AsyncSessionLocal() as db:
+        with recorded_statements(engine) as statements:
+            await operation.call(db, subjects)
+
+    assert len(statements) == operation.statements, [s for s, _ in statements]
@@ -0,0 +1,95 @@
+import pytest
+
+from src.database.config import AsyncSessionLocal
+from src.database.crud import sync
+from src.database.crud.itinerary_item import (
+    create_itinerary_item,
+    delete_itinerary_item,
+    update_itinerary_item,
+)
+from src.database.crud.sync import get_changes_since
+from src.database.crud.trip import create_trip, update_trip
+from src.database.models import ItineraryItemType
+
+SECTIONS = ("trips", "itinerary_items", "participants", "deleted")
+
+
+async def _sync(user_id, cursor, limit) -> dict:
+    # Each request syncs in its own transaction.
+    async with AsyncSessionLocal() as db:
+        return await get_changes_since(db, user_id, cursor, limit=limit)
+
+
+async def _pages(user_id, cursor, limit) -> list[dict]:
+    pages = [await _sync(user_id, cursor, limit)]
+    while pages[-1]["has_more"]:
+        pages.append(await _sync(user_id, pages[-1]["cursor"], limit))
+    return pages
+
+
+def _ids(pages: list[dict], section: str, key: str) -> list:
+    return [row[key] for page in pages for row in page[section]]
+
+
+@pytest.fixture
+async def trip_with_items(db, make_user):
+    user = await make_user()
+    trip = await create_trip(db, name="Sync", created_by_user_id=user["user_id"])
+    items = [
+        await create_itinerary_item(
+            db,
+            created_by_user_id=user["user_id"],
+            type=ItineraryItemType.ACTIVITY,
+            trip_id=trip["trip_id"],
+            notes=f"Item {n}",
+        )
+        for n in range(6)
+    ]
+    return user, trip, items
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 100])
+async def test_full_sync_pages_hold_everything_once(db, trip_with_items, limit):
+    user, trip, items = trip_with_items
+
+    pages = await _pages(user["user_id"], None, limit)
+
+    assert all(sum(len(page[s]) for s in SECTIONS) <= limit for page in pages)
+    assert [page["has_more"] for page in pages] == [True] * (len(pages) - 1) + [False]
+    assert _ids(pages, "trips", "trip_id") == [trip["trip_id"]]
+    assert sorted(_ids(pages, "itinerary_items", "itinerary_item_id")) == sorted(
+        item["itinerary_item_id"] for item in items
+    )
+    assert _ids(pages, "deleted", "entity_id") == []
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 100])
+async def test_delta_sync_pages_hold_every_change_once(
+    db, trip_with_items, monkeypatch, limit
+):
+    monkeypatch.setattr(sync, "SYNC_CURSOR_OVERLAP_SECONDS", 0)
+    user, trip, items = trip_with_items
+    user_id = user["user_id"]
+    cursor = (await _pages(user_id, None, 100))[-1]["cursor"]
+    await update_trip(db, trip["trip_id"], user_id, description="Changed")
+    for item in items[:3]:
+        await update_itinerary_item(db, item["itinerary_item_id"], user_id, notes="Changed")
+    for item in items[3:5]:
+        await delete_itinerary_item(db, item["itinerary_item_id"], user_id)
+
+    pages = await _pages(user_id, cursor, limit)
+
+    assert len(pages) == -(-6 // limit)
+    assert all(sum(len(page[s]) for s in SECTIONS) <= limit for page in pages)
+    assert [page["has_more"] for page in pages] == [True] * (len(pages) - 1) + [False]
+    assert _ids(pages, "trips", "trip_id") == [trip["trip_id"]]
+    assert sorted(_ids(pages, "itinerary_items", "itinerary_item_id")) == sorted(
+        item["itinerary_item_id"] for item in items[:3]
+    )
+    assert sorted(_ids(pages, "deleted", "entity_id")) == sorted(
+        item["itinerary_item_id"] for item in items[3:5]
+    )
+    # The last page's cursor is a delta cursor past these changes.
+    after = await _sync(user_id, pages[-1]["cursor"], limit)
+    assert not after["has_more"]
+    assert all(after[s] == [] for s in SECTIONS)
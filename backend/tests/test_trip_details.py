@@ -0,0 +1,51 @@
+import json
+from datetime import datetime, timezone
+
+from src.database.crud.itinerary_item import (
+    create_itinerary_item,
+    get_itinerary_items_for_user,
+)
+from src.database.crud.trip import create_trip, get_trip_by_id, get_trip_details_json
+from src.database.models import ItineraryItemType
+from src.schemas.trip import TripDetails
+
+
+def _at(microsecond: int) -> datetime:
+    return datetime(2030, 1, 1, 9, 30, microsecond=microsecond, tzinfo=timezone.utc)
+
+
+async def test_json_document_matches_the_model(db, make_user):
+    user_id = (await make_user())["user_id"]
+    # Whole seconds, where pydantic leaves out the fraction, and fractions
+    # with leading and trailing zeros.
+    trip = await create_trip(
+        db,
+        name="Details",
+        created_by_user_id=user_id,
+        start_date=_at(0),
+        end_date=_at(500000),
+    )
+    for microsecond in (0, 120, 999999):
+        await create_itinerary_item(
+            db,
+            created_by_user_id=user_id,
+            type=ItineraryItemType.FLIGHT,
+            trip_id=trip["trip_id"],
+            itinerary_datetime=_at(microsecond),
+            details={"flight_number": "TD1", "origin_airport_code": "SFO"},
+        )
+    await create_itinerary_item(
+        db,
+        created_by_user_id=user_id,
+        type=ItineraryItemType.ACTIVITY,
+        trip_id=trip["trip_id"],
+        notes="Unscheduled",
+    )
+
+    document = await get_trip_details_json(db, trip["trip_id"], user_id)
+    trip = await get_trip_by_id(db, trip["trip_id"], user_id)
+    items = await get_itinerary_items_for_user(db, user_id, trip_id=trip["trip_id"])
+    model = TripDetails.model_validate({**trip, "itinerary_items": items.items})
+
+    assert json.loads(document) == json.loads(model.model_dump_json())
+    assert json.loads(document)["start_date"] == "2030-01-01T09:30:00Z"
@@ -0,0 +1,19 @@
+import { axiosInstance } from "./axiosInstance";
+
+export type InvitationOutcome = "invited" | "already_participant" | "user_not_found";
+
+export interface BatchInvitationResult {
+  email: string;
+  outcome: InvitationOutcome;
+}
+
+// Invites every email with one request; returns the outcome for each distinct email.
+export const inviteParticipants = async (
+  tripId: string,
+  emails: string[],
+): Promise<BatchInvitationResult[]> => {
+  const response = await axiosInstance.post(`/api/v1/trips/${tripId}/invite/batch`, {
+    emails: emails.map(email => email.trim()),
+  });
+  return response.data.results;
+};
@@ -1,6 +1,7 @@
 import { useNavigate } from "react-router";
 import { message } from "antd";
 import { axiosInstance } from "../api/axiosInstance";
+import { inviteParticipants, type BatchInvitationResult } from "../api/invitations";
 import { TripForm, type TripFormData } from "./TripForm";
 
 export const CreateTrip = () => {
@@ -22,20 +23,24 @@ export const CreateTrip = () => {
 
       // Send invitations to participants
       if (participants && participants.length > 0) {
-        const invitationPromises = participants.map(email =>
-          axiosInstance.post(`/api/v1/trips/${createdTrip.trip_id}/invite`, {
-            email: email.trim()
-          }).catch(error => {
-            console.error(`Failed to invite ${email}:`, error);
-            message.warning(`Failed to invite ${email}`);
-          })
-        );
-
-        await Promise.allSettled(invitationPromises);
+        let results: BatchInvitationResult[] = [];
+        try {
+          results = await inviteParticipants(createdTrip.trip_id, participants);
+        } catch (error) {
+          console.error("Failed to send invitations:", error);
+          message.warning("Failed to send invitations");
+        }
+        for (const { email, outcome } of results) {
+          if (outcome === "user_not_found") {
+            message.warning(`No user found for ${email}`);
+          }
+        }
 
-        const successfulInvites = participants.length;
+        const successfulInvites = results.filter(result => result.outcome === "invited").length;
         if (successfulInvites > 0) {
           message.success(`Trip created! Invitations sent to ${successfulInvites} participant${successfulInvites > 1 ? 's' : ''}.`);
+        } else {
+          message.success("Trip created successfully!");
         }
       } else {
         message.success("Trip created successfully!");
@@ -2,6 +2,7 @@ import { useState, useEffect, useContext } from "react";
 import { useParams, useNavigate } from "react-router";
 import { message } from "antd";
 import { axiosInstance } from "../api/axiosInstance";
+import { inviteParticipants, type BatchInvitationResult } from "../api/invitations";
 import { TripForm, type TripFormData } from "./TripForm";
 import { AuthStatusContext } from "../contexts/AuthStatusContext";
 import { LoadingView } from "./LoadingView";
@@ -67,18 +68,20 @@ export const EditTrip = () => {
 
       // Send invitations to new participants
       if (participants && participants.length > 0) {
-        const invitationPromises = participants.map(email =>
-          axiosInstance.post(`/api/v1/trips/${tripId}/invite`, {
-            email: email.trim()
-          }).catch(error => {
-            console.error(`Failed to invite ${email}:`, error);
-            message.warning(`Failed to invite ${email}`);
-          })
-        );
-
-        await Promise.allSettled(invitationPromises);
+        let results: BatchInvitationResult[] = [];
+        try {
+          results = await inviteParticipants(tripId, participants);
+        } catch (error) {
+          console.error("Failed to send invitations:", error);
+          message.warning("Failed to send invitations");
+        }
+        for (const { email, outcome } of results) {
+          if (outcome === "user_not_found") {
+            message.warning(`No user found for ${email}`);
+          }
+        }
 
-        const successfulInvites = participants.length;
+        const successfulInvites = results.filter(result => result.outcome === "invited").length;
         if (successfulInvites > 0) {
           message.success(`Trip updated! Invitations sent to ${successfulInvites} additional participant${successfulInvites > 1 ? 's' : ''}.`);
         } else {